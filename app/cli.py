@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    return Config(ALEMBIC_INI)
+
+
+def migrate(args) -> int:
+    from alembic import command
+
+    command.upgrade(_alembic_config(), args.revision)
+    return 0
+
+
+def check_indexes(args) -> int:
+    from app.db import engine
+    from app.utils.query_plans import find_sequential_scans
+
+    report = find_sequential_scans(engine)
+    failures = 0
+    for name, scans in report.items():
+        if scans:
+            failures += 1
+            print(f"SEQ SCAN  {name}: {'; '.join(scans)}")
+        else:
+            print(f"ok        {name}")
+    return 1 if failures else 0
+
+
+def sweep_promotions(args) -> int:
+    import asyncio
+    from app.db import async_engine
+    from app.services.promotion_lifecycle import lifecycle_scheduler
+
+    async def run():
+        try:
+            while True:
+                result = await lifecycle_scheduler.sweep()
+                print(f"activated={result['activated']} expired={result['expired']} "
+                      f"duration_ms={result['duration_ms']:.1f}")
+                if not args.loop:
+                    return
+                await asyncio.sleep(lifecycle_scheduler.interval)
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(run())
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="apply schema migrations")
+    migrate_parser.add_argument("revision", nargs="?", default="head")
+    migrate_parser.set_defaults(func=migrate)
+
+    check_parser = subparsers.add_parser("check-indexes", help="report sequential scans on hot queries")
+    check_parser.set_defaults(func=check_indexes)
+
+    sweep_parser = subparsers.add_parser("sweep-promotions", help="activate due and expire ended promotions")
+    sweep_parser.add_argument("--loop", action="store_true", help="keep sweeping every PROMOTION_SWEEP_INTERVAL_SECONDS")
+    sweep_parser.set_defaults(func=sweep_promotions)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,80 @@
 from fastapi import Depends, HTTPException, status, Request
 from typing import Optional
-from fastapi import Depends, HTTPException, status
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from app.models.user import User
-from app.db import get_db
-from app.utils.security import SECRET_KEY, ALGORITHM
+import logging
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import AsyncSessionLocal
 from fastapi.security import OAuth2PasswordBearer
 from app.utils.security import decode_token
 from sqlalchemy.orm import joinedload
-from app.models import User, Role 
+from app.models import User, Role
+
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
-def get_current_user(
+def _get_bearer_token(request: Request) -> Optional[str]:
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return None
+    return auth_header.split(" ")[1]
+
+async def _load_principal(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(
+        select(User)
+        .options(
+            joinedload(User.permissions),
+            joinedload(User.role).joinedload(Role.permissions)
+        )
+        .where(func.lower(User.email) == email.lower())
+    )
+    return result.unique().scalars().first()
+
+async def get_request_principal(request: Request) -> Optional[User]:
+    # The principal is resolved at most once per request and kept on
+    # request.state, so get_current_user and checkPermission share the
+    # same eagerly loaded User.
+    if getattr(request.state, "principal_resolved", False):
+        return request.state.principal
+
+    user = None
+    token = _get_bearer_token(request)
+    payload = decode_token(token) if token else None
+    email = payload.get("sub") if payload else None
+
+    if email:
+        try:
+            async with AsyncSessionLocal() as db:
+                user = await _load_principal(db, email)
+        except Exception as e:
+            logger.error(f"Failed to load principal for {email}: {str(e)}")
+            user = None
+
+    request.state.principal = user
+    request.state.principal_resolved = True
+    return user
+
+def get_token_subject(request: Request) -> Optional[str]:
+    token = _get_bearer_token(request)
+    payload = decode_token(token) if token else None
+    return payload.get("sub") if payload else None
+
+def get_token_claims(request: Request) -> dict:
+    token = _get_bearer_token(request)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authorization token missing",
+        )
+
+    payload = decode_token(token)
+    if payload is None or not payload.get("sub"):
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return payload
+
+async def get_current_user(
+    request: Request,
     token: Optional[str] = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
 ) -> Optional[User]:
     if not token:
         raise HTTPException(
@@ -23,28 +82,18 @@ def get_current_user(
             detail="Authorization token missing",
         )
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: Optional[str] = payload.get("sub")
+    payload = decode_token(token)
+    if payload is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-        if not email:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
+    email: Optional[str] = payload.get("sub")
+    if not email:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return await require_principal(request)
 
-    user = db.query(User).filter(User.email == email).first()
-    user = (
-        db.query(User)
-        .options(
-            joinedload(User.permissions),
-            joinedload(User.role).joinedload(Role.permissions)
-        )
-        .filter(User.email == email.lower())  
-        .first()
-    )
-    
-    
+async def require_principal(request: Request) -> User:
+    user = await get_request_principal(request)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
@@ -54,32 +103,14 @@ def get_current_user_id(token: Optional[str] = Depends(oauth2_scheme)) -> int:
     if not token:
         raise HTTPException(status_code=401, detail="Authorization token missing")
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-        return int(user_id)
-    except JWTError:
+    payload = decode_token(token)
+    if payload is None:
         raise HTTPException(status_code=401, detail="Token is invalid or expired")
 
-async def get_current_user_optional(request: Request) -> Optional[User]:
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        return None
-
-    token = auth_header.split(" ")[1]
-    db: Session = next(get_db())
-
-    try:
-        payload = decode_token(token)
-        email = payload.get("sub")
-        if not email:
-            return None
+    user_id = payload.get("sub")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+    return int(user_id)
 
-        user = db.query(User).filter(User.email == email).first()
-        return user
-    except Exception as e:
-        return None
-    finally:
-        db.close()
\ No newline at end of file
+async def get_current_user_optional(request: Request) -> Optional[User]:
+    return await get_request_principal(request)
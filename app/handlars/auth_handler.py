@@ -1,6 +1,6 @@
 from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db
 from app.services.auth import AuthService
 from app.schemas.user import (
     UserCreate, UserLogin, ForgotPasswordRequest,
@@ -9,17 +9,17 @@ from app.schemas.user import (
 
 class AuthHandler:
 
-    async def register(user: UserCreate, db: Session = Depends(get_db)):
-        return AuthService(db).handle_registration(user)
+    async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+        return await AuthService(db).handle_registration(user)
 
-    async def login(user: UserLogin, db: Session = Depends(get_db)):
-        return AuthService(db).handle_login(user)
+    async def login(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+        return await AuthService(db).handle_login(user)
 
-    async def forgot_password(data: ForgotPasswordRequest, db: Session = Depends(get_db)):
-        return AuthService(db).forgot_password(data.email)
+    async def forgot_password(data: ForgotPasswordRequest, db: AsyncSession = Depends(get_async_db)):
+        return await AuthService(db).forgot_password(data.email)
 
-    async def verify_otp(data: VerifyOtpRequest, db: Session = Depends(get_db)):
-        return AuthService(db).verify_otp(data.email, data.otp)
+    async def verify_otp(data: VerifyOtpRequest, db: AsyncSession = Depends(get_async_db)):
+        return await AuthService(db).verify_otp(data.email, data.otp)
 
-    async def reset_password(data: ResetPasswordRequest, db: Session = Depends(get_db)):
-        return AuthService(db).reset_password(data.email, data.new_password)
+    async def reset_password(data: ResetPasswordRequest, db: AsyncSession = Depends(get_async_db)):
+        return await AuthService(db).reset_password(data.email, data.new_password)
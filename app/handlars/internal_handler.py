@@ -0,0 +1,26 @@
+from app.db import pool_metrics
+from app.utils.response_helper import success_response
+from app.services.promotion_counters import promotion_counters
+from app.services.promotion_lifecycle import lifecycle_scheduler
+from app.services.public_feed import public_feed
+from app.utils.security import token_cache
+
+
+class InternalHandler:
+    async def db_pool_stats():
+        return success_response(
+            message="Connection pool statistics",
+            data={name: metrics.snapshot() for name, metrics in pool_metrics.items()},
+        )
+
+    async def token_cache_stats():
+        return success_response(message="Token cache statistics", data=token_cache.stats())
+
+    async def public_feed_stats():
+        return success_response(message="Public feed cache statistics", data=public_feed.stats())
+
+    async def promotion_lifecycle_stats():
+        return success_response(message="Promotion lifecycle sweep statistics", data=lifecycle_scheduler.stats())
+
+    async def promotion_counter_stats():
+        return success_response(message="Promotion counter statistics", data=promotion_counters.stats())
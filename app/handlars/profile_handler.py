@@ -1,7 +1,7 @@
 from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.db import get_db
-from app.schemas.user import UserProfileUpdate
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db, get_read_db
+from app.schemas.user import UserPermissionsUpdate, UserProfileUpdate
 from app.services.profile_service import ProfileService
 from app.models.user import User
 from app.dependencies import get_current_user
@@ -11,21 +11,29 @@ class UserHandler:
     @staticmethod
     async def read_profile(
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_read_db)
     ):
-        return ProfileService(db).get_profile(current_user.id)
+        return await ProfileService(db).get_profile(current_user.id)
 
     @staticmethod
     async def edit_profile(
         data: UserProfileUpdate,
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
     ):
-        return ProfileService(db).update_profile(current_user.id, data)
+        return await ProfileService(db).update_profile(current_user.id, data)
 
     @staticmethod
     async def remove_profile(
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
     ):
-        return ProfileService(db).delete_profile(current_user.id)
+        return await ProfileService(db).delete_profile(current_user.id)
+
+    @staticmethod
+    async def set_user_permissions(
+        user_id: int,
+        data: UserPermissionsUpdate,
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        return await ProfileService(db).set_permissions(user_id, data)
@@ -1,14 +1,18 @@
-from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db import get_db
-from app.schemas.promotion import RedeemRequest
+from fastapi import Depends, Header, HTTPException, Query
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db, get_read_db
+from app.schemas.promotion import RedeemRequest, PromoCodeCreate, PromoCodeBatchCreate, SavedPromotionsRequest
 
 from app.schemas.promotion import (
     PromotionCreate,
     PromotionUpdate,
     PromotionApproval,
+    PromotionBatchModeration,
 )
 from app.services.promotion_service import PromotionService
+from app.services.redemption_service import RedemptionService
 from app.dependencies import get_current_user
 from app.models.user import User
 from pydantic import BaseModel
@@ -17,79 +21,204 @@ from pydantic import BaseModel
 class PromotionHandler:
     async def create_promotion(
         promotion: PromotionCreate,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user=Depends(get_current_user),
     ):
-        return PromotionService(db).create_promotion(promotion, current_user.id)
+        return await PromotionService(db).create_promotion(promotion, current_user.id)
 
     async def submit_for_approval(
         promotion_id: int,
-        db: Session = Depends(get_db),
+        if_match: Optional[str] = Header(None),
+        db: AsyncSession = Depends(get_async_db),
         current_user=Depends(get_current_user),
     ):
-        return PromotionService(db).submit_for_approval(promotion_id, current_user.id)
+        return await PromotionService(db).submit_for_approval(promotion_id, current_user.id, if_match)
 
 
     async def approve_promotion(
         promotion_id: int,
         data: PromotionApproval,
-        db: Session = Depends(get_db),
+        if_match: Optional[str] = Header(None),
+        db: AsyncSession = Depends(get_async_db),
         current_user=Depends(get_current_user),
     ):
-        return PromotionService(db).approve_promotion(promotion_id, data, current_user.id)
+        return await PromotionService(db).approve_promotion(promotion_id, data, current_user.id, if_match)
 
     async def reject_promotion(
         promotion_id: int,
         data: PromotionApproval,
-        db: Session = Depends(get_db),
+        if_match: Optional[str] = Header(None),
+        db: AsyncSession = Depends(get_async_db),
         current_user=Depends(get_current_user),
     ):
-        return PromotionService(db).reject_promotion(promotion_id, data, current_user.id)
+        return await PromotionService(db).reject_promotion(promotion_id, data, current_user.id, if_match)
+
+    async def approve_promotions(
+        data: PromotionBatchModeration,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await PromotionService(db).approve_promotions(data.promotion_ids, data.comments, current_user.id)
+
+    async def reject_promotions(
+        data: PromotionBatchModeration,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await PromotionService(db).reject_promotions(data.promotion_ids, data.comments, current_user.id)
 
     async def get_promotions(
         status: str = None,
-        db: Session = Depends(get_db),
+        created_by: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = Query(None, ge=1),
+        db: AsyncSession = Depends(get_read_db),
     ):
-        return PromotionService(db).get_all_promotions(status)
+        return await PromotionService(db).get_all_promotions(
+            status, created_by, created_from, created_to, cursor, limit
+        )
+
+    async def export_promotions(
+        fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+        status: str = None,
+        created_by: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        db: AsyncSession = Depends(get_read_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await PromotionService(db).export_promotions(
+            current_user.id, fmt, status, created_by, created_from, created_to
+        )
 
     async def get_promotion(
         promotion_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
     ):
-        return PromotionService(db).get_promotion(promotion_id)
+        return await PromotionService(db).get_promotion(promotion_id)
 
     async def update_promotion(
         promotion_id: int,
         promotion: PromotionUpdate,
-        db: Session = Depends(get_db),
+        if_match: Optional[str] = Header(None),
+        db: AsyncSession = Depends(get_async_db),
         current_user=Depends(get_current_user),
     ):
-        return PromotionService(db).update_promotion(promotion_id, promotion, current_user.id)
+        return await PromotionService(db).update_promotion(promotion_id, promotion, current_user.id, if_match)
     async def delete_promotion(
         promotion_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user=Depends(get_current_user),
     ):
-        return PromotionService(db).delete_promotion(promotion_id, current_user.id)
+        return await PromotionService(db).delete_promotion(promotion_id, current_user.id)
     async def toggle_promotion_status(
         promotion_id: int,
-        db: Session = Depends(get_db),
+        if_match: Optional[str] = Header(None),
+        db: AsyncSession = Depends(get_async_db),
         current_user=Depends(get_current_user),
     ):
-        return PromotionService(db).toggle_promotion_status(promotion_id, current_user.id)
+        return await PromotionService(db).toggle_promotion_status(promotion_id, current_user.id, if_match)
     
-    async def get_public_promotions(db: Session = Depends(get_db)):
-        return PromotionService(db).get_public_promotions()
+    async def get_public_promotions(
+        if_none_match: Optional[str] = Header(None),
+        db: AsyncSession = Depends(get_async_db),
+    ):
+        # The session only connects on first query, so cache hits and 304s
+        # never touch the database. Rebuilds read the primary: a lagging
+        # replica would otherwise pin a stale feed for the whole TTL.
+        return await PromotionService(db).get_public_promotions(if_none_match)
+
+    async def get_promotions_by_segments(
+        segment: List[str] = Query(...),
+        match: str = Query("any", pattern="^(any|all)$"),
+        cursor: Optional[str] = None,
+        limit: Optional[int] = Query(None, ge=1),
+        db: AsyncSession = Depends(get_read_db),
+    ):
+        return await PromotionService(db).get_promotions_by_segments(segment, match, cursor, limit)
+
+    async def search_promotions(
+        q: str = Query(..., min_length=1, max_length=200),
+        cursor: Optional[str] = None,
+        limit: Optional[int] = Query(None, ge=1),
+        db: AsyncSession = Depends(get_read_db),
+    ):
+        return await PromotionService(db).search_promotions(q, cursor, limit)
 
     async def save_promotion(
         promotion_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user=Depends(get_current_user),
     ):
-        return PromotionService(db).save_promotion(promotion_id, current_user.id)
+        return await PromotionService(db).save_promotion(promotion_id, current_user.id)
+
+    async def unsave_promotion(
+        promotion_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await PromotionService(db).unsave_promotion(promotion_id, current_user.id)
+
+    async def save_promotions(
+        data: SavedPromotionsRequest,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await PromotionService(db).save_promotions(data.promotion_ids, current_user.id)
+
+    async def unsave_promotions(
+        promotion_id: List[int] = Query(..., max_length=100),
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await PromotionService(db).unsave_promotions(promotion_id, current_user.id)
+
+    async def get_saved_promotions(
+        cursor: Optional[str] = None,
+        limit: Optional[int] = Query(None, ge=1),
+        db: AsyncSession = Depends(get_read_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await PromotionService(db).get_saved_promotions(current_user.id, cursor, limit)
+
+    async def create_promo_code(
+        promotion_id: int,
+        data: PromoCodeCreate,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await RedemptionService(db).create_code(promotion_id, data, current_user.id)
+
+    async def create_code_batch(
+        promotion_id: int,
+        data: PromoCodeBatchCreate,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await RedemptionService(db).create_batch(promotion_id, data, current_user.id)
+
+    async def get_code_batch(
+        promotion_id: int,
+        batch_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await RedemptionService(db).get_batch(promotion_id, batch_id, current_user.id)
+
+    async def export_code_batch(
+        promotion_id: int,
+        batch_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await RedemptionService(db).export_batch(promotion_id, batch_id, current_user.id)
 
     async def redeem_promotion(
         data: RedeemRequest,
-        db: Session = Depends(get_db),
+        idempotency_key: Optional[str] = Header(None, max_length=128),
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
     ):
-        return PromotionService(db).redeem_promotion(data.code)
\ No newline at end of file
+        return await RedemptionService(db).redeem(data.code, current_user.id, idempotency_key)
\ No newline at end of file
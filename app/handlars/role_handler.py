@@ -1,30 +1,33 @@
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db import get_db
-from app.schemas.role import RoleCreate
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db, get_read_db
+from app.schemas.role import RoleCreate, RolePermissionPatch
 from app.services.role_service import RoleService
 
 class RoleHandler:
-    async def create_role(role: RoleCreate, db: Session = Depends(get_db)):
-        return RoleService(db).create_role(role)
+    async def create_role(role: RoleCreate, db: AsyncSession = Depends(get_async_db)):
+        return await RoleService(db).create_role(role)
 
-    async def read_roles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-        return RoleService(db).get_roles(skip, limit)
+    async def read_roles(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_read_db)):
+        return await RoleService(db).get_roles(skip, limit)
 
-    async def read_role(role_id: int, db: Session = Depends(get_db)):
-        role = RoleService(db).get_role(role_id)
+    async def read_role(role_id: int, db: AsyncSession = Depends(get_read_db)):
+        role = await RoleService(db).get_role(role_id)
         if not role:
             raise HTTPException(status_code=404, detail="Role not found")
         return role
 
-    async def update_role(role_id: int, role: RoleCreate, db: Session = Depends(get_db)):
-        updated = RoleService(db).update_role(role_id, role)
+    async def update_role(role_id: int, role: RoleCreate, db: AsyncSession = Depends(get_async_db)):
+        updated = await RoleService(db).update_role(role_id, role)
         if not updated:
             raise HTTPException(status_code=404, detail="Role not found")
         return updated
 
-    async def delete_role(role_id: int, db: Session = Depends(get_db)):
-        deleted = RoleService(db).delete_role(role_id)
+    async def patch_role_permissions(role_id: int, patch: RolePermissionPatch, db: AsyncSession = Depends(get_async_db)):
+        return await RoleService(db).patch_role_permissions(role_id, patch)
+
+    async def delete_role(role_id: int, db: AsyncSession = Depends(get_async_db)):
+        deleted = await RoleService(db).delete_role(role_id)
         if not deleted:
             raise HTTPException(status_code=404, detail="Role not found")
         return {"detail": "Role deleted successfully"}
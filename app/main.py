@@ -1,13 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.read_after_write import ReadAfterWriteMiddleware
 from app.routes import auth
-from app.db import Base, engine
+from app.config import settings
+from app.db import Base, async_engine, replica_engines
 from app.routes import role
 from app.routes import user
 from app.routes import promotion
+from app.routes import internal
 from fastapi.middleware.cors import CORSMiddleware
-Base.metadata.create_all(bind=engine)
-app = FastAPI()
+from app.utils.security import shutdown_hash_executor
+from app.utils.response_helper import FastJSONResponse
+from app.services.promotion_lifecycle import lifecycle_scheduler
+from app.services.code_generation import code_generation_jobs
+from app.services.promotion_counters import promotion_counters
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.CREATE_SCHEMA_ON_STARTUP:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    if settings.PROMOTION_SCHEDULER_ENABLED:
+        lifecycle_scheduler.start()
+    promotion_counters.start()
+    yield
+    await lifecycle_scheduler.stop()
+    await code_generation_jobs.shutdown()
+    # Flush buffered counts while the engine is still open.
+    await promotion_counters.stop()
+    shutdown_hash_executor()
+    await async_engine.dispose()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +51,8 @@ app.include_router(auth.router)
 app.include_router(role.router)
 app.include_router(user.router)
 app.include_router(promotion.router)
+app.include_router(internal.router)
 
+app.add_middleware(ReadAfterWriteMiddleware)
 app.add_middleware(LoggingMiddleware)
 
@@ -2,7 +2,7 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 from datetime import datetime
-from app.dependencies import get_current_user_optional
+from app.dependencies import get_token_subject
 
 logger = logging.getLogger("app.middleware.logging")
 logger.setLevel(logging.INFO)
@@ -15,8 +15,9 @@ if not logger.hasHandlers():
 
 class LoggingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        user = await get_current_user_optional(request)
-        user_email = user.email if user else "Anonymous"
+        # The token subject is the user's email; logging it needs no user
+        # lookup, so public and cached (304) responses stay database-free.
+        user_email = get_token_subject(request) or "Anonymous"
 
         method = request.method
         url_path = request.url.path
@@ -1,38 +1,34 @@
-from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db import get_db
-from app.models import User, Role, Module, Permission
-from app.dependencies import get_current_user
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+from app.db import get_async_db
+from app.models import User
+from app.dependencies import get_token_claims, require_principal
+from app.services.permission_matrix import permission_matrix
+
+logger = logging.getLogger(__name__)
 
 
 def checkPermission(module_name: str, permission_name: str):
-    def permission_dependency(
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user),
+    async def permission_dependency(
+        request: Request,
+        db: AsyncSession = Depends(get_async_db),
+        claims: dict = Depends(get_token_claims),
     ):
-        module = db.query(Module).filter(func.lower(Module.name) == module_name.lower()).first()
-
-        if not module:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Module '{module_name}' not found.",
-            )
-
-        permission = (
-            db.query(Permission)
-            .filter(
-                func.lower(Permission.name) == permission_name.lower(),
-                Permission.module_id == module.id,
-            )
-            .first()
-        )
-
-        print(f"Checking permission: {permission_name} in module: {module_name} for user: {current_user.email}")
-
-        if not permission:
-            available_permissions = db.query(Permission).filter(Permission.module_id == module.id).all()
-            available_names = [perm.name for perm in available_permissions]
+        # Only hits the database when the matrix is cold or its version
+        # check interval has elapsed.
+        await db.run_sync(permission_matrix.ensure_fresh)
+        permission_id = permission_matrix.permission_id(module_name, permission_name)
+
+        logger.debug(f"Checking permission: {permission_name} in module: {module_name} for user: {claims['sub']}")
+
+        if permission_id is None:
+            available_names = permission_matrix.module_permissions(module_name)
+            if available_names is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Module '{module_name}' not found.",
+                )
             raise HTTPException(
                 status_code=403,
                 detail={
@@ -41,13 +37,15 @@ def checkPermission(module_name: str, permission_name: str):
                 },
             )
 
-        # Check if user has the permission
-        if permission in current_user.permissions:
+        # Tokens carrying a current permission stamp are authorized without
+        # loading the user; older or plain tokens fall back to the principal.
+        if permission_matrix.is_granted_by_claims(claims, permission_id):
             return True
 
-        # Check if user's role has the permission
-        role = current_user.role
-        if role and permission in role.permissions:
+        current_user: User = await require_principal(request)
+
+        # Check if user or user's role has the permission
+        if permission_matrix.is_granted(current_user.id, current_user.role_id, permission_id):
             return True
 
         # If user/role doesn't have the permission
@@ -55,7 +53,7 @@ def checkPermission(module_name: str, permission_name: str):
             status_code=status.HTTP_403_FORBIDDEN,
             detail={
                 "error": f"Permission '{permission_name}' denied for user '{current_user.email}' in module '{module_name}'.",
-                "available_role_permissions": [perm.name for perm in role.permissions] if role else []
+                "available_role_permissions": permission_matrix.role_permissions(current_user.role_id) if current_user.role_id else []
             },
         )
 
@@ -0,0 +1,27 @@
+import time
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.config import settings
+from app.db import PRIMARY_COOKIE, read_after_write, request_client_key
+
+
+class ReadAfterWriteMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+
+        # A committed write pins this client to the primary for a short
+        # window, in-process by client key and across workers by cookie.
+        if getattr(request.state, "wrote_to_primary", False):
+            key = request_client_key(request)
+            if key is not None:
+                until = read_after_write.mark(key)
+            else:
+                # No key to pin in-process; the cookie alone still covers this client.
+                until = time.time() + read_after_write.window
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                f"{until:.3f}",
+                max_age=int(settings.READ_AFTER_WRITE_SECONDS) + 1,
+                httponly=True,
+            )
+        return response
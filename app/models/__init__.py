@@ -2,4 +2,6 @@
 from .user import User
 from .role import Role
 from .module import Module
-from .permission import Permission
+from .permission import Permission, AuthzVersion
+from .segment import Segment
+from .promo_code import PromoCode, PromoCodeBatch, PromoCodeUserCount, PromoRedemption
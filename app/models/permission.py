@@ -1,19 +1,21 @@
-from sqlalchemy import Column, Integer, String, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db import Base
 
 role_permissions = Table(
     'role_permissions',
     Base.metadata,
-    Column('role_id', Integer, ForeignKey('roles.id')),
-    Column('permission_id', Integer, ForeignKey('permissions.id'))
+    Column('role_id', Integer, ForeignKey('roles.id'), primary_key=True),
+    Column('permission_id', Integer, ForeignKey('permissions.id'), primary_key=True),
+    Index('ix_role_permissions_permission_id', 'permission_id'),
 )
 
 user_permissions = Table(
     'user_permissions',
     Base.metadata,
-    Column('user_id', Integer, ForeignKey('users.id')),
-    Column('permission_id', Integer, ForeignKey('permissions.id'))
+    Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+    Column('permission_id', Integer, ForeignKey('permissions.id'), primary_key=True),
+    Index('ix_user_permissions_permission_id', 'permission_id'),
 )
 
 class Business(Base):
@@ -45,3 +47,13 @@ class Permission(Base):
     module = relationship("Module", back_populates="permissions")
     users = relationship("User", secondary=user_permissions, back_populates="permissions")
     roles = relationship("Role", secondary=role_permissions, back_populates="permissions")
+
+    # Conflict target for bulk upserts; also serves lookups by module_id.
+    __table_args__ = (UniqueConstraint("module_id", "name", name="uq_permissions_module_id_name"),)
+
+
+class AuthzVersion(Base):
+    __tablename__ = "authz_versions"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, UniqueConstraint, CheckConstraint, Index
+from datetime import datetime
+from app.db import Base
+
+
+class PromoCode(Base):
+    __tablename__ = "promo_codes"
+
+    id = Column(Integer, primary_key=True)
+    code = Column(String, unique=True, nullable=False)
+    promotion_id = Column(Integer, ForeignKey("promotions.id", ondelete="CASCADE"), nullable=False, index=True)
+    # NULL means unlimited.
+    max_redemptions = Column(Integer, nullable=True)
+    per_user_limit = Column(Integer, nullable=True, default=1)
+    redemption_count = Column(Integer, nullable=False, default=0)
+    batch_id = Column(Integer, ForeignKey("promo_code_batches.id", ondelete="CASCADE"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_promo_codes_batch_id", "batch_id", "id"),
+        CheckConstraint(
+            "max_redemptions IS NULL OR redemption_count <= max_redemptions",
+            name="ck_promo_codes_within_cap",
+        ),
+    )
+
+
+class PromoCodeBatch(Base):
+    __tablename__ = "promo_code_batches"
+
+    id = Column(Integer, primary_key=True)
+    promotion_id = Column(Integer, ForeignKey("promotions.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    prefix = Column(String, nullable=True)
+    requested = Column(Integer, nullable=False)
+    generated = Column(Integer, nullable=False, default=0)
+    status = Column(String, nullable=False, default="pending")
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class PromoCodeUserCount(Base):
+    # One row per (code, user) so the per-user cap is a single conditional upsert.
+    __tablename__ = "promo_code_user_counts"
+
+    promo_code_id = Column(Integer, ForeignKey("promo_codes.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    redemptions = Column(Integer, nullable=False, default=0)
+
+
+class PromoRedemption(Base):
+    __tablename__ = "promo_redemptions"
+
+    id = Column(Integer, primary_key=True)
+    promo_code_id = Column(Integer, ForeignKey("promo_codes.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    idempotency_key = Column(String, nullable=True)
+    redeemed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "idempotency_key", name="uq_promo_redemptions_user_idempotency_key"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime , UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime , UniqueConstraint, Index, text, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db import Base
@@ -15,8 +15,10 @@ class Promotion(Base):
     end_date = Column(DateTime, nullable=False)
     discount = Column(Integer)
     target_segments = Column(String)  
-    status = Column(String, default="pending") 
+    status = Column(String, default="pending")
     approval_comments = Column(Text, nullable=True)
+    # Bumped by every state transition and edit; see app.services.promotion_state.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     created_by = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -25,12 +27,80 @@ class Promotion(Base):
     creator = relationship("User", back_populates="promotions")
     saved_promotions = relationship("SavedPromotion", backref="user", cascade="all, delete")
 
+    # Listing indexes end in (created_at, id) so keyset pages are read in
+    # index order, with or without a status/creator filter.
+    __table_args__ = (
+        Index("ix_promotions_created_at_id", "created_at", "id"),
+        Index("ix_promotions_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_promotions_created_by_created_at_id", "created_by", "created_at", "id"),
+        # Lifecycle sweeps: due activations and ended promotions.
+        Index("ix_promotions_status_start_date", "status", "start_date"),
+        Index("ix_promotions_status_end_date", "status", "end_date"),
+        Index(
+            "ix_promotions_public",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+    )
+
+# Full-text search lives outside the mapped columns: a generated tsvector
+# column with a GIN index on Postgres, and an external-content FTS5 table
+# kept in sync by triggers on SQLite. Both follow every insert and update
+# without application code. Migration 0006 creates the same objects.
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_FTS_TABLE = "promotions_fts"
+
+POSTGRES_SEARCH_DDL = (
+    "ALTER TABLE promotions ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(terms, '')), 'C')) STORED",
+    "CREATE INDEX ix_promotions_search_vector ON promotions USING GIN (search_vector)",
+)
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE promotions_fts USING fts5("
+    "title, description, terms, content='promotions', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER promotions_fts_ai AFTER INSERT ON promotions BEGIN "
+    "INSERT INTO promotions_fts(rowid, title, description, terms) "
+    "VALUES (new.id, new.title, new.description, new.terms); END",
+    "CREATE TRIGGER promotions_fts_ad AFTER DELETE ON promotions BEGIN "
+    "INSERT INTO promotions_fts(promotions_fts, rowid, title, description, terms) "
+    "VALUES ('delete', old.id, old.title, old.description, old.terms); END",
+    "CREATE TRIGGER promotions_fts_au AFTER UPDATE OF title, description, terms ON promotions BEGIN "
+    "INSERT INTO promotions_fts(promotions_fts, rowid, title, description, terms) "
+    "VALUES ('delete', old.id, old.title, old.description, old.terms); "
+    "INSERT INTO promotions_fts(rowid, title, description, terms) "
+    "VALUES (new.id, new.title, new.description, new.terms); END",
+)
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Promotion.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Promotion.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
 class SavedPromotion(Base):
     __tablename__ = "saved_promotions"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    promotion_id = Column(Integer, ForeignKey("promotions.id"))
+    promotion_id = Column(Integer, ForeignKey("promotions.id"), index=True)
     saved_at = Column(DateTime, default=datetime.utcnow)
 
-    __table_args__ = (UniqueConstraint("user_id", "promotion_id", name="uix_user_promotion"),)
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint("user_id", "promotion_id", name="uix_user_promotion"),
+        # "My saved promotions" pages newest-saved first on (saved_at, id).
+        Index("ix_saved_promotions_user_id_saved_at_id", "user_id", "saved_at", "id"),
+    )
+
+class PromotionCounter(Base):
+    # Written only by the write-behind aggregator in app.services.promotion_counters.
+    __tablename__ = "promotion_counters"
+
+    promotion_id = Column(Integer, ForeignKey("promotions.id", ondelete="CASCADE"), primary_key=True)
+    views = Column(Integer, nullable=False, default=0)
+    saves = Column(Integer, nullable=False, default=0)
+    redemptions = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, Index
+from app.db import Base
+
+# Inverted index from audience segment to promotions. The primary key
+# covers promotion -> segments; the secondary index covers segment -> promotions.
+promotion_segments = Table(
+    'promotion_segments',
+    Base.metadata,
+    Column('promotion_id', Integer, ForeignKey('promotions.id', ondelete='CASCADE'), primary_key=True),
+    Column('segment_id', Integer, ForeignKey('segments.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_promotion_segments_segment_id', 'segment_id', 'promotion_id'),
+)
+
+
+class Segment(Base):
+    __tablename__ = "segments"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Boolean, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
 from app.db import Base
@@ -20,3 +20,7 @@ class User(Base):
     business_license = Column(String, nullable=True) 
     promotions = relationship("Promotion", back_populates="creator")
     saved_by = relationship("SavedPromotion", backref="promotion", cascade="all, delete")
+
+    __table_args__ = (
+        Index("ix_users_email_lower", func.lower(email)),
+    )
@@ -1,31 +1,45 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserProfileUpdate
+from app.services.permission_matrix import bump_authz_version, permission_matrix
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ProfileRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_by_id(self, user_id: int) -> User:
-        user = self.db.query(User).filter(User.id == user_id).first()
+    async def get_by_id(self, user_id: int) -> User:
+        result = await self.db.execute(
+            select(User)
+            .options(selectinload(User.role), selectinload(User.permissions))
+            .where(User.id == user_id)
+        )
+        user = result.scalars().first()
         if not user:
             logger.warning(f"User with ID {user_id} not found.")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         return user
 
-    def update(self, user_id: int, update_data: UserProfileUpdate) -> User:
-        user = self.get_by_id(user_id)
+    async def update(self, user_id: int, update_data: UserProfileUpdate) -> User:
+        user = await self.get_by_id(user_id)
         try:
             for key, value in update_data.dict(exclude_unset=True).items():
                 setattr(user, key, value)
-            self.db.commit()
-            self.db.refresh(user)
+            # Permission claims embedded in tokens carry the old role's bits.
+            version = None
+            if inspect(user).attrs.role_id.history.has_changes():
+                version = await self.db.run_sync(bump_authz_version)
+            await self.db.commit()
+            if version is not None:
+                permission_matrix.advance(version)
+            await self.db.refresh(user)
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Failed to update user {user_id}: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -34,13 +48,16 @@ class ProfileRepository:
         logger.info(f"User {user_id} profile updated successfully.")
         return user
 
-    def delete(self, user_id: int) -> dict:
-        user = self.get_by_id(user_id)
+    async def delete(self, user_id: int) -> dict:
+        user = await self.get_by_id(user_id)
         try:
-            self.db.delete(user)
-            self.db.commit()
+            await self.db.delete(user)
+            # Stops tokens that embed this user's permissions from authorizing.
+            version = await self.db.run_sync(bump_authz_version)
+            await self.db.commit()
+            permission_matrix.remove_user(version, user_id)
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Error deleting user {user_id}: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
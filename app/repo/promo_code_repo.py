@@ -0,0 +1,145 @@
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import dialect_insert, insert_ignoring_conflicts
+from app.models.promo_code import PromoCode, PromoCodeBatch, PromoCodeUserCount, PromoRedemption
+from app.models.promotion import Promotion
+from datetime import datetime
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+REDEEMED = "redeemed"
+REPLAYED = "replayed"
+NOT_FOUND = "not_found"
+NOT_ACTIVE = "not_active"
+USER_LIMIT_REACHED = "user_limit_reached"
+SOLD_OUT = "sold_out"
+
+
+class PromoCodeRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, promo_code: PromoCode):
+        self.db.add(promo_code)
+        await self.db.commit()
+        return promo_code
+
+    async def get_by_code(self, code: str) -> Optional[PromoCode]:
+        result = await self.db.execute(select(PromoCode).where(PromoCode.code == code))
+        return result.scalars().first()
+
+    async def create_batch(self, batch: PromoCodeBatch):
+        self.db.add(batch)
+        await self.db.commit()
+        return batch
+
+    async def get_batch(self, batch_id: int, promotion_id: int) -> Optional[PromoCodeBatch]:
+        result = await self.db.execute(
+            select(PromoCodeBatch).where(PromoCodeBatch.id == batch_id, PromoCodeBatch.promotion_id == promotion_id)
+        )
+        return result.scalars().first()
+
+    async def stream_batch_codes(self, batch_id: int, chunk_size: int = 10000):
+        # Server-side cursor in (batch_id, id) index order; only one chunk is buffered.
+        result = await self.db.stream(
+            select(PromoCode.code, PromoCode.redemption_count)
+            .where(PromoCode.batch_id == batch_id)
+            .order_by(PromoCode.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def _redemption_by_key(self, user_id: int, idempotency_key: str):
+        result = await self.db.execute(
+            select(PromoRedemption.id, PromoRedemption.redeemed_at, PromoCode.code, PromoCode.promotion_id)
+            .join(PromoCode, PromoCode.id == PromoRedemption.promo_code_id)
+            .where(PromoRedemption.user_id == user_id, PromoRedemption.idempotency_key == idempotency_key)
+        )
+        return result.mappings().first()
+
+    async def redeem(self, code: str, user_id: int, idempotency_key: Optional[str] = None, now: datetime = None):
+        """Redeem ``code`` for ``user_id`` in one transaction; returns (outcome, redemption).
+
+        Every cap is enforced by a conditional write, never by read-then-write,
+        so concurrent redeems can't oversell. The hot per-code counter is
+        bumped last to keep its row lock as short as possible.
+        """
+        now = now or datetime.utcnow()
+        if idempotency_key:
+            previous = await self._redemption_by_key(user_id, idempotency_key)
+            if previous:
+                return REPLAYED, previous
+
+        result = await self.db.execute(
+            select(
+                PromoCode.id,
+                PromoCode.promotion_id,
+                PromoCode.per_user_limit,
+                Promotion.status,
+                Promotion.start_date,
+                Promotion.end_date,
+            )
+            .join(Promotion, Promotion.id == PromoCode.promotion_id)
+            .where(PromoCode.code == code)
+        )
+        promo_code = result.mappings().first()
+        if not promo_code:
+            return NOT_FOUND, None
+        if promo_code["status"] != "active" or not (promo_code["start_date"] <= now < promo_code["end_date"]):
+            return NOT_ACTIVE, None
+
+        # The idempotency key is claimed first. A retry racing its original
+        # waits here on the key, not on the per-user counter, so it replays
+        # the original's redemption instead of hitting the per-user cap.
+        redemptions = PromoRedemption.__table__
+        result = await self.db.execute(
+            insert_ignoring_conflicts(redemptions, "user_id", "idempotency_key")
+            .values(promo_code_id=promo_code["id"], user_id=user_id, idempotency_key=idempotency_key, redeemed_at=now)
+            .returning(redemptions.c.id)
+        )
+        redemption_id = result.scalar()
+        if redemption_id is None:
+            # A concurrent retry with the same key committed first.
+            await self.db.rollback()
+            return REPLAYED, await self._redemption_by_key(user_id, idempotency_key)
+
+        counts = PromoCodeUserCount.__table__
+        per_user = (
+            dialect_insert(counts)
+            .values(promo_code_id=promo_code["id"], user_id=user_id, redemptions=1)
+            .on_conflict_do_update(
+                index_elements=[counts.c.promo_code_id, counts.c.user_id],
+                set_={"redemptions": counts.c.redemptions + 1},
+                where=(counts.c.redemptions < promo_code["per_user_limit"])
+                if promo_code["per_user_limit"] is not None else None,
+            )
+            .returning(counts.c.redemptions)
+        )
+        if (await self.db.execute(per_user)).first() is None:
+            await self.db.rollback()
+            return USER_LIMIT_REACHED, None
+
+        result = await self.db.execute(
+            update(PromoCode)
+            .where(
+                PromoCode.id == promo_code["id"],
+                or_(PromoCode.max_redemptions.is_(None), PromoCode.redemption_count < PromoCode.max_redemptions),
+            )
+            .values(redemption_count=PromoCode.redemption_count + 1)
+            .returning(PromoCode.redemption_count)
+            .execution_options(synchronize_session=False)
+        )
+        if result.first() is None:
+            await self.db.rollback()
+            return SOLD_OUT, None
+
+        await self.db.commit()
+        return REDEEMED, {
+            "id": redemption_id,
+            "redeemed_at": now,
+            "code": code,
+            "promotion_id": promo_code["promotion_id"],
+        }
@@ -1,101 +1,388 @@
-from sqlalchemy.orm import Session
-from app.models.promotion import Promotion, SavedPromotion
+from sqlalchemy import column, delete, func, literal, literal_column, select, table, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import insert_ignoring_conflicts
+from app.models.promotion import Promotion, PromotionCounter, SavedPromotion, SEARCH_FTS_TABLE, SEARCH_VECTOR_COLUMN
+from app.models.segment import Segment, promotion_segments
 from datetime import datetime
-from app.utils.response_helper import success_response, error_response
+from typing import List, Optional, Tuple
+from app.utils.response_helper import error_response
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# List views never load terms, description or approval comments.
+LIST_COLUMNS = (
+    Promotion.id,
+    Promotion.title,
+    Promotion.status,
+    Promotion.image_url,
+    Promotion.discount,
+    Promotion.start_date,
+    Promotion.end_date,
+    Promotion.created_by,
+    Promotion.created_at,
+    Promotion.updated_at,
+)
+EXPORT_COLUMNS = tuple(Promotion.__table__.c)
+# Joined in (LEFT JOIN on the primary key) wherever counts are shown, so
+# they never cost a second query.
+COUNTER_COLUMNS = (
+    PromotionCounter.views,
+    PromotionCounter.saves,
+    PromotionCounter.redemptions,
+)
+# Approved promotions stay hidden until the lifecycle sweep activates them
+# at start_date, so public reads only ever see live rows.
+PUBLIC_STATUSES = ("active",)
+PUBLIC_COLUMNS = (
+    Promotion.id,
+    Promotion.title,
+    Promotion.description,
+    Promotion.terms,
+    Promotion.image_url,
+    Promotion.discount,
+    Promotion.target_segments,
+    Promotion.status,
+    Promotion.start_date,
+    Promotion.end_date,
+)
+SEARCH_COLUMNS = (
+    Promotion.id,
+    Promotion.title,
+    Promotion.description,
+    Promotion.image_url,
+    Promotion.discount,
+    Promotion.status,
+    Promotion.start_date,
+    Promotion.end_date,
+)
+
+
+def _fts5_query(text: str) -> str:
+    # Quote every word so user input can't inject FTS5 operators or syntax errors.
+    return " ".join('"%s"' % word for word in re.findall(r"\w+", text))
+
+def _filtered(query, status=None, created_by=None, created_from=None, created_to=None):
+    if status:
+        query = query.where(Promotion.status == status)
+    if created_by is not None:
+        query = query.where(Promotion.created_by == created_by)
+    if created_from is not None:
+        query = query.where(Promotion.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Promotion.created_at < created_to)
+    return query
+
+
 class PromotionRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, promotion: Promotion):
+    async def create(self, promotion: Promotion, segments: Optional[List[str]] = None):
         try:
             self.db.add(promotion)
-            self.db.commit()
-            self.db.refresh(promotion)
+            await self.db.flush()
+            if segments:
+                await self.set_segments(promotion.id, segments)
+            await self.db.commit()
+            await self.db.refresh(promotion)
             return promotion
         except Exception as e:
             logger.error(f"Error creating promotion: {str(e)}")
             return error_response("Failed to create promotion", 500)
 
-    def submit_for_approval(self, promotion: Promotion):
+    async def get_by_id(self, promo_id: int):
         try:
-            promotion.status = "pending"
-            promotion.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(promotion)
-            return success_response("Promotion submitted for approval", data={"promotion_id": promotion.id})
-        except Exception as e:
-            logger.error(f"Error submitting promotion for approval: {str(e)}")
-            return error_response("Failed to submit promotion", 500)
-
-    def get_by_id(self, promo_id: int):
-        try:
-            return self.db.query(Promotion).filter(Promotion.id == promo_id).first()
+            return await self.db.get(Promotion, promo_id)
         except Exception as e:
             logger.error(f"Error fetching promotion by ID {promo_id}: {str(e)}")
             return None
 
-    def get_all(self, status=None):
+    async def get_with_counters(self, promo_id: int):
+        result = await self.db.execute(
+            select(*Promotion.__table__.c, *COUNTER_COLUMNS)
+            .outerjoin(PromotionCounter, PromotionCounter.promotion_id == Promotion.id)
+            .where(Promotion.id == promo_id)
+        )
+        return result.mappings().first()
+
+    async def get_all(
+        self,
+        limit: int,
+        status: Optional[str] = None,
+        created_by: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+    ):
+        # Newest first, keyset-paginated on (created_at, id). One extra row
+        # is fetched so the caller can tell whether another page exists.
         try:
-            query = self.db.query(Promotion)
-            if status:
-                query = query.filter(Promotion.status == status)
-            return query.all()
+            query = _filtered(
+                select(*LIST_COLUMNS, *COUNTER_COLUMNS).outerjoin(
+                    PromotionCounter, PromotionCounter.promotion_id == Promotion.id
+                ),
+                status, created_by, created_from, created_to,
+            )
+            if after is not None:
+                query = query.where(tuple_(Promotion.created_at, Promotion.id) < tuple_(*after))
+            query = query.order_by(Promotion.created_at.desc(), Promotion.id.desc()).limit(limit + 1)
+            result = await self.db.execute(query)
+            return result.mappings().all()
         except Exception as e:
             logger.error(f"Error fetching all promotions: {str(e)}")
             return []
 
-    def delete(self, promotion: Promotion):
+    async def stream_all(
+        self,
+        status: Optional[str] = None,
+        created_by: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ):
+        # Same filters and order as get_all, read through a server-side
+        # cursor; only ``chunk_size`` rows are buffered at a time.
+        query = _filtered(select(*EXPORT_COLUMNS), status, created_by, created_from, created_to)
+        result = await self.db.stream(
+            query.order_by(Promotion.created_at.desc(), Promotion.id.desc()).execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def apply_transition(self, statement, promotion_id: int, segments: Optional[List[str]] = None):
+        """Run a guarded transition UPDATE; returns the RETURNING row, or None if the guard failed."""
         try:
-            self.db.delete(promotion)
-            self.db.commit()
+            row = (await self.db.execute(statement)).mappings().first()
+            if row is None:
+                await self.db.rollback()
+                return None
+            if segments is not None:
+                await self.set_segments(promotion_id, segments)
+            await self.db.commit()
+            return row
         except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error deleting promotion ID {promotion.id}: {str(e)}")
+            await self.db.rollback()
+            logger.error(f"Error applying transition to promotion {promotion_id}: {str(e)}")
             raise
 
-    def update(self):
+    async def get_state(self, promotion_id: int):
+        result = await self.db.execute(
+            select(Promotion.id, Promotion.created_by, Promotion.status, Promotion.version)
+            .where(Promotion.id == promotion_id)
+        )
+        return result.mappings().first()
+
+    async def transition_many(self, promotion_ids: List[int], from_status: str, values: dict) -> List[int]:
+        """Move every promotion in ``promotion_ids`` that is still in ``from_status``; returns the moved ids.
+
+        The status guard sits in the UPDATE itself, so a promotion another
+        moderator already handled is skipped rather than overwritten.
+        """
         try:
-            self.db.commit()
+            result = await self.db.execute(
+                update(Promotion)
+                .where(Promotion.id.in_(promotion_ids), Promotion.status == from_status)
+                .values(**values)
+                .returning(Promotion.id)
+                .execution_options(synchronize_session=False)
+            )
+            moved_ids = result.scalars().all()
+            await self.db.commit()
+            return moved_ids
         except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error during update commit: {str(e)}")
+            await self.db.rollback()
+            logger.error(f"Error moving promotions out of {from_status}: {str(e)}")
             raise
 
-    def get_public_promotions(self):
+    async def get_statuses(self, promotion_ids: List[int]) -> dict:
+        result = await self.db.execute(select(Promotion.id, Promotion.status).where(Promotion.id.in_(promotion_ids)))
+        return dict(result.all())
+
+    async def delete(self, promotion: Promotion):
         try:
-            return self.db.query(Promotion).filter(Promotion.status.in_(["approved", "active"])).all()
+            # SQLite doesn't enforce the ON DELETE CASCADE, so clear links explicitly.
+            await self.db.execute(delete(promotion_segments).where(promotion_segments.c.promotion_id == promotion.id))
+            await self.db.delete(promotion)
+            await self.db.commit()
         except Exception as e:
-            logger.error(f"Error fetching public promotions: {str(e)}")
+            await self.db.rollback()
+            logger.error(f"Error deleting promotion ID {promotion.id}: {str(e)}")
+            raise
+
+    async def _segment_ids(self, names: List[str]) -> dict:
+        result = await self.db.execute(select(Segment.name, Segment.id).where(Segment.name.in_(names)))
+        return dict(result.all())
+
+    async def set_segments(self, promotion_id: int, names: List[str]):
+        # Replaces the promotion's segments inside the caller's transaction.
+        segment_ids = {}
+        if names:
+            segment_ids = await self._segment_ids(names)
+            missing = [name for name in names if name not in segment_ids]
+            if missing:
+                await self.db.execute(insert_ignoring_conflicts(Segment.__table__, "name"), [{"name": name} for name in missing])
+                segment_ids.update(await self._segment_ids(missing))
+
+        await self.db.execute(
+            delete(promotion_segments).where(
+                promotion_segments.c.promotion_id == promotion_id,
+                promotion_segments.c.segment_id.not_in(list(segment_ids.values())),
+            )
+        )
+        if segment_ids:
+            await self.db.execute(
+                insert_ignoring_conflicts(promotion_segments),
+                [{"promotion_id": promotion_id, "segment_id": segment_id} for segment_id in segment_ids.values()],
+            )
+
+    async def get_by_segments(
+        self,
+        names: List[str],
+        match_all: bool,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+    ):
+        # Resolve names first so the promotion lookup is a pure index probe
+        # on (segment_id, promotion_id): union is an IN over the link rows,
+        # intersection additionally needs every segment to be present.
+        segment_ids = await self._segment_ids(names)
+        if not segment_ids or (match_all and len(segment_ids) < len(names)):
             return []
 
-    def save_promotion_for_user(self, promotion_id: int, user_id: int):
+        matching = select(promotion_segments.c.promotion_id).where(
+            promotion_segments.c.segment_id.in_(list(segment_ids.values()))
+        )
+        if match_all and len(segment_ids) > 1:
+            matching = matching.group_by(promotion_segments.c.promotion_id).having(
+                func.count() == len(segment_ids)
+            )
+
+        query = select(*LIST_COLUMNS, Promotion.target_segments).where(
+            Promotion.id.in_(matching),
+            Promotion.status.in_(PUBLIC_STATUSES),
+        )
+        if after is not None:
+            query = query.where(tuple_(Promotion.created_at, Promotion.id) < tuple_(*after))
+        query = query.order_by(Promotion.created_at.desc(), Promotion.id.desc()).limit(limit + 1)
+        result = await self.db.execute(query)
+        return result.mappings().all()
+
+    async def get_public_promotions(self):
         try:
-            existing = self.db.query(SavedPromotion).filter_by(user_id=user_id, promotion_id=promotion_id).first()
-            if existing:
-                return error_response("Promotion already saved", 400)
-
-            saved = SavedPromotion(user_id=user_id, promotion_id=promotion_id)
-            self.db.add(saved)
-            self.db.commit()
-            return success_response("Promotion saved successfully")
+            result = await self.db.execute(
+                select(*PUBLIC_COLUMNS)
+                .where(Promotion.status.in_(PUBLIC_STATUSES))
+                .order_by(Promotion.created_at.desc(), Promotion.id.desc())
+            )
+            return result.mappings().all()
         except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error saving promotion for user {user_id}: {str(e)}")
-            return error_response("Failed to save promotion", 500)
+            # Raise rather than return [] so an outage is never cached as an empty feed.
+            logger.error(f"Error fetching public promotions: {str(e)}")
+            raise
+
+    async def search_public(self, text: str, limit: int, after: Optional[Tuple[float, int]] = None):
+        # Ranked best-first, keyset-paginated on (rank, id); like get_all,
+        # one extra row tells the caller whether there is another page.
+        dialect = self.db.bind.dialect.name
+        if dialect == "postgresql":
+            ts_query = func.websearch_to_tsquery("english", text)
+            vector = literal_column(f"promotions.{SEARCH_VECTOR_COLUMN}")
+            rank = func.ts_rank_cd(vector, ts_query)
+            query = select(*SEARCH_COLUMNS, rank.label("rank")).where(vector.op("@@")(ts_query))
+        elif dialect == "sqlite":
+            match = _fts5_query(text)
+            if not match:
+                return []
+            fts = table(SEARCH_FTS_TABLE, column("rowid"))
+            fts_column = literal_column(SEARCH_FTS_TABLE)
+            # bm25 is lower-is-better; negate it so both backends rank descending.
+            rank = -func.bm25(fts_column, 10.0, 4.0, 1.0)
+            query = (
+                select(*SEARCH_COLUMNS, rank.label("rank"))
+                .select_from(Promotion)
+                .join(fts, fts.c.rowid == Promotion.id)
+                .where(fts_column.op("MATCH")(match))
+            )
+        else:
+            raise ValueError(f"Full-text search is not supported on {dialect}")
+
+        query = query.where(Promotion.status.in_(PUBLIC_STATUSES))
+        if after is not None:
+            query = query.where(tuple_(rank, Promotion.id) < tuple_(*after))
+        query = query.order_by(rank.desc(), Promotion.id.desc()).limit(limit + 1)
+        result = await self.db.execute(query)
+        return result.mappings().all()
 
-    def redeem_promotion_by_code(self, code: str):
+    def _insert_saved(self, user_id: int, promotion_ids: List[int]):
+        # INSERT ... SELECT so unknown or non-public ids are dropped by the
+        # same statement that does the insert, and ON CONFLICT makes a
+        # concurrent duplicate save a no-op instead of an IntegrityError.
+        source = select(literal(user_id), Promotion.id, literal(datetime.utcnow())).where(
+            Promotion.id.in_(promotion_ids),
+            Promotion.status.in_(PUBLIC_STATUSES),
+        )
+        saved = SavedPromotion.__table__
+        return (
+            insert_ignoring_conflicts(saved, "user_id", "promotion_id")
+            .from_select(["user_id", "promotion_id", "saved_at"], source)
+            .returning(saved.c.promotion_id)
+        )
+
+    async def save_promotions_for_user(self, user_id: int, promotion_ids: List[int]) -> List[int]:
+        """Save every public promotion in ``promotion_ids``; returns the ids that were newly saved."""
+        try:
+            result = await self.db.execute(self._insert_saved(user_id, promotion_ids))
+            saved_ids = result.scalars().all()
+            await self.db.commit()
+            return saved_ids
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error saving promotions for user {user_id}: {str(e)}")
+            raise
+
+    async def unsave_promotions_for_user(self, user_id: int, promotion_ids: List[int]) -> List[int]:
         try:
-            promo = self.db.query(Promotion).filter(
-                Promotion.promo_code == code,
-                Promotion.status == "active"
-            ).first()
-            if not promo:
-                return error_response("Invalid or expired promo code", 404)
-            return success_response("Promotion redeemed successfully", data=promo)
+            result = await self.db.execute(
+                delete(SavedPromotion)
+                .where(SavedPromotion.user_id == user_id, SavedPromotion.promotion_id.in_(promotion_ids))
+                .returning(SavedPromotion.promotion_id)
+            )
+            removed_ids = result.scalars().all()
+            await self.db.commit()
+            return removed_ids
         except Exception as e:
-            logger.error(f"Error redeeming promotion code {code}: {str(e)}")
-            return error_response("Failed to redeem promotion", 500)
+            await self.db.rollback()
+            logger.error(f"Error unsaving promotions for user {user_id}: {str(e)}")
+            raise
+
+    async def is_saved(self, user_id: int, promotion_id: int) -> bool:
+        result = await self.db.execute(
+            select(SavedPromotion.id).where(SavedPromotion.user_id == user_id, SavedPromotion.promotion_id == promotion_id)
+        )
+        return result.first() is not None
+
+    async def get_saved_for_user(self, user_id: int, limit: int, after: Optional[Tuple[datetime, int]] = None):
+        # Newest save first, keyset-paginated on (saved_at, saved id) off
+        # ix_saved_promotions_user_id_saved_at_id; promotions come in the same join.
+        query = (
+            select(
+                SavedPromotion.id.label("saved_id"),
+                SavedPromotion.saved_at,
+                Promotion.id,
+                Promotion.title,
+                Promotion.status,
+                Promotion.image_url,
+                Promotion.discount,
+                Promotion.start_date,
+                Promotion.end_date,
+            )
+            .join(Promotion, Promotion.id == SavedPromotion.promotion_id)
+            .where(SavedPromotion.user_id == user_id)
+        )
+        if after is not None:
+            query = query.where(tuple_(SavedPromotion.saved_at, SavedPromotion.id) < tuple_(*after))
+        query = query.order_by(SavedPromotion.saved_at.desc(), SavedPromotion.id.desc()).limit(limit + 1)
+        result = await self.db.execute(query)
+        return result.mappings().all()
@@ -1,143 +1,216 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import List
+from app.db import insert_ignoring_conflicts
 from app.models.role import Role
-from app.models.permission import Permission
+from app.models.permission import Permission, role_permissions
 from app.models.module import Module
 from app.schemas.role import RoleCreate
+from app.services.permission_matrix import permission_matrix, bump_authz_version
 from fastapi import HTTPException
 import logging
 logger = logging.getLogger(__name__)
 
 
 class RoleRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, role: RoleCreate):
+    async def _resolve_modules(self, modules_data) -> List[Module]:
+        ids = {module_data.id for module_data in modules_data if module_data.id}
+        names = {module_data.name for module_data in modules_data}
+        result = await self.db.execute(select(Module).where(or_(Module.id.in_(ids), Module.name.in_(names))))
+        existing = result.scalars().all()
+        by_id = {module.id: module for module in existing}
+        by_name = {module.name: module for module in existing}
+
+        missing = sorted({
+            module_data.name for module_data in modules_data
+            if module_data.id not in by_id and module_data.name not in by_name
+        })
+        if missing:
+            await self.db.execute(
+                insert_ignoring_conflicts(Module.__table__, "name"),
+                [{"name": name} for name in missing],
+            )
+            result = await self.db.execute(select(Module).where(Module.name.in_(missing)))
+            by_name.update({module.name: module for module in result.scalars().all()})
+
+        return [by_id.get(module_data.id) or by_name[module_data.name] for module_data in modules_data]
+
+    async def _resolve_permissions(self, modules_data) -> List[Permission]:
+        # Constant number of statements however many modules/permissions the
+        # role lists: find what exists, insert the rest, read back the inserts.
+        modules = await self._resolve_modules(modules_data)
+        wanted = list(dict.fromkeys(
+            (module.id, perm_name)
+            for module, module_data in zip(modules, modules_data)
+            for perm_name in module_data.permissions
+        ))
+        if not wanted:
+            return []
+
+        module_ids = {module_id for module_id, _ in wanted}
+        perm_names = {perm_name for _, perm_name in wanted}
+        query = (
+            select(Permission)
+            .options(contains_eager(Permission.module))
+            .join(Permission.module)
+            .where(Permission.module_id.in_(module_ids), Permission.name.in_(perm_names))
+        )
+        result = await self.db.execute(query)
+        found = {(perm.module_id, perm.name): perm for perm in result.scalars().all()}
+
+        missing = [key for key in wanted if key not in found]
+        if missing:
+            await self.db.execute(
+                insert_ignoring_conflicts(Permission.__table__, "module_id", "name"),
+                [{"module_id": module_id, "name": perm_name} for module_id, perm_name in missing],
+            )
+            result = await self.db.execute(query)
+            found = {(perm.module_id, perm.name): perm for perm in result.scalars().all()}
+
+        return [found[key] for key in wanted]
+
+    async def _write_role_permissions(self, role_id: int, permissions: List[Permission], replace: bool):
+        permission_ids = [perm.id for perm in permissions]
+        if replace:
+            await self.db.execute(
+                delete(role_permissions).where(
+                    role_permissions.c.role_id == role_id,
+                    role_permissions.c.permission_id.not_in(permission_ids),
+                )
+            )
+        if permission_ids:
+            await self.db.execute(
+                insert_ignoring_conflicts(role_permissions),
+                [{"role_id": role_id, "permission_id": perm_id} for perm_id in permission_ids],
+            )
+
+    async def create(self, role: RoleCreate):
         
-        existing_role = self.db.query(Role).filter(Role.name.ilike(role.name)).first()
+        result = await self.db.execute(select(Role).where(Role.name.ilike(role.name)))
+        existing_role = result.scalars().first()
         if existing_role:
             raise HTTPException(status_code=400, detail=f"Role '{role.name}' already exists")
         db_role = Role(name=role.name)
-        all_permissions = []
-
-        for module_data in role.modules:
-            db_module = None
-
-            if module_data.id:
-                db_module = self.db.query(Module).filter(Module.id == module_data.id).first()
-
-            if not db_module:
-                db_module = self.db.query(Module).filter(Module.name == module_data.name).first()
-
-            if not db_module:
-                db_module = Module(name=module_data.name)
-                self.db.add(db_module)
-                self.db.flush()
-
-            for perm_name in module_data.permissions:
-                permission = (
-                    self.db.query(Permission)
-                    .filter(Permission.name == perm_name, Permission.module_id == db_module.id)
-                    .first()
-                )
-
-                if not permission:
-                    permission = Permission(name=perm_name, module_id=db_module.id)
-                    self.db.add(permission)
-                    self.db.flush()
+        self.db.add(db_role)
+        await self.db.flush()
+        role_id = db_role.id
 
-                all_permissions.append(permission)
+        permissions = await self._resolve_permissions(role.modules)
+        await self._write_role_permissions(role_id, permissions, replace=False)
+        matrix_entries = [(perm.id, perm.name, perm.module.name) for perm in permissions]
 
-        db_role.permissions = all_permissions
-        self.db.add(db_role)
-        self.db.commit()
-        self.db.refresh(db_role)
+        version = await self.db.run_sync(bump_authz_version)
+        await self.db.commit()
+        permission_matrix.set_role_permissions(version, role_id, matrix_entries)
+        set_committed_value(db_role, "permissions", permissions)
         return db_role
 
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return (
-            self.db.query(Role)
+    async def get_all(self, skip: int = 0, limit: int = 100):
+        result = await self.db.execute(
+            select(Role)
             .options(joinedload(Role.permissions).joinedload(Permission.module))
+            .order_by(Role.id)
             .offset(skip)
             .limit(limit)
-            .all()
         )
-    def get_by_id(self, role_id: int):
-        return (
-            self.db.query(Role)
+        return result.unique().scalars().all()
+    async def get_by_id(self, role_id: int):
+        result = await self.db.execute(
+            select(Role)
             .options(joinedload(Role.permissions).joinedload(Permission.module))
-            .filter(Role.id == role_id)
-            .first()
+            .where(Role.id == role_id)
         )
+        return result.unique().scalars().first()
 
-    def delete(self, role_id: int) -> bool:
-        db_role = self.get_by_id(role_id)
+    async def update(self, role_id: int, role_data: RoleCreate):
+        db_role = await self.db.get(Role, role_id)
         if not db_role:
-            return False  # Role does not exist
+            return None
 
-        try:
-            self.db.delete(db_role)
-            self.db.commit()
-            return True
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Failed to delete role {role_id}: {str(e)}")
-            return False
+        db_role.name = role_data.name
+        permissions = await self._resolve_permissions(role_data.modules)
+        await self._write_role_permissions(role_id, permissions, replace=True)
+        matrix_entries = [(perm.id, perm.name, perm.module.name) for perm in permissions]
+
+        version = await self.db.run_sync(bump_authz_version)
+        await self.db.commit()
+        permission_matrix.set_role_permissions(version, role_id, matrix_entries)
+        set_committed_value(db_role, "permissions", permissions)
+        return db_role
 
-    def update(self, role_id: int, role_data: RoleCreate):
-        db_role = self.get_by_id(role_id)
-        if not db_role:
+    async def patch_permissions(self, role_id: int, add_ids: List[int], remove_ids: List[int]):
+        # Applies only the diff; returns None if the role doesn't exist, else
+        # the permissions that were actually granted and revoked.
+        add_ids, remove_ids = set(add_ids), set(remove_ids)
+        overlap = add_ids & remove_ids
+        if overlap:
+            raise HTTPException(status_code=400, detail=f"Permissions both added and removed: {sorted(overlap)}")
+
+        if await self.db.get(Role, role_id) is None:
             return None
 
-        db_role.name = role_data.name
-        all_permissions = []
-
-        for module_data in role_data.modules:
-            db_module = None
-            if module_data.id:
-                db_module = self.db.query(Module).filter(Module.id == module_data.id).first()
-
-            if not db_module:
-                db_module = self.db.query(Module).filter(Module.name == module_data.name).first()
-
-            if not db_module:
-                db_module = Module(name=module_data.name)
-                self.db.add(db_module)
-                self.db.flush()
-
-            for perm_name in module_data.permissions:
-                permission = (
-                    self.db.query(Permission)
-                    .filter(Permission.name == perm_name, Permission.module_id == db_module.id)
-                    .first()
+        added, removed = [], []
+        if add_ids:
+            result = await self.db.execute(
+                select(Permission.id, Permission.name, Module.name)
+                .join(Module, Permission.module_id == Module.id)
+                .where(Permission.id.in_(add_ids))
+            )
+            known = {row[0]: tuple(row) for row in result.all()}
+            unknown = add_ids - known.keys()
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown permission ids: {sorted(unknown)}")
+
+            result = await self.db.execute(
+                insert_ignoring_conflicts(role_permissions)
+                .values([{"role_id": role_id, "permission_id": perm_id} for perm_id in sorted(add_ids)])
+                .returning(role_permissions.c.permission_id)
+            )
+            added = [known[perm_id] for perm_id in sorted(result.scalars().all())]
+
+        if remove_ids:
+            result = await self.db.execute(
+                delete(role_permissions)
+                .where(role_permissions.c.role_id == role_id, role_permissions.c.permission_id.in_(remove_ids))
+                .returning(role_permissions.c.permission_id)
+            )
+            removed_ids = sorted(result.scalars().all())
+            if removed_ids:
+                result = await self.db.execute(
+                    select(Permission.id, Permission.name, Module.name)
+                    .join(Module, Permission.module_id == Module.id, isouter=True)
+                    .where(Permission.id.in_(removed_ids))
                 )
-                if not permission:
-                    permission = Permission(name=perm_name, module_id=db_module.id)
-                    self.db.add(permission)
-                    self.db.flush()
+                removed = sorted((tuple(row) for row in result.all()), key=lambda entry: entry[0])
 
-                all_permissions.append(permission)
+        if not added and not removed:
+            await self.db.rollback()
+            return added, removed
 
-        db_role.permissions = all_permissions
-        self.db.commit()
-        self.db.refresh(db_role)
-        return db_role
+        version = await self.db.run_sync(bump_authz_version)
+        await self.db.commit()
+        permission_matrix.patch_role_permissions(version, role_id, added, [entry[0] for entry in removed])
+        return added, removed
 
-    def delete(self, role_id: int) -> bool:
-        db_role = self.get_by_id(role_id)
+    async def delete(self, role_id: int) -> bool:
+        db_role = await self.get_by_id(role_id)
         if not db_role:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"No role found with ID {role_id}")
             return False
 
         try:
-            self.db.delete(db_role)
-            self.db.commit()
+            await self.db.delete(db_role)
+            version = await self.db.run_sync(bump_authz_version)
+            await self.db.commit()
+            permission_matrix.remove_role(version, role_id)
             logger.info(f"Role {role_id} deleted")
             return True
         except Exception as e:
-            self.db.rollback()
-            logger = logging.getLogger(__name__)
+            await self.db.rollback()
             logger.error(f"Failed to delete role {role_id}: {str(e)}")
             return False
@@ -1,26 +1,42 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.models.user import User
 from app.models.role import Role
+from app.models.permission import Permission
+from app.services.permission_matrix import permission_matrix, bump_authz_version
 from app.schemas import user as user_schema
-from app.utils.security import hash_password
+from app.utils.security import hash_password_async
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import func
+from typing import List, Optional
+from sqlalchemy import func, select
 
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
 
-    def get_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(func.lower(User.email) == email.lower()).first()
+    async def get_by_email(self, email: str) -> Optional[User]:
+        result = await self.db.execute(select(User).where(func.lower(User.email) == email.lower()))
+        return result.scalars().first()
+
+    async def get_with_permissions(self, user_id: int) -> Optional[User]:
+        result = await self.db.execute(
+            select(User)
+            .options(
+                selectinload(User.permissions),
+                selectinload(User.role).selectinload(Role.permissions),
+            )
+            .where(User.id == user_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
 
 
-    def create(self, user: user_schema.UserCreate) -> User:
+    async def create(self, user: user_schema.UserCreate) -> User:
         db_user = User(
             email=user.email,
-            password=hash_password(user.password),
+            password=await hash_password_async(user.password),
             role_id=user.role_id,
             business_license=user.business_license,
             phone_number=user.phone_number,
@@ -28,21 +44,32 @@ class UserRepository:
             otp_expiry=user.otp_expiry,
         )
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
-        return db_user
+        await self.db.commit()
+        return await self.get_with_permissions(db_user.id)
 
-    def update_otp(self, user: User, otp_code: str, expiry: datetime):
+    async def update_otp(self, user: User, otp_code: str, expiry: datetime):
         user.otp_code = otp_code
         user.otp_expiry = expiry
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
 
-    def reset_password(self, user: User, new_password: str):
-        user.password = hash_password(new_password)
+    async def reset_password(self, user: User, new_password: str):
+        user.password = await hash_password_async(new_password)
         user.otp_code = None
         user.otp_expiry = None
-        self.db.commit()
+        await self.db.commit()
+
+    async def set_permissions(self, user: User, permission_ids: List[int]) -> User:
+        await self.db.refresh(user, attribute_names=["permissions"])
+        result = await self.db.execute(select(Permission).where(Permission.id.in_(permission_ids)))
+        user.permissions = list(result.scalars().all())
+        granted_ids = [perm.id for perm in user.permissions]
+        version = await self.db.run_sync(bump_authz_version)
+        user_id = user.id
+        await self.db.commit()
+        permission_matrix.set_user_permissions(version, user_id, granted_ids)
+        return user
 
-    def get_role_by_id(self, role_id: int) -> Optional[Role]:
-        return self.db.query(Role).filter(Role.id == role_id).first()
+    async def get_role_by_id(self, role_id: int) -> Optional[Role]:
+        result = await self.db.execute(select(Role).where(Role.id == role_id))
+        return result.scalars().first()
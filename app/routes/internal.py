@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from app.handlars.internal_handler import InternalHandler
+from app.middleware.middleware import checkAuth
+from app.middleware.permission_check import checkPermission
+
+# Operational stats; only moderators (the admin role) may read them.
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "approve_promotion"))],
+)
+
+router.get("/db-pool")(InternalHandler.db_pool_stats)
+router.get("/token-cache")(InternalHandler.token_cache_stats)
+router.get("/public-feed")(InternalHandler.public_feed_stats)
+router.get("/promotion-lifecycle")(InternalHandler.promotion_lifecycle_stats)
+router.get("/promotion-counters")(InternalHandler.promotion_counter_stats)
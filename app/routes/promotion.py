@@ -7,16 +7,30 @@ router = APIRouter(prefix="/promotions", tags=["promotions"])
 
 router.post("/", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "create_promotion"))])(PromotionHandler.create_promotion)
 router.get("/", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "get_promotion"))])(PromotionHandler.get_promotions)
+router.get("/export", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "get_promotion"))])(PromotionHandler.export_promotions)
 router.get("/{promotion_id}", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "get_promotion"))])(PromotionHandler.get_promotion)
 router.put("/{promotion_id}", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "update_promotion"))])(PromotionHandler.update_promotion)
 router.delete("/{promotion_id}", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "delete_promotion"))])(PromotionHandler.delete_promotion)
 router.post("/{promotion_id}/toggle", dependencies=[Depends(checkAuth),Depends(checkPermission("promotions", "toggle_promotion"))])(PromotionHandler.toggle_promotion_status)
 
+# Registered ahead of /{promotion_id}/... so "batch" is never parsed as an id.
+router.put("/batch/approve", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "approve_promotion"))])(PromotionHandler.approve_promotions)
+router.put("/batch/reject", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "reject_promotion"))])(PromotionHandler.reject_promotions)
 router.post("/{promotion_id}/submit", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "submit_promotion"))])(PromotionHandler.submit_for_approval)
 router.put("/{promotion_id}/approve", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "approve_promotion"))])(PromotionHandler.approve_promotion)
+router.post("/{promotion_id}/codes", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "update_promotion"))])(PromotionHandler.create_promo_code)
+router.post("/{promotion_id}/code-batches", status_code=202, dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "update_promotion"))])(PromotionHandler.create_code_batch)
+router.get("/{promotion_id}/code-batches/{batch_id}", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "update_promotion"))])(PromotionHandler.get_code_batch)
+router.get("/{promotion_id}/code-batches/{batch_id}/codes.csv", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "update_promotion"))])(PromotionHandler.export_code_batch)
 router.put("/{promotion_id}/reject", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "reject_promotion"))])(PromotionHandler.reject_promotion)
 
 router.get("/public/promotions")(PromotionHandler.get_public_promotions)
+router.get("/public/search")(PromotionHandler.search_promotions)
+router.get("/public/segments")(PromotionHandler.get_promotions_by_segments)
 router.post("/public/promotions/{promotion_id}/save", dependencies=[Depends(checkAuth)])(PromotionHandler.save_promotion)
-router.post("/public/promotions/redeem")(PromotionHandler.redeem_promotion)
+router.delete("/public/promotions/{promotion_id}/save", dependencies=[Depends(checkAuth)])(PromotionHandler.unsave_promotion)
+router.get("/public/promotions/saved", dependencies=[Depends(checkAuth)])(PromotionHandler.get_saved_promotions)
+router.post("/public/promotions/saved", dependencies=[Depends(checkAuth)])(PromotionHandler.save_promotions)
+router.delete("/public/promotions/saved", dependencies=[Depends(checkAuth)])(PromotionHandler.unsave_promotions)
+router.post("/public/promotions/redeem", dependencies=[Depends(checkAuth)])(PromotionHandler.redeem_promotion)
 
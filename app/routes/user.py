@@ -1,8 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from app.handlars.profile_handler import UserHandler
+from app.middleware.middleware import checkAuth
+from app.middleware.permission_check import checkPermission
 
 router = APIRouter(prefix="/user", tags=["User"])
 
 router.get("/profile")(UserHandler.read_profile)
 router.put("/profile")(UserHandler.edit_profile)
 router.delete("/profile")(UserHandler.remove_profile)
+router.put("/{user_id}/permissions", dependencies=[Depends(checkAuth), Depends(checkPermission("promotions", "approve_promotion"))])(UserHandler.set_user_permissions)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 
 class PromotionBase(BaseModel):
@@ -33,6 +33,23 @@ class PromotionApproval(BaseModel):
     
     class Config:
         from_attributes = True
+class PromotionBatchModeration(BaseModel):
+    promotion_ids: List[int] = Field(..., min_length=1, max_length=500)
+    comments: Optional[str] = None
+
+class SavedPromotionsRequest(BaseModel):
+    promotion_ids: List[int] = Field(..., min_length=1, max_length=100)
+
 class RedeemRequest(BaseModel):
     code: str
 
+class PromoCodeCreate(BaseModel):
+    code: str = Field(..., min_length=3, max_length=64)
+    max_redemptions: Optional[int] = Field(None, ge=1)
+    per_user_limit: Optional[int] = Field(1, ge=1)
+
+
+class PromoCodeBatchCreate(BaseModel):
+    count: int = Field(..., ge=1)
+    prefix: Optional[str] = Field(None, min_length=1, max_length=16, pattern=r"^[A-Za-z0-9]+$")
+
@@ -9,6 +9,10 @@ class ModulePermission(BaseModel):
 class RoleCreate(BaseModel):
     name: str
     modules: List[ModulePermission]
+
+class RolePermissionPatch(BaseModel):
+    add: List[int] = []
+    remove: List[int] = []
 class ModuleInfo(BaseModel):
     id: int
     name: str
@@ -71,6 +71,9 @@ class UserProfile(BaseModel):
     class Config:
         from_attributes = True
 
+class UserPermissionsUpdate(BaseModel):
+    permission_ids: List[int]
+
 class UserProfileUpdate(BaseModel):
     email: Optional[EmailStr] = None
     phone_number: Optional[str] = None
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
 from datetime import datetime, timedelta
@@ -9,13 +9,17 @@ from app.repo.user_repo import UserRepository
 from app.models.user import User
 from app.models.role import Role
 from app.schemas import user as user_schema
-from app.utils.security import verify_password, hash_password, create_access_token
+from app.utils.security import (
+    verify_password_async, hash_password_async, create_access_token, HashPoolBusyError
+)
 from app.utils.response_helper import success_response, error_response
+from app.services.permission_matrix import permission_matrix
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.user_repo = UserRepository(db)
 
@@ -27,11 +31,11 @@ class AuthService:
     def _generate_otp(self) -> str:
         return str(random.randint(100000, 999999))
 
-    def handle_registration(self, user: user_schema.UserCreate):
+    async def handle_registration(self, user: user_schema.UserCreate):
         if not user.role_id:
             user.role_id = 22
 
-        role = self.db.query(Role).filter(Role.id == user.role_id).first()
+        role = await self.user_repo.get_role_by_id(user.role_id)
         if not role:
             return error_response("Invalid role_id", 400)
 
@@ -41,7 +45,7 @@ class AuthService:
             if not user.phone_number:
                 return error_response("Phone number is required for vendors", 400)
 
-        if self.user_repo.get_by_email(user.email):
+        if await self.user_repo.get_by_email(user.email):
             return error_response("Email already registered", 400)
 
         # Generate OTP and expiry
@@ -49,7 +53,11 @@ class AuthService:
         user.otp_expiry = datetime.utcnow() + timedelta(minutes=5)
 
         # Save user
-        db_user = self.user_repo.create(user)
+        try:
+            db_user = await self.user_repo.create(user)
+        except HashPoolBusyError:
+            logger.warning(f"Password hashing pool saturated during registration of {user.email}")
+            return error_response("Server is busy, please try again shortly", 503)
 
         return success_response(
             message="User registered successfully",
@@ -65,28 +73,39 @@ class AuthService:
             }
         )
 
-    def handle_login(self, user: user_schema.UserLogin):
-        db_user = self.user_repo.get_by_email(user.email)
-        if not db_user or not verify_password(user.password, db_user.password):
+    async def handle_login(self, user: user_schema.UserLogin):
+        db_user = await self.user_repo.get_by_email(user.email)
+        try:
+            valid = bool(db_user) and await verify_password_async(user.password, db_user.password)
+        except HashPoolBusyError:
+            logger.warning(f"Password hashing pool saturated during login for {user.email}")
+            return error_response("Server is busy, please try again shortly", 503)
+
+        if not valid:
             logger.warning(f"Authentication failed for email: {user.email}")
             return error_response("Invalid credentials", 401)
 
-        token = create_access_token({"sub": db_user.email})
+        claims = {"sub": db_user.email}
+        if settings.EMBED_PERMISSIONS_IN_TOKEN:
+            await self.db.run_sync(permission_matrix.ensure_fresh)
+            claims.update(permission_matrix.token_claims(db_user.id, db_user.role_id))
+
+        token = create_access_token(claims)
         logger.info(f"User {user.email} authenticated successfully.")
         return success_response(
             message="Login successful",
             data={"access_token": token, "token_type": "bearer"}
         )
 
-    def forgot_password(self, email: str):
-        user = self.user_repo.get_by_email(email)
+    async def forgot_password(self, email: str):
+        user = await self.user_repo.get_by_email(email)
         if not user:
             return error_response("User not found", 404)
 
         otp = self._generate_otp()
         user.otp_code = otp
         user.otp_expiry = datetime.utcnow() + timedelta(minutes=5)
-        self.user_repo.update_otp(user, otp, user.otp_expiry)
+        await self.user_repo.update_otp(user, otp, user.otp_expiry)
 
         logger.info(f"OTP generated for {email}: {otp}")
         return success_response(
@@ -94,8 +113,8 @@ class AuthService:
             data={"otp": otp} 
         )
 
-    def verify_otp(self, email: str, otp: str):
-        user = self.user_repo.get_by_email(email)
+    async def verify_otp(self, email: str, otp: str):
+        user = await self.user_repo.get_by_email(email)
         if not user:
             return error_response("User not found", 404)
 
@@ -108,15 +127,19 @@ class AuthService:
         logger.info(f"OTP verified successfully for {email}")
         return success_response(message="OTP verified")
 
-    def reset_password(self, email: str, new_password: str):
-        user = self.user_repo.get_by_email(email)
+    async def reset_password(self, email: str, new_password: str):
+        user = await self.user_repo.get_by_email(email)
         if not user:
             return error_response("User not found", 404)
 
-        user.password = hash_password(new_password)
+        try:
+            user.password = await hash_password_async(new_password)
+        except HashPoolBusyError:
+            logger.warning(f"Password hashing pool saturated during password reset for {email}")
+            return error_response("Server is busy, please try again shortly", 503)
         user.otp_code = None
         user.otp_expiry = None
-        self.user_repo.update_otp(user, user.otp_code, user.otp_expiry)
+        await self.user_repo.update_otp(user, user.otp_code, user.otp_expiry)
 
         logger.info(f"Password reset successful for {email}")
         return success_response(message="Password reset successful")
@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+import os
+import struct
+import time
+import logging
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import insert, update
+from app.config import settings
+from app.db import async_engine
+from app.models.promo_code import PromoCode, PromoCodeBatch
+
+logger = logging.getLogger(__name__)
+
+# Crockford base32: no I, L, O or U, so codes survive being read aloud or retyped.
+CODE_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_PAIRS = [a + b for a in CODE_ALPHABET for b in CODE_ALPHABET]
+SEQUENCE_BITS = 30
+MAX_BATCH_SIZE = 1 << SEQUENCE_BITS
+CODE_COLUMNS = ("code", "promotion_id", "max_redemptions", "per_user_limit", "redemption_count", "batch_id", "created_at")
+
+
+def _encode(value: int) -> str:
+    digits = []
+    while True:
+        digits.append(CODE_ALPHABET[value & 31])
+        value >>= 5
+        if not value:
+            return "".join(reversed(digits))
+
+
+def generate_codes(batch_id: int, count: int, chunk_size: int, prefix: Optional[str] = None,
+                   key: Optional[bytes] = None) -> Iterator[List[str]]:
+    """Yield ``count`` codes in chunks, never holding more than one chunk.
+
+    A code is ``[PREFIX-]<batch><sequence><check>``. The sequence and
+    check parts are always six characters each, so the batch part is
+    everything before them. Codes are therefore unique by construction
+    within a batch and across batches. The check part is 30 bits from
+    a keyed SHAKE stream. Without the per-batch key, which is never
+    stored, the next code can't be derived from one that leaked.
+    """
+    if count > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch holds at most {MAX_BATCH_SIZE} codes")
+    key = key or os.urandom(32)
+    head = (f"{prefix}-" if prefix else "") + _encode(batch_id)
+    pairs = _PAIRS
+    for chunk_start in range(0, count, chunk_size):
+        chunk_end = min(chunk_start + chunk_size, count)
+        stream = hashlib.shake_256(key + chunk_start.to_bytes(8, "big")).digest(4 * (chunk_end - chunk_start))
+        yield [
+            head
+            + pairs[seq >> 20 & 1023] + pairs[seq >> 10 & 1023] + pairs[seq & 1023]
+            + pairs[check >> 20 & 1023] + pairs[check >> 10 & 1023] + pairs[check & 1023]
+            for seq, (check,) in zip(range(chunk_start, chunk_end), struct.iter_unpack(">I", stream))
+        ]
+
+
+async def _copy_rows(conn, rows: List[Tuple]):
+    # COPY on Postgres and the driver's executemany on SQLite skip per-row
+    # statement building; anything else goes through a Core executemany.
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table("promo_codes", records=rows, columns=list(CODE_COLUMNS))
+    elif dialect == "sqlite":
+        raw = await conn.get_raw_connection()
+        placeholders = ", ".join("?" for _ in CODE_COLUMNS)
+        await raw.driver_connection.executemany(
+            f"INSERT INTO promo_codes ({', '.join(CODE_COLUMNS)}) VALUES ({placeholders})", rows
+        )
+    else:
+        await conn.execute(insert(PromoCode.__table__), [dict(zip(CODE_COLUMNS, row)) for row in rows])
+
+
+class CodeGenerationJobs:
+    """Runs bulk generation as background tasks.
+
+    Every chunk commits together with the batch's ``generated`` count, so
+    progress is readable from any worker and a crash never leaves codes
+    that aren't counted.
+    """
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self._tasks = {}
+
+    async def run(self, batch_id: int, promotion_id: int, count: int, prefix: Optional[str] = None) -> int:
+        batches = PromoCodeBatch.__table__
+        started = time.perf_counter()
+        generated = 0
+        try:
+            async with async_engine.begin() as conn:
+                await conn.execute(update(batches).where(batches.c.id == batch_id).values(status="running"))
+
+            for codes in generate_codes(batch_id, count, self.chunk_size, prefix):
+                now = datetime.utcnow()
+                rows = [(code, promotion_id, 1, 1, 0, batch_id, now) for code in codes]
+                async with async_engine.begin() as conn:
+                    await _copy_rows(conn, rows)
+                    generated += len(rows)
+                    await conn.execute(update(batches).where(batches.c.id == batch_id).values(generated=generated))
+                # Yield between chunks so request handling keeps up during big jobs.
+                await asyncio.sleep(0)
+
+            async with async_engine.begin() as conn:
+                await conn.execute(
+                    update(batches).where(batches.c.id == batch_id)
+                    .values(status="completed", finished_at=datetime.utcnow())
+                )
+            logger.info(f"Promo code batch {batch_id}: {generated} codes in {time.perf_counter() - started:.2f}s")
+            return generated
+        except Exception as e:
+            logger.error(f"Promo code batch {batch_id} failed after {generated} codes: {str(e)}")
+            async with async_engine.begin() as conn:
+                await conn.execute(
+                    update(batches).where(batches.c.id == batch_id)
+                    .values(status="failed", error=str(e)[:1000], finished_at=datetime.utcnow())
+                )
+            raise
+
+    def start(self, batch_id: int, promotion_id: int, count: int, prefix: Optional[str] = None):
+        task = asyncio.create_task(self.run(batch_id, promotion_id, count, prefix), name=f"promo-codes-{batch_id}")
+        self._tasks[batch_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(batch_id, None))
+        return task
+
+    async def shutdown(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+
+code_generation_jobs = CodeGenerationJobs(chunk_size=settings.PROMO_CODE_CHUNK_SIZE)
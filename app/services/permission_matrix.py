@@ -0,0 +1,197 @@
+import base64
+import threading
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.db import insert_ignoring_conflicts
+from app.models.module import Module
+from app.models.permission import Permission, AuthzVersion, role_permissions, user_permissions
+
+logger = logging.getLogger(__name__)
+
+
+def _bits(permission_ids: Iterable[int]) -> int:
+    mask = 0
+    for permission_id in permission_ids:
+        mask |= 1 << permission_id
+    return mask
+
+
+def encode_permission_bits(mask: int) -> str:
+    raw = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_permission_bits(encoded: str) -> int:
+    padded = encoded + "=" * (-len(encoded) % 4)
+    return int.from_bytes(base64.urlsafe_b64decode(padded), "little")
+
+
+def bump_authz_version(db: Session) -> int:
+    # Runs inside the caller's transaction so the version moves together
+    # with the role/permission rows it describes. FOR UPDATE locks nothing
+    # while the row is missing, so it is created first; concurrent first
+    # bumps then serialize on the row instead of racing to insert it.
+    db.execute(insert_ignoring_conflicts(AuthzVersion.__table__, "id").values(id=1, version=0))
+    row = db.query(AuthzVersion).filter(AuthzVersion.id == 1).with_for_update().populate_existing().one()
+    row.version += 1
+    db.flush()
+    return row.version
+
+
+class PermissionMatrix:
+    def __init__(self, refresh_interval: float = 5.0):
+        self.refresh_interval = refresh_interval
+        self.version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._permission_ids: Dict[Tuple[str, str], int] = {}
+        self._permission_names: Dict[int, str] = {}
+        self._module_permissions: Dict[str, Dict[str, int]] = {}
+        self._role_bits: Dict[int, int] = {}
+        self._user_bits: Dict[int, int] = {}
+
+    def _read_version(self, db: Session) -> int:
+        row = db.query(AuthzVersion.version).filter(AuthzVersion.id == 1).first()
+        return row[0] if row else 0
+
+    def rebuild(self, db: Session):
+        version = self._read_version(db)
+        rows = (
+            db.query(Permission.id, Permission.name, Module.name)
+            .join(Module, Permission.module_id == Module.id)
+            .all()
+        )
+        modules = {name.lower(): {} for (name,) in db.query(Module.name).all()}
+        permission_ids = {}
+        permission_names = {}
+        for permission_id, permission_name, module_name in rows:
+            key = (module_name.lower(), permission_name.lower())
+            permission_ids[key] = permission_id
+            permission_names[permission_id] = permission_name
+            modules.setdefault(key[0], {})[key[1]] = permission_id
+
+        role_bits = {}
+        for role_id, permission_id in db.query(role_permissions.c.role_id, role_permissions.c.permission_id):
+            role_bits[role_id] = role_bits.get(role_id, 0) | (1 << permission_id)
+
+        user_bits = {}
+        for user_id, permission_id in db.query(user_permissions.c.user_id, user_permissions.c.permission_id):
+            user_bits[user_id] = user_bits.get(user_id, 0) | (1 << permission_id)
+
+        with self._lock:
+            self._permission_ids = permission_ids
+            self._permission_names = permission_names
+            self._module_permissions = modules
+            self._role_bits = role_bits
+            self._user_bits = user_bits
+            self.version = version
+            self._checked_at = time.monotonic()
+        logger.info(f"Permission matrix rebuilt at version {version} ({len(permission_ids)} permissions)")
+
+    def ensure_fresh(self, db: Session):
+        if self.version is not None and time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+
+        if self.version is None or self._read_version(db) != self.version:
+            self.rebuild(db)
+        else:
+            self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self.version = None
+
+    def permission_id(self, module_name: str, permission_name: str) -> Optional[int]:
+        return self._permission_ids.get((module_name.lower(), permission_name.lower()))
+
+    def module_permissions(self, module_name: str) -> Optional[List[str]]:
+        permissions = self._module_permissions.get(module_name.lower())
+        if permissions is None:
+            return None
+        return [self._permission_names[permission_id] for permission_id in permissions.values()]
+
+    def role_permissions(self, role_id: Optional[int]) -> List[str]:
+        mask = self._role_bits.get(role_id, 0)
+        return [name for permission_id, name in self._permission_names.items() if mask >> permission_id & 1]
+
+    def effective_bits(self, user_id: int, role_id: Optional[int]) -> int:
+        return self._user_bits.get(user_id, 0) | self._role_bits.get(role_id, 0)
+
+    def is_granted(self, user_id: int, role_id: Optional[int], permission_id: int) -> bool:
+        return bool(self.effective_bits(user_id, role_id) >> permission_id & 1)
+
+    def token_claims(self, user_id: int, role_id: Optional[int]) -> dict:
+        return {
+            "perms": encode_permission_bits(self.effective_bits(user_id, role_id)),
+            "pv": self.version,
+        }
+
+    def is_granted_by_claims(self, claims: dict, permission_id: int) -> Optional[bool]:
+        # None means the claims cannot be trusted (missing or older than the
+        # current permission version) and the caller must check the database.
+        encoded = claims.get("perms")
+        stamp = claims.get("pv")
+        if encoded is None or stamp is None or self.version is None or stamp < self.version:
+            return None
+        return bool(decode_permission_bits(encoded) >> permission_id & 1)
+
+    def _apply(self, version: int, patch):
+        # Patch in place only when this worker was current right before the
+        # write; otherwise another worker changed things and we rebuild lazily.
+        with self._lock:
+            if self.version is None or version != self.version + 1:
+                self.version = None
+                return
+            patch()
+            self.version = version
+
+    def _index_permissions(self, entries: List[Tuple[int, str, str]]):
+        for permission_id, permission_name, module_name in entries:
+            key = (module_name.lower(), permission_name.lower())
+            self._permission_ids[key] = permission_id
+            self._permission_names[permission_id] = permission_name
+            self._module_permissions.setdefault(key[0], {})[key[1]] = permission_id
+
+    def set_role_permissions(self, version: int, role_id: int, entries: Iterable[Tuple[int, str, str]]):
+        # entries are (permission_id, permission_name, module_name) tuples
+        # captured before commit, so patching never triggers lazy loads.
+        entries = list(entries)
+
+        def patch():
+            self._index_permissions(entries)
+            self._role_bits[role_id] = _bits(permission_id for permission_id, _, _ in entries)
+
+        self._apply(version, patch)
+
+    def patch_role_permissions(self, version: int, role_id: int, added: Iterable[Tuple[int, str, str]],
+                               removed_ids: Iterable[int]):
+        added = list(added)
+        removed_mask = _bits(removed_ids)
+
+        def patch():
+            self._index_permissions(added)
+            mask = self._role_bits.get(role_id, 0) & ~removed_mask
+            self._role_bits[role_id] = mask | _bits(permission_id for permission_id, _, _ in added)
+
+        self._apply(version, patch)
+
+    def remove_role(self, version: int, role_id: int):
+        self._apply(version, lambda: self._role_bits.pop(role_id, None))
+
+    def remove_user(self, version: int, user_id: int):
+        self._apply(version, lambda: self._user_bits.pop(user_id, None))
+
+    def advance(self, version: int):
+        # For changes the bitsets don't hold, such as a user's role moving;
+        # only the version moves, so older token claims stop being trusted.
+        self._apply(version, lambda: None)
+
+    def set_user_permissions(self, version: int, user_id: int, permission_ids: Iterable[int]):
+        mask = _bits(permission_ids)
+        self._apply(version, lambda: self._user_bits.__setitem__(user_id, mask))
+
+
+permission_matrix = PermissionMatrix(refresh_interval=settings.PERMISSION_MATRIX_REFRESH_SECONDS)
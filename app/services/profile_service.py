@@ -1,18 +1,20 @@
-from sqlalchemy.orm import Session
-from app.schemas.user import UserProfileUpdate
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.user import UserPermissionsUpdate, UserProfileUpdate
 from app.repo.profile_repo import ProfileRepository
+from app.repo.user_repo import UserRepository
 from app.utils.response_helper import success_response, error_response
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ProfileService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.repo = ProfileRepository(db)
+        self.users = UserRepository(db)
 
-    def get_profile(self, user_id: int):
+    async def get_profile(self, user_id: int):
         try:
-            user = self.repo.get_by_id(user_id)
+            user = await self.repo.get_by_id(user_id)
             return success_response(
                 message="User profile retrieved successfully",
                 data={
@@ -29,9 +31,9 @@ class ProfileService:
             logger.error(f"Failed to fetch profile for user {user_id}: {str(e)}")
             return error_response("Failed to retrieve profile", 500)
 
-    def update_profile(self, user_id: int, update_data: UserProfileUpdate):
+    async def update_profile(self, user_id: int, update_data: UserProfileUpdate):
         try:
-            user = self.repo.update(user_id, update_data)
+            user = await self.repo.update(user_id, update_data)
             return success_response(
                 message="User profile updated successfully",
                 data={
@@ -46,10 +48,27 @@ class ProfileService:
             logger.error(f"Error updating profile for user {user_id}: {str(e)}")
             return error_response("Failed to update user profile", 500)
 
-    def delete_profile(self, user_id: int):
+    async def delete_profile(self, user_id: int):
         try:
-            result = self.repo.delete(user_id)
+            result = await self.repo.delete(user_id)
             return success_response(message=result["message"])
         except Exception as e:
             logger.error(f"Error deleting profile for user {user_id}: {str(e)}")
             return error_response("Failed to delete user", 500)
+
+    async def set_permissions(self, user_id: int, data: UserPermissionsUpdate):
+        try:
+            user = await self.users.get_with_permissions(user_id)
+            if not user:
+                return error_response("User not found", 404)
+            user = await self.users.set_permissions(user, data.permission_ids)
+            return success_response(
+                message="User permissions updated successfully",
+                data={
+                    "id": user_id,
+                    "permissions": [{"id": perm.id, "name": perm.name} for perm in user.permissions],
+                }
+            )
+        except Exception as e:
+            logger.error(f"Error updating permissions for user {user_id}: {str(e)}")
+            return error_response("Failed to update user permissions", 500)
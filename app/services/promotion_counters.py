@@ -0,0 +1,151 @@
+import asyncio
+import time
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import select
+from app.config import settings
+from app.db import async_engine, dialect_insert
+from app.models.promotion import Promotion, PromotionCounter
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ("views", "saves", "redemptions")
+
+
+class CounterAggregator:
+    """Write-behind counters for promotion views, saves and redemptions.
+
+    Requests only bump an in-memory dict. A background task folds the
+    pending deltas into ``promotion_counters`` every ``interval`` seconds
+    as one batched upsert, so a hot promotion costs one row write per
+    flush instead of one per request. Unflushed deltas are lost if the
+    process is killed; a clean shutdown always flushes them.
+    """
+
+    def __init__(self, interval: float, max_pending: int):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.flushes = 0
+        self.errors = 0
+        self.rows_written = 0
+        self.last_flush: Optional[dict] = None
+        self._pending: Dict[int, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def incr(self, promotion_id: int, field: str, amount: int = 1):
+        self._pending[promotion_id][field] += amount
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    def pending(self, promotion_id: int) -> Dict[str, int]:
+        # Read-only: a miss must not create an entry in the defaultdict.
+        if promotion_id in self._pending:
+            return self._pending[promotion_id]
+        return dict.fromkeys(COUNTER_FIELDS, 0)
+
+    def discard(self, promotion_id: int):
+        """Drop unflushed deltas for a promotion that no longer exists."""
+        self._pending.pop(promotion_id, None)
+
+    def with_pending(self, row) -> Dict[str, int]:
+        """Stored counts for a row that has the counter columns, plus deltas not yet flushed."""
+        pending = self.pending(row["id"])
+        return {field: (row[field] or 0) + pending[field] for field in COUNTER_FIELDS}
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+            started = time.perf_counter()
+            now = datetime.utcnow()
+            # Sorted so concurrent flushes from several workers lock rows in the same order.
+            rows = [{"promotion_id": promotion_id, **deltas, "updated_at": now}
+                    for promotion_id, deltas in sorted(batch.items())]
+            counters = PromotionCounter.__table__
+            stmt = dialect_insert(counters)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[counters.c.promotion_id],
+                set_={
+                    **{field: counters.c[field] + stmt.excluded[field] for field in COUNTER_FIELDS},
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            try:
+                async with async_engine.begin() as conn:
+                    # A promotion deleted since its deltas were queued would
+                    # fail the foreign key and take the whole batch with it.
+                    # KEY SHARE keeps the survivors from being deleted until commit.
+                    existing = set((await conn.execute(
+                        select(Promotion.id)
+                        .where(Promotion.id.in_(batch))
+                        .order_by(Promotion.id)
+                        .with_for_update(key_share=True)
+                    )).scalars())
+                    rows = [row for row in rows if row["promotion_id"] in existing]
+                    if rows:
+                        await conn.execute(stmt, rows)
+            except Exception:
+                # Put the deltas back so the next flush retries them.
+                for promotion_id, deltas in batch.items():
+                    for field, amount in deltas.items():
+                        self._pending[promotion_id][field] += amount
+                raise
+
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.flushes += 1
+            self.rows_written += len(rows)
+            self.last_flush = {"at": now.isoformat(), "rows": len(rows), "duration_ms": duration_ms}
+            return len(rows)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Promotion counter flush failed: {str(e)}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="promotion-counters")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Final promotion counter flush failed, {len(self._pending)} promotions lost: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "pending_promotions": len(self._pending),
+            "flushes": self.flushes,
+            "errors": self.errors,
+            "rows_written": self.rows_written,
+            "last_flush": self.last_flush,
+        }
+
+
+promotion_counters = CounterAggregator(
+    interval=settings.PROMOTION_COUNTER_FLUSH_SECONDS,
+    max_pending=settings.PROMOTION_COUNTER_MAX_PENDING,
+)
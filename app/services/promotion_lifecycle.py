@@ -0,0 +1,138 @@
+import asyncio
+import time
+import logging
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, update
+from app.config import settings
+from app.db import async_engine
+from app.models.promotion import Promotion
+from app.services.public_feed import public_feed
+
+logger = logging.getLogger(__name__)
+
+ENDABLE_STATUSES = ("approved", "active", "inactive")
+
+
+async def _update_in_batches(where, values: dict, batch_size: int) -> int:
+    # Each batch is its own short transaction. SKIP LOCKED (Postgres only)
+    # lets a second worker's sweep or a concurrent edit pass instead of wait.
+    changed = 0
+    while True:
+        batch = (
+            select(Promotion.id)
+            .where(*where)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with async_engine.begin() as conn:
+            result = await conn.execute(
+                update(Promotion)
+                .where(Promotion.id.in_(batch), *where)
+                .values(**values, version=Promotion.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+        changed += result.rowcount
+        if result.rowcount < batch_size:
+            return changed
+
+
+async def expire_ended(now: datetime, batch_size: int) -> int:
+    return await _update_in_batches(
+        (Promotion.status.in_(ENDABLE_STATUSES), Promotion.end_date <= now),
+        {"status": "expired", "updated_at": now},
+        batch_size,
+    )
+
+
+async def activate_due(now: datetime, batch_size: int) -> int:
+    return await _update_in_batches(
+        (Promotion.status == "approved", Promotion.start_date <= now, Promotion.end_date > now),
+        {"status": "active", "updated_at": now},
+        batch_size,
+    )
+
+
+class LifecycleScheduler:
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.sweeps = 0
+        self.errors = 0
+        self.total_activated = 0
+        self.total_expired = 0
+        self.last_sweep: Optional[dict] = None
+        self._duration_sum_ms = 0.0
+        self._duration_max_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep(self) -> dict:
+        now = datetime.utcnow()
+        started = time.perf_counter()
+        # Expire first so a promotion that started and ended between sweeps
+        # goes straight to expired instead of briefly becoming active.
+        expired = await expire_ended(now, self.batch_size)
+        activated = await activate_due(now, self.batch_size)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if expired or activated:
+            public_feed.invalidate()
+
+        self.sweeps += 1
+        self.total_expired += expired
+        self.total_activated += activated
+        self._duration_sum_ms += duration_ms
+        self._duration_max_ms = max(self._duration_max_ms, duration_ms)
+        self.last_sweep = {
+            "at": now.isoformat(),
+            "duration_ms": duration_ms,
+            "activated": activated,
+            "expired": expired,
+        }
+        logger.info(f"Promotion sweep: {activated} activated, {expired} expired in {duration_ms:.1f}ms")
+        return self.last_sweep
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Promotion sweep failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="promotion-lifecycle")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "sweeps": self.sweeps,
+            "errors": self.errors,
+            "total_activated": self.total_activated,
+            "total_expired": self.total_expired,
+            "duration_ms": {
+                "avg": self._duration_sum_ms / self.sweeps if self.sweeps else 0.0,
+                "max": self._duration_max_ms,
+            },
+            "last_sweep": self.last_sweep,
+        }
+
+
+lifecycle_scheduler = LifecycleScheduler(
+    interval=settings.PROMOTION_SWEEP_INTERVAL_SECONDS,
+    batch_size=settings.PROMOTION_SWEEP_BATCH_SIZE,
+)
@@ -1,24 +1,87 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.models.promotion import Promotion
 from app.schemas.promotion import PromotionCreate, PromotionUpdate, PromotionApproval
 from fastapi import status
 from app.models.user import User
-from app.repo.promotion_repo import PromotionRepository
+from app.repo.promotion_repo import EXPORT_COLUMNS, PUBLIC_STATUSES, PromotionRepository
 from datetime import datetime
-from app.utils.response_helper import success_response, error_response
+from app.utils.response_helper import json_dumps, success_response, error_response
+from app.utils.serializers import RowSerializer
+from app.utils.pagination import (
+    InvalidCursorError, decode_cursor, encode_cursor, decode_rank_cursor, encode_rank_cursor
+)
+from app.config import settings
+from app.utils.segments import normalize_segments, parse_segments
+from app.services.public_feed import public_feed, etag_matches
+from app.services.promotion_counters import promotion_counters
+from app.services import promotion_state
+from app.services.promotion_state import TRANSITIONS, parse_version
+from app.db import AsyncSessionLocal
+from app.utils.export import EXPORT_FORMATS, csv_chunks, ndjson_chunks
+from fastapi import Response
+from fastapi.responses import StreamingResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Response shapes, compiled once; datetimes are encoded by the JSON layer.
+PROMOTION_DETAIL = RowSerializer((
+    "id", "title", "description", "terms", "image_url", "discount", "target_segments", "status",
+    "approval_comments", "start_date", "end_date", "created_by", "created_at", "updated_at", "version",
+))
+PROMOTION_LIST_ITEM = RowSerializer((
+    "id", "title", "status", "start_date", "end_date", "discount", "image_url", "updated_at", "created_by", "created_at",
+))
+PUBLIC_FEED_ITEM = RowSerializer((
+    "id", "title", "description", "terms", "image_url", "discount", "target_segments", "status", "start_date", "end_date",
+))
+SEGMENT_ITEM = RowSerializer((
+    "id", "title", "status", "start_date", "end_date", "discount", "image_url", "target_segments", "created_at",
+))
+SEARCH_ITEM = RowSerializer((
+    "id", "title", "description", "image_url", "discount", "status", "start_date", "end_date", "rank",
+))
+SAVED_ITEM = RowSerializer(("id", "title", "status", "start_date", "end_date", "discount", "image_url", "saved_at"))
+
+
+def _transition_error(transition, outcome: str):
+    if outcome == promotion_state.NOT_FOUND:
+        return error_response("Promotion not found", 404)
+    if outcome == promotion_state.FORBIDDEN:
+        return error_response(transition.forbidden_message, 403)
+    if outcome == promotion_state.WRONG_STATE:
+        return error_response(transition.wrong_state_message, 400)
+    return error_response("Promotion was changed by another request; fetch it again and retry", 412)
+
+
+async def _export_stream(fmt: str, filters: dict):
+    # The export opens its own session: the request's session is closed by
+    # the time the body streams. Exports are read-only, so replicas serve them.
+    columns = [column.key for column in EXPORT_COLUMNS]
+    encode = ndjson_chunks if fmt == "ndjson" else csv_chunks
+    async with AsyncSessionLocal() as db:
+        db.sync_session.info["use_replica"] = True
+        partitions = PromotionRepository(db).stream_all(**filters, chunk_size=settings.PROMOTION_EXPORT_CHUNK_SIZE)
+        async for chunk in encode(columns, partitions):
+            yield chunk
+
 
 class PromotionService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.repo = PromotionRepository(db)
 
-    def create_promotion(self, data: PromotionCreate, user_id: int):
+    async def _get_user_with_role(self, user_id: int):
+        result = await self.db.execute(
+            select(User).options(selectinload(User.role)).where(User.id == user_id)
+        )
+        return result.scalars().first()
+
+    async def create_promotion(self, data: PromotionCreate, user_id: int):
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
+            user = await self._get_user_with_role(user_id)
             if not user:
                 return error_response("User not found", 404)
             if not user.role or user.role.name.lower() != "vendor":
@@ -31,189 +94,363 @@ class PromotionService:
                 updated_at=datetime.utcnow(),
                 status="draft"
             )
-            self.repo.create(promo)
-            return success_response("Promotion created successfully", data={"id": promo.id})
+            await self.repo.create(promo, parse_segments(data.target_segments))
+            return success_response(message="Promotion created successfully", data={"id": promo.id})
         except Exception as e:
             logger.error(f"Error creating promotion: {str(e)}")
             return error_response("Failed to create promotion", 500)
 
-    def submit_for_approval(self, promotion_id: int, user_id: int):
+    async def _transition(self, name: str, promotion_id: int, user_id: int, if_match: str = None,
+                          values: dict = None, segments=None):
+        """Apply one state-machine transition; returns (row, None) or (None, error response)."""
+        transition = TRANSITIONS[name]
         try:
-            promotion = self.repo.get_by_id(promotion_id)
-            if not promotion:
-                return error_response("Promotion not found", 404)
-            if promotion.created_by != user_id:
-                return error_response("You are not allowed to submit this promotion", 403)
-            if promotion.status != "draft":
-                return error_response("Only draft promotions can be submitted for approval", 400)
+            expected_version = parse_version(if_match)
+        except ValueError:
+            return None, error_response("If-Match must be a promotion version", 400)
 
-            self.repo.submit_for_approval(promotion)
-            return success_response("Promotion submitted for approval")
+        statement = transition.statement(
+            promotion_id, user_id, expected_version, dict(values or {}, updated_at=datetime.utcnow())
+        )
+        try:
+            row = await self.repo.apply_transition(statement, promotion_id, segments)
+            if row is None:
+                # Only a refused transition pays for a second read, to say why.
+                outcome = transition.diagnose(await self.repo.get_state(promotion_id), user_id)
+                return None, _transition_error(transition, outcome)
         except Exception as e:
-            logger.error(f"Error submitting promotion for approval: {str(e)}")
-            return error_response("Failed to submit promotion for approval", 500)
+            logger.error(f"Error applying {name} to promotion {promotion_id}: {str(e)}")
+            return None, error_response(f"Failed to {name} promotion", 500)
 
-    def update_promotion(self, promo_id: int, data: PromotionUpdate, user_id: int):
-        try:
-            promo = self.repo.get_by_id(promo_id)
-            if not promo:
-                return error_response("Promotion not found", 404)
-            if promo.created_by != user_id:
-                return error_response("Not allowed to update this promotion", 403)
-            if promo.status in ["approved", "active"]:
-                return error_response("Approved or active promotions cannot be edited", 400)
+        if {row["status"], *transition.from_statuses} & set(PUBLIC_STATUSES):
+            public_feed.invalidate()
+        return row, None
 
-            for key, value in data.dict(exclude_unset=True).items():
-                setattr(promo, key, value)
+    async def submit_for_approval(self, promotion_id: int, user_id: int, if_match: str = None):
+        row, error = await self._transition("submit", promotion_id, user_id, if_match)
+        if error:
+            return error
+        return success_response(message="Promotion submitted for approval", data={"version": row["version"]})
 
-            promo.updated_by = user_id
-            promo.updated_at = datetime.utcnow()
-            self.repo.update()
-            return success_response("Promotion updated successfully")
-        except Exception as e:
-            logger.error(f"Error updating promotion: {str(e)}")
-            return error_response("Failed to update promotion", 500)
+    async def update_promotion(self, promo_id: int, data: PromotionUpdate, user_id: int, if_match: str = None):
+        # Status only changes through the transitions, never through an edit.
+        changes = data.dict(exclude_unset=True, exclude={"status"})
+        segments = parse_segments(changes["target_segments"]) if "target_segments" in changes else None
+        row, error = await self._transition("edit", promo_id, user_id, if_match, values=changes, segments=segments)
+        if error:
+            return error
+        return success_response(message="Promotion updated successfully", data={"version": row["version"]})
 
-    def delete_promotion(self, promo_id: int, user_id: int):
+    async def delete_promotion(self, promo_id: int, user_id: int):
         try:
-            promo = self.repo.get_by_id(promo_id)
+            promo = await self.repo.get_by_id(promo_id)
             if not promo:
                 return error_response("Promotion not found", 404)
             if promo.created_by != user_id:
                 return error_response("Not allowed to delete this promotion", 403)
 
-            self.repo.delete(promo)
-            return success_response("Promotion deleted successfully")
+            await self.repo.delete(promo)
+            promotion_counters.discard(promo_id)
+            public_feed.invalidate()
+            return success_response(message="Promotion deleted successfully")
         except Exception as e:
             logger.error(f"Error deleting promotion: {str(e)}")
             return error_response("Failed to delete promotion", 500)
 
-    def get_promotion(self, promo_id: int):
+    async def get_promotion(self, promo_id: int):
         try:
-            promo = self.repo.get_by_id(promo_id)
+            promo = await self.repo.get_with_counters(promo_id)
             if not promo:
                 return error_response("Promotion not found", 404)
-            return success_response("Promotion fetched successfully", data=promo)
+            promotion_counters.incr(promo_id, "views")
+            data = PROMOTION_DETAIL(promo)
+            data["counts"] = promotion_counters.with_pending(promo)
+            response = success_response(message="Promotion fetched successfully", data=data)
+            # Clients send this back as If-Match on transitions and edits.
+            response.headers["ETag"] = f'"{promo["version"]}"'
+            return response
         except Exception as e:
             logger.error(f"Error fetching promotion: {str(e)}")
             return error_response("Failed to fetch promotion", 500)
 
-    def get_all_promotions(self, status=None):
-        try:
-            promotions = self.repo.get_all(status)
-            data = [
-                {
-                    "id": p.id,
-                    "title": p.title,
-                    "status": p.status,
-                    "description": p.description,
-                    "start_date": p.start_date.isoformat() if p.start_date else None,
-                    "end_date": p.end_date.isoformat() if p.end_date else None,
-                    "discount": p.discount,
-                    "image_url": p.image_url,
-                    "updated_at": p.updated_at.isoformat() if p.updated_at else None,
-                    "created_by": p.created_by,
-                    "created_at": p.created_at.isoformat() if p.created_at else None,
-                }
-                for p in promotions
-            ]
-            return success_response("Promotions fetched successfully", data=data)
+    async def get_all_promotions(self, status=None, created_by=None, created_from=None, created_to=None,
+                                 cursor=None, limit=None):
+        try:
+            limit = min(limit or settings.PROMOTIONS_PAGE_SIZE, settings.PROMOTIONS_MAX_PAGE_SIZE)
+            after = decode_cursor(cursor) if cursor else None
+        except InvalidCursorError:
+            return error_response("Invalid cursor", 400)
+
+        try:
+            rows = await self.repo.get_all(limit, status, created_by, created_from, created_to, after)
+            page = rows[:limit]
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = encode_cursor(page[-1]["created_at"], page[-1]["id"])
+            data = {
+                "items": [dict(PROMOTION_LIST_ITEM(p), counts=promotion_counters.with_pending(p)) for p in page],
+                "next_cursor": next_cursor,
+                "limit": limit,
+            }
+            return success_response(message="Promotions fetched successfully", data=data)
         except Exception as e:
             logger.error(f"Error fetching promotions: {str(e)}")
             return error_response("Failed to fetch promotions", 500)
 
-    def toggle_promotion_status(self, promo_id: int, user_id: int):
+    async def export_promotions(self, user_id: int, fmt: str = "ndjson", status=None, created_by=None,
+                                created_from=None, created_to=None):
+        user = await self._get_user_with_role(user_id)
+        if not user or not user.role or user.role.name.lower() != "admin":
+            return error_response("Only admins can export promotions", 403)
+
+        filters = {
+            "status": status,
+            "created_by": created_by,
+            "created_from": created_from,
+            "created_to": created_to,
+        }
+        filename = f"promotions-{datetime.utcnow():%Y%m%dT%H%M%S}.{fmt}"
+        return StreamingResponse(
+            _export_stream(fmt, filters),
+            media_type=EXPORT_FORMATS[fmt],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    async def toggle_promotion_status(self, promo_id: int, user_id: int, if_match: str = None):
+        row, error = await self._transition("toggle", promo_id, user_id, if_match)
+        if error:
+            return error
+        return success_response(
+            message=f"Promotion {'deactivated' if row['status'] == 'inactive' else 'activated'}",
+            data={"status": row["status"], "version": row["version"]},
+        )
+
+    async def approve_promotion(self, promo_id: int, data: PromotionApproval, user_id: int, if_match: str = None):
+        user = await self._get_user_with_role(user_id)
+        if not user or not user.role or user.role.name.lower() != "admin":
+            return error_response("Only admins can approve promotions", 403)
+
+        row, error = await self._transition(
+            "approve", promo_id, user_id, if_match, values={"approval_comments": data.comments}
+        )
+        if error:
+            return error
+        return success_response(
+            message="Promotion approved successfully",
+            data={"promotion_id": row["id"], "status": row["status"], "version": row["version"]},
+        )
+
+    async def reject_promotion(self, promo_id: int, data: PromotionApproval, user_id: int, if_match: str = None):
+        user = await self._get_user_with_role(user_id)
+        if not user or not user.role or user.role.name.lower() != "admin":
+            return error_response("Only admins can reject promotions", 403)
+
+        row, error = await self._transition(
+            "reject", promo_id, user_id, if_match, values={"approval_comments": data.comments}
+        )
+        if error:
+            return error
+        return success_response(
+            message="Promotion rejected successfully",
+            data={"promotion_id": row["id"], "status": row["status"], "version": row["version"]},
+        )
+
+    async def _moderate_many(self, promotion_ids, comments, user_id: int, new_status: str):
+        action = "approve" if new_status == "approved" else "reject"
+        user = await self._get_user_with_role(user_id)
+        if not user or not user.role or user.role.name.lower() != "admin":
+            return error_response(f"Only admins can {action} promotions", 403)
+
+        promotion_ids = list(dict.fromkeys(promotion_ids))
         try:
-            promo = self.repo.get_by_id(promo_id)
-            if not promo:
-                return error_response("Promotion not found", 404)
-            if promo.created_by != user_id:
-                return error_response("Not allowed to change status of this promotion", 403)
-            if promo.status not in ["approved", "active", "inactive"]:
-                return error_response("Only approved promotions can be activated or deactivated", 400)
-
-            promo.status = "inactive" if promo.status == "active" else "active"
-            promo.updated_by = user_id
-            promo.updated_at = datetime.utcnow()
-            self.repo.update()
-            return success_response(
-                message=f"Promotion {'deactivated' if promo.status == 'inactive' else 'activated'}",
-                data={"status": promo.status}
-            )
+            moved = set(await self.repo.transition_many(promotion_ids, "pending", {
+                "status": new_status,
+                "approval_comments": comments,
+                "updated_at": datetime.utcnow(),
+                "version": Promotion.version + 1,
+            }))
+            # Only ids that didn't move need a second look, to say why.
+            skipped = [promotion_id for promotion_id in promotion_ids if promotion_id not in moved]
+            statuses = await self.repo.get_statuses(skipped) if skipped else {}
         except Exception as e:
-            logger.error(f"Error toggling promotion status: {str(e)}")
-            return error_response("Failed to toggle promotion status", 500)
+            logger.error(f"Error batch moderating promotions: {str(e)}")
+            return error_response(f"Failed to {action} promotions", 500)
 
-    def approve_promotion(self, promo_id: int, data: PromotionApproval, user_id: int):
-        try:
-            promo = self.repo.get_by_id(promo_id)
-            user = self.db.query(User).filter(User.id == user_id).first()
+        if moved and new_status in PUBLIC_STATUSES:
+            public_feed.invalidate()
+        results = []
+        for promotion_id in promotion_ids:
+            if promotion_id in moved:
+                results.append({"promotion_id": promotion_id, "updated": True, "status": new_status})
+            elif promotion_id in statuses:
+                results.append({
+                    "promotion_id": promotion_id,
+                    "updated": False,
+                    "status": statuses[promotion_id],
+                    "error": f"Only pending promotions can be {new_status}",
+                })
+            else:
+                results.append({"promotion_id": promotion_id, "updated": False, "error": "Promotion not found"})
+        return success_response(
+            message=f"Promotions {new_status}: {len(moved)} of {len(promotion_ids)}",
+            data={"updated": len(moved), "skipped": len(promotion_ids) - len(moved), "results": results},
+        )
 
-            if not promo:
-                return error_response("Promotion not found", 404)
-            if not user or not user.role or user.role.name.lower() != "admin":
-                return error_response("Only admins can approve promotions", 403)
-            if promo.status != "pending":
-                return error_response("Only pending promotions can be approved", 400)
-
-            promo.status = "approved"
-            promo.approval_comments = data.comments
-            promo.updated_at = datetime.utcnow()
-            promo.updated_by = user_id
-            self.repo.update()
-            return success_response(
-                message="Promotion approved successfully",
-                data={"promotion_id": promo.id, "status": promo.status}
-            )
+    async def approve_promotions(self, promotion_ids, comments, user_id: int):
+        return await self._moderate_many(promotion_ids, comments, user_id, "approved")
+
+    async def reject_promotions(self, promotion_ids, comments, user_id: int):
+        return await self._moderate_many(promotion_ids, comments, user_id, "rejected")
+
+    async def _build_public_feed(self) -> bytes:
+        promotions = await self.repo.get_public_promotions()
+        data = PUBLIC_FEED_ITEM.many(promotions)
+        payload = {"message": "Public promotions fetched successfully", "code": 200, "data": data}
+        return json_dumps(payload)
+
+    async def get_public_promotions(self, if_none_match: str = None):
+        try:
+            feed = await public_feed.get(self._build_public_feed)
+            headers = {"ETag": feed.etag, "Cache-Control": "no-cache"}
+            if etag_matches(if_none_match, feed.etag):
+                return Response(status_code=304, headers=headers)
+            return Response(content=feed.body, media_type="application/json", headers=headers)
         except Exception as e:
-            logger.error(f"Error approving promotion: {str(e)}")
-            return error_response("Failed to approve promotion", 500)
+            logger.error(f"Error fetching public promotions: {str(e)}")
+            return error_response("Failed to fetch public promotions", 500)
 
-    def reject_promotion(self, promo_id: int, data: PromotionApproval, user_id: int):
+    async def get_promotions_by_segments(self, segments, match: str = "any", cursor: str = None, limit: int = None):
+        names = normalize_segments(name for raw in segments for name in parse_segments(raw))
+        if not names:
+            return error_response("At least one segment is required", 400)
         try:
-            promo = self.repo.get_by_id(promo_id)
-            user = self.db.query(User).filter(User.id == user_id).first()
+            limit = min(limit or settings.PROMOTIONS_PAGE_SIZE, settings.PROMOTIONS_MAX_PAGE_SIZE)
+            after = decode_cursor(cursor) if cursor else None
+        except InvalidCursorError:
+            return error_response("Invalid cursor", 400)
 
-            if not promo:
-                return error_response("Promotion not found", 404)
-            if not user or not user.role or user.role.name.lower() != "admin":
-                return error_response("Only admins can reject promotions", 403)
-            if promo.status != "pending":
-                return error_response("Only pending promotions can be rejected", 400)
-
-            promo.status = "rejected"
-            promo.approval_comments = data.comments
-            promo.updated_at = datetime.utcnow()
-            promo.updated_by = user_id
-            self.repo.update()
-            return success_response(
-                message="Promotion rejected successfully",
-                data={"promotion_id": promo.id, "status": promo.status}
-            )
+        try:
+            rows = await self.repo.get_by_segments(names, match == "all", limit, after)
+            page = rows[:limit]
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = encode_cursor(page[-1]["created_at"], page[-1]["id"])
+            data = {
+                "items": SEGMENT_ITEM.many(page),
+                "segments": names,
+                "match": match,
+                "next_cursor": next_cursor,
+                "limit": limit,
+            }
+            return success_response(message="Promotions fetched successfully", data=data)
         except Exception as e:
-            logger.error(f"Error rejecting promotion: {str(e)}")
-            return error_response("Failed to reject promotion", 500)
+            logger.error(f"Error fetching promotions by segment: {str(e)}")
+            return error_response("Failed to fetch promotions", 500)
 
-    def get_public_promotions(self):
+    async def search_promotions(self, text: str, cursor: str = None, limit: int = None):
         try:
-            promotions = self.repo.get_public_promotions()
-            return success_response("Public promotions fetched successfully", data=promotions)
+            limit = min(limit or settings.PROMOTIONS_PAGE_SIZE, settings.PROMOTIONS_MAX_PAGE_SIZE)
+            after = decode_rank_cursor(cursor) if cursor else None
+        except InvalidCursorError:
+            return error_response("Invalid cursor", 400)
+
+        try:
+            rows = await self.repo.search_public(text, limit, after)
+            page = rows[:limit]
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = encode_rank_cursor(page[-1]["rank"], page[-1]["id"])
+            data = {
+                "items": SEARCH_ITEM.many(page),
+                "next_cursor": next_cursor,
+                "limit": limit,
+            }
+            return success_response(message="Promotions search results", data=data)
         except Exception as e:
-            logger.error(f"Error fetching public promotions: {str(e)}")
-            return error_response("Failed to fetch public promotions", 500)
+            logger.error(f"Error searching promotions: {str(e)}")
+            return error_response("Failed to search promotions", 500)
 
-    def save_promotion(self, promotion_id: int, user_id: int):
+    async def save_promotion(self, promotion_id: int, user_id: int):
         try:
-            result = self.repo.save_promotion_for_user(promotion_id, user_id)
-            return success_response("Promotion saved successfully", data=result)
+            saved_ids = await self.repo.save_promotions_for_user(user_id, [promotion_id])
+            if saved_ids:
+                promotion_counters.incr(promotion_id, "saves")
+                return success_response(message="Promotion saved successfully", data={"promotion_id": promotion_id})
+            # Nothing inserted: tell an earlier save apart from a missing promotion.
+            if await self.repo.is_saved(user_id, promotion_id):
+                return error_response("Promotion already saved", 400)
+            return error_response("Promotion not found", 404)
         except Exception as e:
             logger.error(f"Error saving promotion: {str(e)}")
             return error_response("Failed to save promotion", 500)
 
-    def redeem_promotion(self, code: str):
+    async def save_promotions(self, promotion_ids, user_id: int):
+        promotion_ids = list(dict.fromkeys(promotion_ids))
+        try:
+            saved_ids = await self.repo.save_promotions_for_user(user_id, promotion_ids)
+        except Exception as e:
+            logger.error(f"Error saving promotions: {str(e)}")
+            return error_response("Failed to save promotions", 500)
+        for promotion_id in saved_ids:
+            promotion_counters.incr(promotion_id, "saves")
+        saved = set(saved_ids)
+        return success_response(
+            message="Promotions saved successfully",
+            data={
+                "saved": [promotion_id for promotion_id in promotion_ids if promotion_id in saved],
+                # Already saved, or not a public promotion.
+                "skipped": [promotion_id for promotion_id in promotion_ids if promotion_id not in saved],
+            },
+        )
+
+    async def unsave_promotions(self, promotion_ids, user_id: int):
+        promotion_ids = list(dict.fromkeys(promotion_ids))
+        try:
+            removed_ids = await self.repo.unsave_promotions_for_user(user_id, promotion_ids)
+        except Exception as e:
+            logger.error(f"Error removing saved promotions: {str(e)}")
+            return error_response("Failed to remove saved promotions", 500)
+        for promotion_id in removed_ids:
+            promotion_counters.incr(promotion_id, "saves", -1)
+        removed = set(removed_ids)
+        return success_response(
+            message="Saved promotions removed successfully",
+            data={
+                "removed": [promotion_id for promotion_id in promotion_ids if promotion_id in removed],
+                "not_saved": [promotion_id for promotion_id in promotion_ids if promotion_id not in removed],
+            },
+        )
+
+    async def unsave_promotion(self, promotion_id: int, user_id: int):
+        try:
+            removed_ids = await self.repo.unsave_promotions_for_user(user_id, [promotion_id])
+        except Exception as e:
+            logger.error(f"Error removing saved promotion: {str(e)}")
+            return error_response("Failed to remove saved promotion", 500)
+        if not removed_ids:
+            return error_response("Promotion is not saved", 404)
+        promotion_counters.incr(promotion_id, "saves", -1)
+        return success_response(message="Saved promotion removed successfully", data={"promotion_id": promotion_id})
+
+    async def get_saved_promotions(self, user_id: int, cursor: str = None, limit: int = None):
+        try:
+            limit = min(limit or settings.PROMOTIONS_PAGE_SIZE, settings.PROMOTIONS_MAX_PAGE_SIZE)
+            after = decode_cursor(cursor) if cursor else None
+        except InvalidCursorError:
+            return error_response("Invalid cursor", 400)
+
         try:
-            result = self.repo.redeem_promotion_by_code(code)
-            return success_response("Promotion redeemed successfully", data=result)
+            rows = await self.repo.get_saved_for_user(user_id, limit, after)
+            page = rows[:limit]
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = encode_cursor(page[-1]["saved_at"], page[-1]["saved_id"])
+            data = {
+                "items": SAVED_ITEM.many(page),
+                "next_cursor": next_cursor,
+                "limit": limit,
+            }
+            return success_response(message="Saved promotions fetched successfully", data=data)
         except Exception as e:
-            logger.error(f"Error redeeming promotion: {str(e)}")
-            return error_response("Failed to redeem promotion", 500)
+            logger.error(f"Error fetching saved promotions: {str(e)}")
+            return error_response("Failed to fetch saved promotions", 500)
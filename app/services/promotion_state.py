@@ -0,0 +1,137 @@
+from typing import Dict, Optional
+from sqlalchemy import case, update
+from app.models.promotion import Promotion
+
+OK = "ok"
+NOT_FOUND = "not_found"
+FORBIDDEN = "forbidden"
+WRONG_STATE = "wrong_state"
+VERSION_CONFLICT = "version_conflict"
+
+EDITABLE_STATUSES = ("draft", "pending", "rejected", "inactive", "expired")
+
+
+def parse_version(if_match: Optional[str]) -> Optional[int]:
+    """The version a client sent in If-Match, which echoes the ETag of GET /promotions/{id}.
+
+    A missing header or ``*`` (any current version) means no constraint.
+    """
+    if not if_match:
+        return None
+    tag = if_match.strip()
+    if tag == "*":
+        return None
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return int(tag.strip('"'))
+
+
+class Transition:
+    """One allowed move in the promotion lifecycle.
+
+    ``targets`` maps each status the move may start from to the status it
+    ends in (``None`` leaves the status alone, as edits do). ``statement``
+    compiles the move into a single guarded UPDATE ... RETURNING. When it
+    returns no row, ``diagnose`` decides from one read of the row whether
+    the promotion is missing, owned by someone else, in the wrong state
+    or at a different version.
+    """
+
+    def __init__(self, name: str, targets: Dict[str, Optional[str]], owner_only: bool,
+                 forbidden_message: str, wrong_state_message: str):
+        self.name = name
+        self.targets = targets
+        self.owner_only = owner_only
+        self.forbidden_message = forbidden_message
+        self.wrong_state_message = wrong_state_message
+
+    @property
+    def from_statuses(self):
+        return tuple(self.targets)
+
+    def _status_value(self):
+        destinations = {target for target in self.targets.values() if target is not None}
+        if not destinations:
+            return None
+        if len(destinations) == 1:
+            return destinations.pop()
+        return case(
+            {source: target for source, target in self.targets.items() if target is not None},
+            value=Promotion.status,
+            else_=Promotion.status,
+        )
+
+    def statement(self, promotion_id: int, user_id: int, expected_version: Optional[int] = None,
+                  values: Optional[dict] = None):
+        conditions = [Promotion.id == promotion_id, Promotion.status.in_(self.from_statuses)]
+        if self.owner_only:
+            conditions.append(Promotion.created_by == user_id)
+        if expected_version is not None:
+            conditions.append(Promotion.version == expected_version)
+
+        values = dict(values or {})
+        status = self._status_value()
+        if status is not None:
+            values["status"] = status
+        values["version"] = Promotion.version + 1
+        return (
+            update(Promotion)
+            .where(*conditions)
+            .values(**values)
+            .returning(Promotion.id, Promotion.status, Promotion.version)
+            .execution_options(synchronize_session=False)
+        )
+
+    def diagnose(self, current, user_id: int) -> str:
+        # Checked in the same order a caller would want them reported.
+        if current is None:
+            return NOT_FOUND
+        if self.owner_only and current["created_by"] != user_id:
+            return FORBIDDEN
+        if current["status"] not in self.targets:
+            return WRONG_STATE
+        # Either the caller's version is stale, or the row changed between
+        # the UPDATE and this read; both mean another request got there first.
+        return VERSION_CONFLICT
+
+
+TRANSITIONS = {
+    transition.name: transition
+    for transition in (
+        Transition(
+            "submit",
+            {"draft": "pending"},
+            owner_only=True,
+            forbidden_message="You are not allowed to submit this promotion",
+            wrong_state_message="Only draft promotions can be submitted for approval",
+        ),
+        Transition(
+            "approve",
+            {"pending": "approved"},
+            owner_only=False,
+            forbidden_message="Only admins can approve promotions",
+            wrong_state_message="Only pending promotions can be approved",
+        ),
+        Transition(
+            "reject",
+            {"pending": "rejected"},
+            owner_only=False,
+            forbidden_message="Only admins can reject promotions",
+            wrong_state_message="Only pending promotions can be rejected",
+        ),
+        Transition(
+            "toggle",
+            {"active": "inactive", "approved": "active", "inactive": "active"},
+            owner_only=True,
+            forbidden_message="Not allowed to change status of this promotion",
+            wrong_state_message="Only approved promotions can be activated or deactivated",
+        ),
+        Transition(
+            "edit",
+            dict.fromkeys(EDITABLE_STATUSES),
+            owner_only=True,
+            forbidden_message="Not allowed to update this promotion",
+            wrong_state_message="Approved or active promotions cannot be edited",
+        ),
+    )
+}
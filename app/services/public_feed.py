@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+import time
+import logging
+from typing import Awaitable, Callable, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedFeed:
+    def __init__(self, body: bytes, etag: str, generation: int):
+        self.body = body
+        self.etag = etag
+        self.generation = generation
+        self.built_at = time.monotonic()
+
+
+def make_etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+
+class PublicFeedCache:
+    """Serialized public promotion feed, rebuilt on demand after invalidation.
+
+    Status changes in this process invalidate it immediately; the TTL bounds
+    how long other workers keep serving a feed that changed elsewhere.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._feed: Optional[CachedFeed] = None
+        self._lock = asyncio.Lock()
+
+    def peek(self) -> Optional[CachedFeed]:
+        feed = self._feed
+        if feed is None or feed.generation != self.generation:
+            return None
+        if self.ttl and time.monotonic() - feed.built_at > self.ttl:
+            return None
+        return feed
+
+    async def get(self, build: Callable[[], Awaitable[bytes]]) -> CachedFeed:
+        feed = self.peek()
+        if feed is not None:
+            self.hits += 1
+            return feed
+
+        # One rebuild at a time; everyone queued behind it reuses the result.
+        async with self._lock:
+            feed = self.peek()
+            if feed is not None:
+                self.hits += 1
+                return feed
+            self.misses += 1
+            generation = self.generation
+            body = await build()
+            feed = CachedFeed(body, make_etag(body), generation)
+            # An invalidation during the build means the body may be stale:
+            # serve it to this caller but don't keep it.
+            if generation == self.generation:
+                self._feed = feed
+            return feed
+
+    def invalidate(self):
+        self.generation += 1
+        self._feed = None
+        logger.debug(f"Public promotion feed invalidated (generation {self.generation})")
+
+    def stats(self) -> dict:
+        feed = self._feed
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "generation": self.generation,
+            "cached": feed is not None,
+            "etag": feed.etag if feed else None,
+            "size_bytes": len(feed.body) if feed else 0,
+        }
+
+
+public_feed = PublicFeedCache(ttl=settings.PUBLIC_FEED_TTL_SECONDS)
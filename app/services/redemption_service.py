@@ -0,0 +1,150 @@
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.models.promo_code import PromoCode, PromoCodeBatch
+from app.repo import promo_code_repo
+from app.repo.promo_code_repo import PromoCodeRepository
+from app.repo.promotion_repo import PromotionRepository
+from app.schemas.promotion import PromoCodeBatchCreate, PromoCodeCreate
+from app.services.code_generation import code_generation_jobs
+from app.services.promotion_counters import promotion_counters
+from app.utils.response_helper import success_response, error_response
+import logging
+
+logger = logging.getLogger(__name__)
+
+FAILURES = {
+    promo_code_repo.NOT_FOUND: ("Invalid promo code", 404),
+    promo_code_repo.NOT_ACTIVE: ("Promotion is not active", 400),
+    promo_code_repo.USER_LIMIT_REACHED: ("Redemption limit reached for this user", 409),
+    promo_code_repo.SOLD_OUT: ("Promo code has been fully redeemed", 409),
+}
+
+
+def normalize_code(code: str) -> str:
+    return code.strip().upper()
+
+
+def _batch_data(batch: PromoCodeBatch) -> dict:
+    return {
+        "id": batch.id,
+        "promotion_id": batch.promotion_id,
+        "prefix": batch.prefix,
+        "requested": batch.requested,
+        "generated": batch.generated,
+        "status": batch.status,
+        "error": batch.error,
+        "created_at": batch.created_at,
+        "finished_at": batch.finished_at,
+    }
+
+
+async def _batch_csv(batch_id: int):
+    # Own session: the request's session is gone by the time the body streams.
+    async with AsyncSessionLocal() as db:
+        yield "code,redemption_count\n"
+        async for rows in PromoCodeRepository(db).stream_batch_codes(batch_id):
+            yield "".join(f"{code},{count}\n" for code, count in rows)
+
+
+class RedemptionService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = PromoCodeRepository(db)
+
+    async def create_code(self, promotion_id: int, data: PromoCodeCreate, user_id: int):
+        _, error = await self._owned_promotion(promotion_id, user_id)
+        if error:
+            return error
+
+        try:
+            promo_code = await self.repo.create(PromoCode(
+                code=normalize_code(data.code),
+                promotion_id=promotion_id,
+                max_redemptions=data.max_redemptions,
+                per_user_limit=data.per_user_limit,
+            ))
+        except IntegrityError:
+            await self.db.rollback()
+            return error_response("Promo code already exists", 409)
+        return success_response(
+            message="Promo code created successfully",
+            code=201,
+            data={
+                "id": promo_code.id,
+                "code": promo_code.code,
+                "max_redemptions": promo_code.max_redemptions,
+                "per_user_limit": promo_code.per_user_limit,
+            },
+        )
+
+    async def _owned_promotion(self, promotion_id: int, user_id: int):
+        promotion = await PromotionRepository(self.db).get_by_id(promotion_id)
+        if not promotion:
+            return None, error_response("Promotion not found", 404)
+        if promotion.created_by != user_id:
+            return None, error_response("Not allowed to manage codes for this promotion", 403)
+        return promotion, None
+
+    async def create_batch(self, promotion_id: int, data: PromoCodeBatchCreate, user_id: int):
+        if data.count > settings.PROMO_CODE_BATCH_MAX:
+            return error_response(f"A batch can hold at most {settings.PROMO_CODE_BATCH_MAX} codes", 400)
+        _, error = await self._owned_promotion(promotion_id, user_id)
+        if error:
+            return error
+
+        batch = await self.repo.create_batch(PromoCodeBatch(
+            promotion_id=promotion_id,
+            created_by=user_id,
+            prefix=normalize_code(data.prefix) if data.prefix else None,
+            requested=data.count,
+        ))
+        code_generation_jobs.start(batch.id, promotion_id, batch.requested, batch.prefix)
+        return success_response(message="Promo code generation started", code=202, data=_batch_data(batch))
+
+    async def get_batch(self, promotion_id: int, batch_id: int, user_id: int):
+        _, error = await self._owned_promotion(promotion_id, user_id)
+        if error:
+            return error
+        batch = await self.repo.get_batch(batch_id, promotion_id)
+        if not batch:
+            return error_response("Code batch not found", 404)
+        return success_response(message="Code batch fetched successfully", data=_batch_data(batch))
+
+    async def export_batch(self, promotion_id: int, batch_id: int, user_id: int):
+        _, error = await self._owned_promotion(promotion_id, user_id)
+        if error:
+            return error
+        batch = await self.repo.get_batch(batch_id, promotion_id)
+        if not batch:
+            return error_response("Code batch not found", 404)
+        return StreamingResponse(
+            _batch_csv(batch.id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="promo-codes-{batch.id}.csv"'},
+        )
+
+    async def redeem(self, code: str, user_id: int, idempotency_key: str = None):
+        try:
+            outcome, redemption = await self.repo.redeem(normalize_code(code), user_id, idempotency_key)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error redeeming promo code {code}: {str(e)}")
+            return error_response("Failed to redeem promotion", 500)
+
+        if outcome in FAILURES:
+            return error_response(*FAILURES[outcome])
+        if outcome == promo_code_repo.REDEEMED:
+            promotion_counters.incr(redemption["promotion_id"], "redemptions")
+        return success_response(
+            message="Promotion redeemed successfully",
+            data={
+                "redemption_id": redemption["id"],
+                "promotion_id": redemption["promotion_id"],
+                "code": redemption["code"],
+                "redeemed_at": redemption["redeemed_at"],
+                "replayed": outcome == promo_code_repo.REPLAYED,
+            },
+        )
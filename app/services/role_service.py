@@ -1,6 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import status
-from app.schemas.role import RoleCreate
+from app.schemas.role import RoleCreate, RolePermissionPatch
 from app.repo.role_repo import RoleRepository
 from fastapi.responses import JSONResponse
 from app.utils.response_helper import success_response, error_response
@@ -9,7 +9,7 @@ from app.utils.response_helper import success_response, error_response
 import logging
 logger = logging.getLogger(__name__)
 class RoleService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.repo = RoleRepository(db)
 
     def _to_response(self, role):
@@ -19,23 +19,23 @@ class RoleService:
             "permissions": [perm.name for perm in role.permissions]
         }
 
-    def create_role(self, role: RoleCreate):
-        role_obj = self.repo.create(role)
+    async def create_role(self, role: RoleCreate):
+        role_obj = await self.repo.create(role)
         return success_response(
             message="Role created successfully",
             code=status.HTTP_201_CREATED,
             data=self._to_response(role_obj)
         )
 
-    def get_roles(self, skip: int = 0, limit: int = 100):
-        roles = self.repo.get_all(skip, limit)
+    async def get_roles(self, skip: int = 0, limit: int = 100):
+        roles = await self.repo.get_all(skip, limit)
         return success_response(
             message="Roles fetched successfully",
             data=[self._to_response(role) for role in roles]
         )
 
-    def get_role(self, role_id: int):
-        role = self.repo.get_by_id(role_id)
+    async def get_role(self, role_id: int):
+        role = await self.repo.get_by_id(role_id)
         if not role:
             return error_response("Role not found", status.HTTP_404_NOT_FOUND)
         return success_response(
@@ -43,8 +43,8 @@ class RoleService:
             data=self._to_response(role)
         )
 
-    def update_role(self, role_id: int, role: RoleCreate):
-        updated_role = self.repo.update(role_id, role)
+    async def update_role(self, role_id: int, role: RoleCreate):
+        updated_role = await self.repo.update(role_id, role)
         if not updated_role:
             return error_response("Role not found or update failed", status.HTTP_404_NOT_FOUND)
         return success_response(
@@ -52,9 +52,23 @@ class RoleService:
             data=self._to_response(updated_role)
         )
 
-    def delete_role(self, role_id: int):
+    async def patch_role_permissions(self, role_id: int, patch: RolePermissionPatch):
+        changes = await self.repo.patch_permissions(role_id, patch.add, patch.remove)
+        if changes is None:
+            return error_response("Role not found", status.HTTP_404_NOT_FOUND)
+        added, removed = changes
+        return success_response(
+            message="Role permissions updated successfully",
+            data={
+                "id": role_id,
+                "added": [{"id": perm_id, "name": name, "module": module} for perm_id, name, module in added],
+                "removed": [{"id": perm_id, "name": name, "module": module} for perm_id, name, module in removed],
+            }
+        )
+
+    async def delete_role(self, role_id: int):
         try:
-            success = self.repo.delete(role_id)
+            success = await self.repo.delete(role_id)
             if not success:
                 logger.warning(f"No role found with ID {role_id}")
                 return JSONResponse(
@@ -1,8 +1,10 @@
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserProfileUpdate  
 from fastapi import status
 from app.utils.response_helper import success_response, error_response
+from app.services.permission_matrix import bump_authz_version, permission_matrix
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,7 +41,12 @@ def update_user_profile(db: Session, user_id: int, update_data: UserProfileUpdat
 
         for key, value in update_data.dict(exclude_unset=True).items():
             setattr(user, key, value)
+        version = None
+        if inspect(user).attrs.role_id.history.has_changes():
+            version = bump_authz_version(db)
         db.commit()
+        if version is not None:
+            permission_matrix.advance(version)
         db.refresh(user)
 
         logger.info(f"User {user_id} profile updated successfully.")
@@ -66,7 +73,9 @@ def delete_user_account(db: Session, user_id: int):
             return error_response("User not found", status.HTTP_404_NOT_FOUND)
 
         db.delete(user)
+        version = bump_authz_version(db)
         db.commit()
+        permission_matrix.remove_user(version, user_id)
 
         logger.info(f"User {user_id} deleted successfully.")
         return success_response(message="User profile deleted successfully")
@@ -0,0 +1,38 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Sequence
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def ndjson_chunks(columns: Sequence[str], partitions: AsyncIterator) -> AsyncIterator[str]:
+    # One chunk per partition: large enough to keep per-write overhead low,
+    # small enough that memory stays flat however many rows there are.
+    dumps = json.JSONEncoder(separators=(",", ":"), default=_json_default).encode
+    async for rows in partitions:
+        yield "".join(dumps(dict(zip(columns, row))) + "\n" for row in rows)
+
+
+async def csv_chunks(columns: Sequence[str], partitions: AsyncIterator) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    async for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [value.isoformat() if isinstance(value, (datetime, date)) else value for value in row] for row in rows
+        )
+        yield buffer.getvalue()
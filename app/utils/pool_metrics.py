@@ -0,0 +1,123 @@
+import threading
+import time
+from sqlalchemy import event, exc
+
+
+class PoolMetrics:
+    WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self._wait_buckets = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+        self._wait_count = 0
+        self._wait_sum_ms = 0.0
+        self._wait_max_ms = 0.0
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.checkout_timeouts = 0
+        self.checkout_errors = 0
+
+    def observe_wait(self, seconds: float):
+        wait_ms = seconds * 1000
+        index = len(self.WAIT_BUCKETS_MS)
+        for i, bound in enumerate(self.WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                index = i
+                break
+
+        with self._lock:
+            self._wait_buckets[index] += 1
+            self._wait_count += 1
+            self._wait_sum_ms += wait_ms
+            self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+
+    def record_checkout_failure(self, timed_out: bool):
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkout_errors += 1
+
+    def attach(self, engine):
+        self.pool = engine.pool
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+        # dispose() swaps in a fresh pool; keep reading live numbers from it.
+        @event.listens_for(engine, "engine_disposed")
+        def on_disposed(engine_):
+            self.pool = engine_.pool
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            buckets = {}
+            for bound, count in zip(self.WAIT_BUCKETS_MS, self._wait_buckets):
+                buckets[f"le_{bound}ms"] = count
+            buckets["gt_%dms" % self.WAIT_BUCKETS_MS[-1]] = self._wait_buckets[-1]
+
+            return {
+                "name": self.name,
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "size": pool.size() if hasattr(pool, "size") else None,
+                "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_errors": self.checkout_errors,
+                "wait_ms": {
+                    "count": self._wait_count,
+                    "avg": self._wait_sum_ms / self._wait_count if self._wait_count else 0.0,
+                    "max": self._wait_max_ms,
+                    "buckets": buckets,
+                },
+            }
+
+
+class _TimedCheckoutMixin:
+    metrics: PoolMetrics = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.observe_wait(time.perf_counter() - started)
+            self.metrics.record_checkout_failure(timed_out=True)
+            raise
+        except Exception:
+            self.metrics.record_checkout_failure(timed_out=False)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+
+def timed_pool_class(base_class, metrics: PoolMetrics):
+    # A per-engine subclass so the metrics survive Pool.recreate() on dispose().
+    return type(f"Timed{base_class.__name__}", (_TimedCheckoutMixin, base_class), {"metrics": metrics})
@@ -0,0 +1,88 @@
+import json
+from datetime import datetime
+from sqlalchemy import func, select, text, tuple_
+from app.models.permission import Permission, role_permissions, user_permissions
+from app.models.promotion import Promotion, SavedPromotion
+from app.models.segment import promotion_segments
+from app.models.user import User
+
+# The filtered queries the repositories run on every request. Each one is
+# expected to be served from an index once the migrations are applied.
+HOT_QUERIES = {
+    "promotions_by_status": select(Promotion.id).where(Promotion.status == "pending"),
+    "public_promotions": (
+        select(Promotion.id)
+        .where(Promotion.status.in_(["active"]))
+        .order_by(Promotion.created_at.desc(), Promotion.id.desc())
+    ),
+    "promotions_by_creator": select(Promotion.id).where(Promotion.created_by == 1),
+    "promotions_keyset_page": (
+        select(Promotion.id)
+        .where(Promotion.status == "approved")
+        .where(tuple_(Promotion.created_at, Promotion.id) < tuple_(datetime(2030, 1, 1), 1000))
+        .order_by(Promotion.created_at.desc(), Promotion.id.desc())
+        .limit(20)
+    ),
+    "promotions_due_to_start": (
+        select(Promotion.id)
+        .where(Promotion.status == "approved", Promotion.start_date <= datetime(2030, 1, 1))
+    ),
+    "promotions_ended": (
+        select(Promotion.id)
+        .where(Promotion.status.in_(["approved", "active", "inactive"]), Promotion.end_date <= datetime(2030, 1, 1))
+    ),
+    "promotions_by_segment": (
+        select(promotion_segments.c.promotion_id).where(promotion_segments.c.segment_id.in_([1, 2]))
+    ),
+    "saved_promotions_by_user": select(SavedPromotion.id).where(SavedPromotion.user_id == 1),
+    "saved_promotions_page": (
+        select(SavedPromotion.promotion_id)
+        .where(SavedPromotion.user_id == 1)
+        .order_by(SavedPromotion.saved_at.desc(), SavedPromotion.id.desc())
+        .limit(20)
+    ),
+    "permissions_by_module": select(Permission.id).where(Permission.module_id == 1),
+    "role_permissions_by_role": select(role_permissions.c.permission_id).where(role_permissions.c.role_id == 1),
+    "user_permissions_by_user": select(user_permissions.c.permission_id).where(user_permissions.c.user_id == 1),
+    "users_by_email": select(User.id).where(func.lower(User.email) == "someone@example.com"),
+}
+
+
+def _compile(connection, query) -> str:
+    return str(query.compile(connection, compile_kwargs={"literal_binds": True}))
+
+
+def _postgres_seq_scans(plan: dict) -> list:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(f"Seq Scan on {plan.get('Relation Name')}")
+    for child in plan.get("Plans", []):
+        found.extend(_postgres_seq_scans(child))
+    return found
+
+
+def explain(connection, query) -> list:
+    """Return the sequential scans in the plan for ``query``."""
+    sql = _compile(connection, query)
+    if connection.dialect.name == "postgresql":
+        # With seqscan disabled the planner only falls back to one when no
+        # usable index exists, so small dev tables don't hide a missing index.
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        raw = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        plan = raw if isinstance(raw, list) else json.loads(raw)
+        return _postgres_seq_scans(plan[0]["Plan"])
+    if connection.dialect.name == "sqlite":
+        # "SEARCH" is an index lookup; "SCAN" walks the whole table or index.
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return [row[3] for row in rows if row[3].startswith("SCAN ")]
+    raise ValueError(f"Unsupported dialect: {connection.dialect.name}")
+
+
+def find_sequential_scans(engine) -> dict:
+    """Map each hot query name to its sequential scans; empty lists mean indexed."""
+    report = {}
+    with engine.connect() as connection:
+        for name, query in HOT_QUERIES.items():
+            with connection.begin():
+                report[name] = explain(connection, query)
+    return report
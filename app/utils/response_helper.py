@@ -1,7 +1,37 @@
+import orjson
+from decimal import Decimal
 from fastapi.responses import JSONResponse
+from sqlalchemy.engine import Row, RowMapping
+from app.utils.serializers import model_serializer
+
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value):
+    # orjson handles dicts, lists, datetimes, dates and UUIDs natively. This
+    # hook only runs for the types it doesn't know.
+    if isinstance(value, RowMapping):
+        return dict(value)
+    if isinstance(value, Row):
+        return value._asdict()
+    if hasattr(type(value), "__mapper__"):
+        return model_serializer(type(value))(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def json_dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=_DUMPS_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return json_dumps(content)
+
 
 def success_response(data: dict = None, message: str = "Success", code: int = 200):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=code,
         content={
             "message": message,
@@ -11,7 +41,7 @@ def success_response(data: dict = None, message: str = "Success", code: int = 20
     )
 
 def error_response(message: str = "Something went wrong", code: int = 500):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=code,
         content={
             "message": message,
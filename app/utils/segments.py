@@ -0,0 +1,19 @@
+import re
+from typing import Iterable, List, Optional
+
+_SEPARATORS = re.compile(r"[,;|\n]+")
+
+
+def normalize_segment(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+def parse_segments(raw: Optional[str]) -> List[str]:
+    """Split a free-form target_segments string into unique, normalized names."""
+    if not raw:
+        return []
+    return normalize_segments(_SEPARATORS.split(raw))
+
+
+def normalize_segments(names: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(name for name in map(normalize_segment, names) if name))
@@ -0,0 +1,54 @@
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Iterable
+
+
+class RowSerializer:
+    """Builds the response dict for result rows with a fixed set of keys.
+
+    The getter is compiled once, so serializing a row is a single C-level
+    itemgetter call plus ``zip``; no per-field Python code runs. Values
+    are left as-is: datetimes go to the JSON encoder, which writes them
+    as ISO 8601.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys = tuple(keys)
+        getter = itemgetter(*self.keys)
+        # itemgetter with one key returns the bare value, not a 1-tuple.
+        self._get = getter if len(self.keys) > 1 else (lambda row: (getter(row),))
+
+    def __call__(self, row) -> dict:
+        return dict(zip(self.keys, self._get(row)))
+
+    def many(self, rows) -> list:
+        keys, get = self.keys, self._get
+        return [dict(zip(keys, get(row))) for row in rows]
+
+
+class ModelSerializer(RowSerializer):
+    """RowSerializer for ORM instances: reads every column attribute of the model.
+
+    Loaded values are read straight from the instance ``__dict__``, which
+    skips the instrumented descriptors. An instance with expired or
+    deferred columns falls back to normal attribute access.
+    """
+
+    def __init__(self, model):
+        super().__init__(prop.key for prop in model.__mapper__.column_attrs)
+        loaded = self._get
+        getter = attrgetter(*self.keys)
+        by_attribute = getter if len(self.keys) > 1 else (lambda obj: (getter(obj),))
+
+        def get(obj):
+            try:
+                return loaded(obj.__dict__)
+            except KeyError:
+                return by_attribute(obj)
+
+        self._get = get
+
+
+@lru_cache(maxsize=None)
+def model_serializer(model) -> ModelSerializer:
+    return ModelSerializer(model)
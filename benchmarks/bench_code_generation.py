@@ -0,0 +1,101 @@
+"""
+Bulk promo code generation: generate, write and export a large batch.
+
+Times three stages: the pure generator, a full job that writes every
+chunk to the database, and streaming the batch back out as CSV. The
+export is counted but not kept in memory. Peak RSS is reported after
+each stage, so you can see that memory tracks the chunk size and not
+the batch size. The run checks that every generated code is unique.
+
+Uses a throwaway SQLite file unless DATABASE_URL is set:
+
+    python -m benchmarks.bench_code_generation --count 1000000 --chunk-size 50000
+"""
+import argparse
+import asyncio
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import use_bench_database
+
+use_bench_database("code_generation")
+
+from sqlalchemy import func, insert, select
+
+from app.db import AsyncSessionLocal, Base, async_engine
+from app.models.promo_code import PromoCode, PromoCodeBatch
+from app.models.promotion import Promotion
+from app.repo.promo_code_repo import PromoCodeRepository
+from app.services.code_generation import CodeGenerationJobs, generate_codes
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def seed(count: int, prefix: str):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        now = datetime.utcnow()
+        result = await conn.execute(insert(Promotion).values(
+            title="bench", start_date=now - timedelta(days=1), end_date=now + timedelta(days=1), status="active",
+        ).returning(Promotion.id))
+        promotion_id = result.scalar()
+        result = await conn.execute(insert(PromoCodeBatch).values(
+            promotion_id=promotion_id, prefix=prefix, requested=count, generated=0, status="pending",
+        ).returning(PromoCodeBatch.id))
+        return promotion_id, result.scalar()
+
+
+async def run(count: int, chunk_size: int, prefix: str):
+    promotion_id, batch_id = await seed(count, prefix)
+    print(f"{count} codes, chunks of {chunk_size}, baseline peak RSS {peak_rss_mb():.0f}MB")
+
+    started = time.perf_counter()
+    generated = sum(len(chunk) for chunk in generate_codes(batch_id, count, chunk_size, prefix))
+    elapsed = time.perf_counter() - started
+    print(f"  generate only  {elapsed:6.2f}s  {generated / elapsed:>12,.0f} codes/s  peak RSS {peak_rss_mb():.0f}MB")
+
+    started = time.perf_counter()
+    written = await CodeGenerationJobs(chunk_size).run(batch_id, promotion_id, count, prefix)
+    elapsed = time.perf_counter() - started
+    print(f"  generate+write {elapsed:6.2f}s  {written / elapsed:>12,.0f} codes/s  peak RSS {peak_rss_mb():.0f}MB")
+
+    started = time.perf_counter()
+    exported = exported_bytes = 0
+    async with AsyncSessionLocal() as db:
+        async for rows in PromoCodeRepository(db).stream_batch_codes(batch_id):
+            exported += len(rows)
+            exported_bytes += sum(len(code) + 3 for code, _ in rows)
+    elapsed = time.perf_counter() - started
+    print(f"  export stream  {elapsed:6.2f}s  {exported / elapsed:>12,.0f} codes/s  peak RSS {peak_rss_mb():.0f}MB "
+          f"(~{exported_bytes / 1e6:.0f}MB of CSV)")
+
+    async with AsyncSessionLocal() as db:
+        distinct = (await db.execute(
+            select(func.count(func.distinct(PromoCode.code))).where(PromoCode.batch_id == batch_id)
+        )).scalar()
+        batch = await db.get(PromoCodeBatch, batch_id)
+    await async_engine.dispose()
+
+    assert written == exported == distinct == count, "codes were lost or duplicated"
+    assert batch.status == "completed" and batch.generated == count, "batch progress is wrong"
+    print("  all codes unique and accounted for")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--prefix", default="BENCH")
+    args = parser.parse_args()
+    asyncio.run(run(args.count, args.chunk_size, args.prefix))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Streaming promotion export: time to first byte, throughput and memory.
+
+Seeds ``--count`` promotions, then drains the export stream exactly as
+StreamingResponse would, counting the bytes and throwing them away.
+Peak RSS is sampled before and after the export. Growth should stay
+flat as --count grows, because only one yield_per chunk is alive at a
+time.
+
+Uses a throwaway SQLite file unless DATABASE_URL is set:
+
+    python -m benchmarks.bench_export --count 1000000 --format csv
+"""
+import argparse
+import asyncio
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import use_bench_database
+
+use_bench_database("export")
+
+from app.db import Base, async_engine
+from app.services.promotion_service import _export_stream
+
+SEED_CHUNK = 10_000
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def seed(count: int):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    now = datetime.utcnow()
+    for start in range(0, count, SEED_CHUNK):
+        rows = [
+            (f"Promotion {i}", f"Description for promotion {i}, with a comma", "Terms apply",
+             now - timedelta(days=1), now + timedelta(days=30), i % 90, "students,members",
+             "active" if i % 3 else "draft", now - timedelta(seconds=i), now)
+            for i in range(start, min(start + SEED_CHUNK, count))
+        ]
+        async with async_engine.begin() as conn:
+            raw = await conn.get_raw_connection()
+            statement = (
+                "INSERT INTO promotions (title, description, terms, start_date, end_date, discount, "
+                "target_segments, status, created_at, updated_at) VALUES (%s)" % ", ".join(["?"] * 10)
+            )
+            if conn.dialect.name == "postgresql":
+                statement = statement.replace("?", "$%d") % tuple(range(1, 11))
+            await raw.driver_connection.executemany(statement, rows)
+
+
+async def run(count: int, fmt: str):
+    started = time.perf_counter()
+    await seed(count)
+    print(f"seeded {count} promotions in {time.perf_counter() - started:.1f}s, peak RSS {peak_rss_mb():.0f}MB")
+    baseline = peak_rss_mb()
+
+    started = time.perf_counter()
+    first_byte = None
+    chunks = size = 0
+    async for chunk in _export_stream(fmt, {}):
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        chunks += 1
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    await async_engine.dispose()
+
+    print(f"{fmt} export of {count} promotions")
+    print(f"  first byte {first_byte * 1000:8.1f}ms | total {elapsed:6.2f}s | {count / elapsed:,.0f} rows/s")
+    print(f"  {size / 1e6:.1f}MB in {chunks} chunks | peak RSS {peak_rss_mb():.0f}MB (+{peak_rss_mb() - baseline:.0f}MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    args = parser.parse_args()
+    asyncio.run(run(args.count, args.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Clearing the moderation queue: one approve per request vs. batch approve.
+
+Seeds ``--promotions`` pending promotions. It then approves all of them
+twice, resetting them to pending in between: once through
+``approve_promotion``, one request per promotion, and once through
+``approve_promotions`` in batches of ``--batch-size``. Every request
+gets its own session, as it would behind the API. The statements each
+run sends to the database are counted too.
+
+Uses a throwaway SQLite file unless DATABASE_URL is set:
+
+    python -m benchmarks.bench_moderation --promotions 2000 --batch-size 500
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import use_bench_database
+
+use_bench_database("moderation")
+
+from sqlalchemy import event, func, insert, select, update
+
+from app.db import AsyncSessionLocal, Base, async_engine
+from app.models import Role, User
+from app.models.promotion import Promotion
+from app.schemas.promotion import PromotionApproval
+from app.services.promotion_service import PromotionService
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+async def seed(promotions: int) -> tuple:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        role_id = (await conn.execute(insert(Role).values(name="admin").returning(Role.id))).scalar()
+        admin_id = (await conn.execute(
+            insert(User).values(email="admin@bench.io", password="not-a-real-hash", role_id=role_id).returning(User.id)
+        )).scalar()
+        now = datetime.utcnow()
+        await conn.execute(insert(Promotion), [
+            {"title": f"bench {i}", "start_date": now, "end_date": now + timedelta(days=7), "status": "pending",
+             "created_at": now, "updated_at": now}
+            for i in range(promotions)
+        ])
+        ids = (await conn.execute(select(Promotion.id).order_by(Promotion.id))).scalars().all()
+    return admin_id, ids
+
+
+async def reset_to_pending():
+    async with async_engine.begin() as conn:
+        await conn.execute(update(Promotion).values(status="pending", approval_comments=None))
+
+
+async def approved_count() -> int:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(select(func.count()).where(Promotion.status == "approved"))).scalar()
+
+
+async def approve_one_by_one(admin_id: int, ids: list):
+    approval = PromotionApproval(approved=True, comments="bench")
+    for promotion_id in ids:
+        async with AsyncSessionLocal() as db:
+            response = await PromotionService(db).approve_promotion(promotion_id, approval, admin_id)
+            assert response.status_code == 200, response.body
+
+
+async def approve_in_batches(admin_id: int, ids: list, batch_size: int):
+    for start in range(0, len(ids), batch_size):
+        async with AsyncSessionLocal() as db:
+            response = await PromotionService(db).approve_promotions(ids[start:start + batch_size], "bench", admin_id)
+            assert response.status_code == 200, response.body
+
+
+async def timed(name: str, count: int, runner, counter: StatementCounter) -> float:
+    await reset_to_pending()
+    counter.count = 0
+    started = time.perf_counter()
+    await runner()
+    elapsed = time.perf_counter() - started
+    assert await approved_count() == count, f"{name} left promotions unapproved"
+    print(f"  {name:<12} {elapsed:7.2f}s | {elapsed / count * 1000:7.3f}ms per promotion | "
+          f"{counter.count} statements")
+    return elapsed
+
+
+async def run(promotions: int, batch_size: int):
+    admin_id, ids = await seed(promotions)
+    counter = StatementCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    print(f"approving {promotions} pending promotions ({async_engine.dialect.name})")
+    single = await timed("one-by-one", promotions, lambda: approve_one_by_one(admin_id, ids), counter)
+    batch = await timed(f"batch of {batch_size}", promotions,
+                        lambda: approve_in_batches(admin_id, ids, batch_size), counter)
+    print(f"  batch is {single / batch:.1f}x faster")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--promotions", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.promotions, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+p99 latency of an unrelated endpoint while a burst of logins is running.
+
+Compares the old blocking ``verify_password`` call against the pooled
+``verify_password_async``. Run from the repo root (needs httpx):
+
+    python -m benchmarks.bench_password_hashing --logins 200 --probes 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.common import percentile
+from app.utils.security import (
+    hash_password, verify_password, verify_password_async, shutdown_hash_executor
+)
+
+HASHED = hash_password("benchmark-password")
+
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    @app.post("/login")
+    async def login():
+        if mode == "blocking":
+            ok = verify_password("benchmark-password", HASHED)
+        else:
+            ok = await verify_password_async("benchmark-password", HASHED)
+        return {"ok": ok}
+
+    return app
+
+
+async def run(mode: str, logins: int, probes: int, concurrency: int):
+    transport = httpx.ASGITransport(app=build_app(mode))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one_login():
+            async with semaphore:
+                await client.post("/login")
+
+        async def probe(done: asyncio.Event):
+            # Open-loop probe: latency is measured from the scheduled send time,
+            # so time spent waiting for a blocked event loop is counted.
+            latencies = []
+            interval = 0.005
+            scheduled = time.perf_counter()
+            while not done.is_set() or len(latencies) < probes:
+                scheduled += interval
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                await client.get("/health")
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+            return latencies
+
+        done = asyncio.Event()
+        probe_task = asyncio.create_task(probe(done))
+        started = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        latencies = await probe_task
+    print(
+        f"{mode:>8}: {logins} logins in {elapsed:.2f}s | /health "
+        f"p50={statistics.median(latencies):.2f}ms "
+        f"p99={percentile(latencies, 99):.2f}ms "
+        f"max={max(latencies):.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probes", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    for mode in ("blocking", "pooled"):
+        asyncio.run(run(mode, args.logins, args.probes, args.concurrency))
+    shutdown_hash_executor()
+
+
+if __name__ == "__main__":
+    main()
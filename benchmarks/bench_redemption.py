@@ -0,0 +1,116 @@
+"""
+Thousands of concurrent redeems against one capped promo code.
+
+Every redeem runs in its own session, like separate requests would. A
+share of them are retries that reuse an earlier idempotency key. The
+run fails loudly if the code oversells, a user goes past the per-user
+cap, or a retried key produces a second redemption.
+
+Uses a throwaway SQLite file unless DATABASE_URL is set. Point it at
+Postgres for meaningful contention numbers:
+
+    python -m benchmarks.bench_redemption --redeems 5000 --cap 1000 --users 2000
+"""
+import argparse
+import asyncio
+import collections
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import use_bench_database, percentile
+
+use_bench_database("redemption")
+
+from sqlalchemy import func, insert, select
+
+from app.db import AsyncSessionLocal, Base, async_engine
+from app.models import PromoCode, PromoRedemption, User
+from app.models.promotion import Promotion
+from app.repo.promo_code_repo import PromoCodeRepository
+
+CODE = "BENCH-CODE"
+
+
+async def seed(users: int, cap: int, per_user: int):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"email": f"user{i}@bench.io", "password": "not-a-real-hash"} for i in range(users)
+        ])
+        now = datetime.utcnow()
+        result = await conn.execute(insert(Promotion).values(
+            title="bench", start_date=now - timedelta(days=1), end_date=now + timedelta(days=1), status="active",
+        ).returning(Promotion.id))
+        promotion_id = result.scalar()
+        await conn.execute(insert(PromoCode).values(
+            code=CODE, promotion_id=promotion_id, max_redemptions=cap, per_user_limit=per_user, redemption_count=0,
+        ))
+        result = await conn.execute(select(User.id))
+        return [row[0] for row in result]
+
+
+async def run(redeems: int, cap: int, users: int, per_user: int, retry_ratio: float, concurrency: int):
+    user_ids = await seed(users, cap, per_user)
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes = collections.Counter()
+    latencies = []
+    issued_keys = []
+
+    async def one(i: int):
+        if issued_keys and random.random() < retry_ratio:
+            user_id, key = random.choice(issued_keys)
+        else:
+            user_id, key = random.choice(user_ids), f"key-{i}"
+            issued_keys.append((user_id, key))
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    outcome, _ = await PromoCodeRepository(db).redeem(CODE, user_id, key)
+            except Exception as e:
+                outcome = f"error:{type(e).__name__}"
+            latencies.append((time.perf_counter() - started) * 1000)
+            outcomes[outcome] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(redeems)))
+    elapsed = time.perf_counter() - started
+
+    async with AsyncSessionLocal() as db:
+        counted = (await db.execute(select(PromoCode.redemption_count).where(PromoCode.code == CODE))).scalar()
+        rows = (await db.execute(select(func.count()).select_from(PromoRedemption))).scalar()
+        worst_user = (await db.execute(
+            select(func.count()).select_from(PromoRedemption).group_by(PromoRedemption.user_id)
+            .order_by(func.count().desc()).limit(1)
+        )).scalar() or 0
+    await async_engine.dispose()
+
+    print(f"{redeems} redeems, {concurrency} in flight, cap={cap}, per_user={per_user}, {users} users")
+    print(f"  {redeems / elapsed:8.1f} redeems/s | p50={percentile(latencies, 50):.1f}ms "
+          f"p99={percentile(latencies, 99):.1f}ms")
+    print("  outcomes: " + ", ".join(f"{name}={count}" for name, count in sorted(outcomes.items())))
+    print(f"  counter={counted} redemption_rows={rows} max_per_user={worst_user}")
+
+    assert counted == rows, "counter and redemption rows disagree"
+    assert rows <= cap, "oversold"
+    assert worst_user <= per_user, "per-user cap exceeded"
+    assert outcomes["redeemed"] == rows, "a retried key redeemed twice"
+    print("  invariants hold")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--redeems", type=int, default=3000)
+    parser.add_argument("--cap", type=int, default=500)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--per-user", type=int, default=1)
+    parser.add_argument("--retry-ratio", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.redeems, args.cap, args.users, args.per_user, args.retry_ratio, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Latency and SQL statement count for role writes with hundreds of
+permissions, going through ``RoleRepository`` directly.
+
+Each size is measured three ways:
+- a role whose modules and permissions are all new;
+- a second role that reuses them;
+- an update that drops half the modules.
+
+Uses a throwaway SQLite file unless DATABASE_URL is set:
+
+    python -m benchmarks.bench_role_upsert --modules 10 25 50 --permissions 8
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import use_bench_database
+
+use_bench_database("role_upsert")
+
+from sqlalchemy import event
+
+from app.db import AsyncSessionLocal, Base, async_engine
+from app.repo.role_repo import RoleRepository
+from app.schemas.role import ModulePermission, RoleCreate
+
+
+def role_payload(name: str, prefix: str, modules: int, permissions: int) -> RoleCreate:
+    return RoleCreate(name=name, modules=[
+        ModulePermission(id=0, name=f"{prefix}_module_{m}", permissions=[f"perm_{p}" for p in range(permissions)])
+        for m in range(modules)
+    ])
+
+
+async def timed(label: str, grants: int, write):
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        role = await write(RoleRepository(db))
+    elapsed = time.perf_counter() - started
+    event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    print(f"{label:>24}: {grants:5d} grants in {elapsed * 1000:8.1f}ms | {len(statements):4d} SQL statements")
+    return role
+
+
+async def run(module_counts, permissions: int):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    for modules in module_counts:
+        prefix = f"m{modules}"
+        grants = modules * permissions
+        fresh = role_payload(f"{prefix}_fresh", prefix, modules, permissions)
+        role = await timed(f"{prefix} create (new)", grants, lambda repo: repo.create(fresh))
+        reused = role_payload(f"{prefix}_reused", prefix, modules, permissions)
+        await timed(f"{prefix} create (existing)", grants, lambda repo: repo.create(reused))
+        halved = role_payload(f"{prefix}_fresh", prefix, modules // 2, permissions)
+        await timed(f"{prefix} update (half)", grants // 2, lambda repo: repo.update(role.id, halved))
+
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", type=int, nargs="+", default=[10, 25, 50])
+    parser.add_argument("--permissions", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(run(args.modules, args.permissions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Serializing a 10k-promotion payload: old stdlib path vs. the orjson layer.
+
+Rows are real query results (RowMappings and ORM instances) read from a
+seeded SQLite file. Each strategy builds the same response envelope
+and renders it to bytes, as a response body would be:
+
+  stdlib      per-field dict + isoformat(), then JSONResponse (json.dumps)
+  pydantic    TypeAdapter(List[PromotionOut]).dump_json on ORM instances
+  rows        RowSerializer.many + FastJSONResponse (orjson)
+  orm         ORM instances handed straight to FastJSONResponse
+
+    python -m benchmarks.bench_serialization --promotions 10000 --runs 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from benchmarks.common import use_bench_database
+
+use_bench_database("serialization")
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+
+from app.db import AsyncSessionLocal, Base, async_engine
+from app.models.promotion import Promotion
+from app.repo.promotion_repo import PUBLIC_COLUMNS
+from app.schemas.promotion import PromotionOut
+from app.services.promotion_service import PUBLIC_FEED_ITEM
+from app.utils.response_helper import FastJSONResponse
+
+
+async def load(promotions: int):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        now = datetime.utcnow()
+        await conn.execute(insert(Promotion), [
+            {"title": f"Promotion {i}", "description": f"Twenty percent off everything, offer {i}",
+             "terms": "One per customer", "image_url": f"https://cdn.example.com/{i}.png", "discount": i % 90,
+             "target_segments": "students,members", "status": "active", "start_date": now,
+             "end_date": now + timedelta(days=30), "created_at": now, "updated_at": now}
+            for i in range(promotions)
+        ])
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(select(*PUBLIC_COLUMNS))).mappings().all()
+        objects = (await db.execute(select(Promotion))).scalars().all()
+    await async_engine.dispose()
+    return rows, objects
+
+
+def envelope(data):
+    return {"message": "Public promotions fetched successfully", "code": 200, "data": data}
+
+
+def stdlib(rows, objects) -> bytes:
+    data = [
+        {
+            "id": p["id"],
+            "title": p["title"],
+            "description": p["description"],
+            "terms": p["terms"],
+            "image_url": p["image_url"],
+            "discount": p["discount"],
+            "target_segments": p["target_segments"],
+            "status": p["status"],
+            "start_date": p["start_date"].isoformat() if p["start_date"] else None,
+            "end_date": p["end_date"].isoformat() if p["end_date"] else None,
+        }
+        for p in rows
+    ]
+    return JSONResponse(envelope(data)).body
+
+
+promotion_list = TypeAdapter(List[PromotionOut])
+
+
+def pydantic(rows, objects) -> bytes:
+    return b'{"message":"Public promotions fetched successfully","code":200,"data":' + \
+        promotion_list.dump_json(promotion_list.validate_python(objects, from_attributes=True)) + b"}"
+
+
+def orjson_rows(rows, objects) -> bytes:
+    return FastJSONResponse(envelope(PUBLIC_FEED_ITEM.many(rows))).body
+
+
+def orjson_orm(rows, objects) -> bytes:
+    return FastJSONResponse(envelope(objects)).body
+
+
+STRATEGIES = {"stdlib": stdlib, "pydantic": pydantic, "rows": orjson_rows, "orm": orjson_orm}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--promotions", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    rows, objects = asyncio.run(load(args.promotions))
+    print(f"{args.promotions} promotions, best and median of {args.runs} runs")
+    baseline = None
+    for name, strategy in STRATEGIES.items():
+        body = strategy(rows, objects)
+        samples = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            strategy(rows, objects)
+            samples.append((time.perf_counter() - started) * 1000)
+        best = min(samples)
+        baseline = baseline or best
+        print(f"  {name:<9} best {best:7.2f}ms  median {statistics.median(samples):7.2f}ms  "
+              f"{len(body) / 1e6:5.2f}MB  {baseline / best:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
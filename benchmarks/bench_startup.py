@@ -0,0 +1,91 @@
+"""
+Cold-start cost of the API: ``import app.main`` and time to first request.
+
+Every sample runs in a fresh interpreter so nothing is already imported.
+The schema is migrated once up front, so the timings include no DDL.
+Run from the repo root (needs httpx):
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import percentile, use_bench_database
+
+HEAVY_MODULES = ("passlib", "jose")
+
+
+def child():
+    import asyncio
+    import time
+
+    started = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+    loaded_heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    async def first_request():
+        import httpx
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                response = await client.get("/promotions/public/promotions")
+                response.raise_for_status()
+
+    request_started = time.perf_counter()
+    asyncio.run(first_request())
+    finished = time.perf_counter()
+
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "first_request_ms": (finished - request_started) * 1000,
+        "total_ms": (finished - started) * 1000,
+        "modules": len(sys.modules),
+        "heavy_loaded": loaded_heavy,
+    }))
+
+
+def summarize(label: str, samples):
+    print(
+        f"{label:>16}: median={statistics.median(samples):7.1f}ms "
+        f"p90={percentile(samples, 90):7.1f}ms "
+        f"min={min(samples):7.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    use_bench_database("startup")
+    subprocess.run([sys.executable, "-m", "app.cli", "migrate"], check=True, capture_output=True)
+
+    env = dict(os.environ, CREATE_SCHEMA_ON_STARTUP="false")
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+            check=True, capture_output=True, text=True, env=env,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{args.runs} cold starts, {results[-1]['modules']} modules loaded by import")
+    for key in ("import_ms", "first_request_ms", "total_ms"):
+        summarize(key, [result[key] for result in results])
+    heavy = sorted({name for result in results for name in result["heavy_loaded"]})
+    print(f"eagerly imported heavy modules: {', '.join(heavy) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Requests per second for ``GET /promotions`` with plain tokens versus tokens
+that embed the permission bitset (EMBED_PERMISSIONS_IN_TOKEN).
+
+Uses a throwaway SQLite file unless DATABASE_URL is set:
+
+    python -m benchmarks.bench_stateless_authz --requests 2000
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import use_bench_database, silence_request_logs, seed_roles, create_user
+
+use_bench_database("stateless_authz")
+
+import httpx
+from sqlalchemy import event
+
+from app.config import settings
+from app.db import Base, SessionLocal, engine, async_engine
+from app.main import app
+
+silence_request_logs()
+
+
+async def run(embed: bool, requests: int, concurrency: int):
+    settings.EMBED_PERMISSIONS_IN_TOKEN = embed
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/auth/login", json={"email": "vendor@bench.io", "password": "benchmark-password"}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+        await client.get("/promotions/", headers=headers)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                response = await client.get("/promotions/", headers=headers)
+                assert response.status_code == 200, response.text
+
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", count)
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", count)
+
+    label = "embedded" if embed else "plain"
+    print(
+        f"{label:>8}: {requests / elapsed:8.1f} req/s | "
+        f"{len(statements) / requests:.2f} SQL statements per request"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    roles = seed_roles(db)
+    create_user(db, "vendor@bench.io", roles["vendor"])
+    db.close()
+
+    async def run_all():
+        # One loop for both runs: the async engine's pool is bound to it.
+        for embed in (False, True):
+            await run(embed, args.requests, args.concurrency)
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main()
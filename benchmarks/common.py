@@ -0,0 +1,55 @@
+import os
+import logging
+import tempfile
+
+PROMOTION_PERMISSIONS = [
+    "create_promotion", "get_promotion", "update_promotion", "delete_promotion",
+    "toggle_promotion", "submit_promotion", "approve_promotion", "reject_promotion",
+]
+
+
+def use_bench_database(name: str):
+    # Must run before anything imports app.db; DATABASE_URL wins if it is set.
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.gettempdir(), f"ana_bench_{name}.db")
+        if os.path.exists(path):
+            os.remove(path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+
+def silence_request_logs():
+    logging.getLogger("app.middleware.logging").setLevel(logging.WARNING)
+
+
+def seed_roles(db):
+    from app.models import Module, Permission, Role
+
+    module = Module(name="promotions")
+    db.add(module)
+    db.flush()
+    permissions = [Permission(name=name, module_id=module.id) for name in PROMOTION_PERMISSIONS]
+    db.add_all(permissions)
+    roles = {
+        "admin": Role(name="admin", permissions=permissions),
+        "vendor": Role(name="vendor", permissions=permissions),
+    }
+    db.add_all(roles.values())
+    db.commit()
+    return roles
+
+
+def create_user(db, email: str, role, password: str = "benchmark-password"):
+    from app.models import User
+    from app.utils.security import hash_password
+
+    user = User(email=email, password=hash_password(password), role_id=role.id)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
@@ -0,0 +1,133 @@
+"""initial schema
+
+Mirrors the tables previously created by Base.metadata.create_all.
+Databases that were created that way can be adopted with
+``alembic stamp 0001`` before upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "modules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+    )
+    op.create_index("ix_modules_id", "modules", ["id"])
+
+    op.create_table(
+        "roles",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+    )
+    op.create_index("ix_roles_id", "roles", ["id"])
+
+    op.create_table(
+        "permissions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("module_id", sa.Integer(), sa.ForeignKey("modules.id")),
+    )
+    op.create_index("ix_permissions_id", "permissions", ["id"])
+
+    op.create_table(
+        "businesses",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+        sa.Column("address", sa.String()),
+    )
+    op.create_index("ix_businesses_id", "businesses", ["id"])
+
+    op.create_table(
+        "branches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("location", sa.String()),
+        sa.Column("business_id", sa.Integer(), sa.ForeignKey("businesses.id")),
+    )
+    op.create_index("ix_branches_id", "branches", ["id"])
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("role_id", sa.Integer(), sa.ForeignKey("roles.id")),
+        sa.Column("phone_number", sa.String(), nullable=True, unique=True),
+        sa.Column("otp_code", sa.String(), nullable=True),
+        sa.Column("otp_expiry", sa.DateTime(), nullable=True),
+        sa.Column("is_phone_verified", sa.Boolean()),
+        sa.Column("business_license", sa.String(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "promotions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("terms", sa.Text()),
+        sa.Column("image_url", sa.String()),
+        sa.Column("start_date", sa.DateTime(), nullable=False),
+        sa.Column("end_date", sa.DateTime(), nullable=False),
+        sa.Column("discount", sa.Integer()),
+        sa.Column("target_segments", sa.String()),
+        sa.Column("status", sa.String()),
+        sa.Column("approval_comments", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_promotions_id", "promotions", ["id"])
+
+    op.create_table(
+        "saved_promotions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("promotion_id", sa.Integer(), sa.ForeignKey("promotions.id")),
+        sa.Column("saved_at", sa.DateTime()),
+        sa.UniqueConstraint("user_id", "promotion_id", name="uix_user_promotion"),
+    )
+    op.create_index("ix_saved_promotions_id", "saved_promotions", ["id"])
+
+    op.create_table(
+        "role_permissions",
+        sa.Column("role_id", sa.Integer(), sa.ForeignKey("roles.id")),
+        sa.Column("permission_id", sa.Integer(), sa.ForeignKey("permissions.id")),
+    )
+    op.create_table(
+        "user_permissions",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("permission_id", sa.Integer(), sa.ForeignKey("permissions.id")),
+    )
+
+    op.create_table(
+        "authz_versions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("authz_versions")
+    op.drop_table("user_permissions")
+    op.drop_table("role_permissions")
+    op.drop_table("saved_promotions")
+    op.drop_table("promotions")
+    op.drop_table("users")
+    op.drop_table("branches")
+    op.drop_table("businesses")
+    op.drop_table("permissions")
+    op.drop_table("roles")
+    op.drop_table("modules")
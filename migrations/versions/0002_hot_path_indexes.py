@@ -0,0 +1,79 @@
+"""hot path indexes
+
+Indexes the columns the promotion, permission and login queries filter
+on, and gives the permission link tables composite primary keys.
+saved_promotions.user_id is already the leading column of
+uix_user_promotion, so it only needs the promotion_id index.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+PUBLIC_STATUSES = sa.text("status IN ('approved', 'active')")
+LINK_TABLES = (
+    ("role_permissions", "role_id"),
+    ("user_permissions", "user_id"),
+)
+
+
+def _dedupe_link_table(table, owner_column):
+    op.execute(f"DELETE FROM {table} WHERE {owner_column} IS NULL OR permission_id IS NULL")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE a.ctid < b.ctid AND a.{owner_column} = b.{owner_column} "
+            f"AND a.permission_id = b.permission_id"
+        )
+    else:
+        op.execute(
+            f"DELETE FROM {table} WHERE rowid NOT IN "
+            f"(SELECT MIN(rowid) FROM {table} GROUP BY {owner_column}, permission_id)"
+        )
+
+
+def upgrade():
+    op.create_index("ix_promotions_status", "promotions", ["status"])
+    op.create_index("ix_promotions_created_by", "promotions", ["created_by"])
+    op.create_index(
+        "ix_promotions_public",
+        "promotions",
+        ["created_at", "id"],
+        postgresql_where=PUBLIC_STATUSES,
+        sqlite_where=PUBLIC_STATUSES,
+    )
+    op.create_index("ix_saved_promotions_promotion_id", "saved_promotions", ["promotion_id"])
+    op.create_index("ix_permissions_module_id", "permissions", ["module_id"])
+    op.create_index("ix_users_email_lower", "users", [sa.text("lower(email)")])
+
+    for table, owner_column in LINK_TABLES:
+        _dedupe_link_table(table, owner_column)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(owner_column, existing_type=sa.Integer(), nullable=False)
+            batch_op.alter_column("permission_id", existing_type=sa.Integer(), nullable=False)
+            batch_op.create_primary_key(f"pk_{table}", [owner_column, "permission_id"])
+        op.create_index(f"ix_{table}_permission_id", table, ["permission_id"])
+
+
+def downgrade():
+    for table, owner_column in reversed(LINK_TABLES):
+        op.drop_index(f"ix_{table}_permission_id", table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f"pk_{table}", type_="primary")
+            batch_op.alter_column("permission_id", existing_type=sa.Integer(), nullable=True)
+            batch_op.alter_column(owner_column, existing_type=sa.Integer(), nullable=True)
+
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.drop_index("ix_permissions_module_id", table_name="permissions")
+    op.drop_index("ix_saved_promotions_promotion_id", table_name="saved_promotions")
+    op.drop_index("ix_promotions_public", table_name="promotions")
+    op.drop_index("ix_promotions_created_by", table_name="promotions")
+    op.drop_index("ix_promotions_status", table_name="promotions")
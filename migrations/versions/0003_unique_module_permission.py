@@ -0,0 +1,53 @@
+"""unique permission name per module
+
+Role writes upsert permissions with ON CONFLICT DO NOTHING, which needs a
+unique (module_id, name) constraint. Duplicate permissions are folded
+into the lowest id first, carrying their role and user grants along. The
+constraint leads with module_id, so it replaces ix_permissions_module_id.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+LINK_TABLES = (
+    ("role_permissions", "role_id"),
+    ("user_permissions", "user_id"),
+)
+CANONICAL = (
+    "SELECT p.id AS old_id, "
+    "(SELECT MIN(d.id) FROM permissions d WHERE d.module_id = p.module_id AND d.name = p.name) AS new_id "
+    "FROM permissions p WHERE p.module_id IS NOT NULL"
+)
+
+
+def upgrade():
+    for table, owner_column in LINK_TABLES:
+        op.execute(
+            f"INSERT INTO {table} ({owner_column}, permission_id) "
+            f"SELECT l.{owner_column}, c.new_id FROM {table} l "
+            f"JOIN ({CANONICAL}) c ON c.old_id = l.permission_id "
+            f"WHERE c.new_id <> c.old_id ON CONFLICT DO NOTHING"
+        )
+        op.execute(
+            f"DELETE FROM {table} WHERE permission_id IN "
+            f"(SELECT old_id FROM ({CANONICAL}) c WHERE c.new_id <> c.old_id)"
+        )
+    op.execute(f"DELETE FROM permissions WHERE id IN (SELECT old_id FROM ({CANONICAL}) c WHERE c.new_id <> c.old_id)")
+
+    with op.batch_alter_table("permissions") as batch_op:
+        batch_op.create_unique_constraint("uq_permissions_module_id_name", ["module_id", "name"])
+    op.drop_index("ix_permissions_module_id", table_name="permissions")
+
+
+def downgrade():
+    op.create_index("ix_permissions_module_id", "permissions", ["module_id"])
+    with op.batch_alter_table("permissions") as batch_op:
+        batch_op.drop_constraint("uq_permissions_module_id_name", type_="unique")
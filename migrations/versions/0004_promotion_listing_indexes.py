@@ -0,0 +1,33 @@
+"""promotion listing indexes
+
+Keyset pagination orders by (created_at, id). Extending the status and
+creator indexes with those columns lets filtered pages come straight off
+the index without a sort; the narrower indexes they replace are dropped.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_promotions_created_at_id", "promotions", ["created_at", "id"])
+    op.create_index("ix_promotions_status_created_at_id", "promotions", ["status", "created_at", "id"])
+    op.create_index("ix_promotions_created_by_created_at_id", "promotions", ["created_by", "created_at", "id"])
+    op.drop_index("ix_promotions_status", table_name="promotions")
+    op.drop_index("ix_promotions_created_by", table_name="promotions")
+
+
+def downgrade():
+    op.create_index("ix_promotions_created_by", "promotions", ["created_by"])
+    op.create_index("ix_promotions_status", "promotions", ["status"])
+    op.drop_index("ix_promotions_created_by_created_at_id", table_name="promotions")
+    op.drop_index("ix_promotions_status_created_at_id", table_name="promotions")
+    op.drop_index("ix_promotions_created_at_id", table_name="promotions")
@@ -0,0 +1,26 @@
+"""promotion lifecycle indexes
+
+The lifecycle sweep selects by status plus start_date (due activations)
+and status plus end_date (ended promotions).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_promotions_status_start_date", "promotions", ["status", "start_date"])
+    op.create_index("ix_promotions_status_end_date", "promotions", ["status", "end_date"])
+
+
+def downgrade():
+    op.drop_index("ix_promotions_status_end_date", table_name="promotions")
+    op.drop_index("ix_promotions_status_start_date", table_name="promotions")
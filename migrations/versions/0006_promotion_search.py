@@ -0,0 +1,66 @@
+"""promotion full-text search
+
+Postgres: a generated, weighted tsvector column (title > description >
+terms) with a GIN index. SQLite: an external-content FTS5 table kept in
+sync by triggers, backfilled from existing rows.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+POSTGRES_UPGRADE = (
+    "ALTER TABLE promotions ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(terms, '')), 'C')) STORED",
+    "CREATE INDEX ix_promotions_search_vector ON promotions USING GIN (search_vector)",
+)
+POSTGRES_DOWNGRADE = (
+    "DROP INDEX ix_promotions_search_vector",
+    "ALTER TABLE promotions DROP COLUMN search_vector",
+)
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE promotions_fts USING fts5("
+    "title, description, terms, content='promotions', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER promotions_fts_ai AFTER INSERT ON promotions BEGIN "
+    "INSERT INTO promotions_fts(rowid, title, description, terms) "
+    "VALUES (new.id, new.title, new.description, new.terms); END",
+    "CREATE TRIGGER promotions_fts_ad AFTER DELETE ON promotions BEGIN "
+    "INSERT INTO promotions_fts(promotions_fts, rowid, title, description, terms) "
+    "VALUES ('delete', old.id, old.title, old.description, old.terms); END",
+    "CREATE TRIGGER promotions_fts_au AFTER UPDATE OF title, description, terms ON promotions BEGIN "
+    "INSERT INTO promotions_fts(promotions_fts, rowid, title, description, terms) "
+    "VALUES ('delete', old.id, old.title, old.description, old.terms); "
+    "INSERT INTO promotions_fts(rowid, title, description, terms) "
+    "VALUES (new.id, new.title, new.description, new.terms); END",
+    "INSERT INTO promotions_fts(promotions_fts) VALUES ('rebuild')",
+)
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER promotions_fts_au",
+    "DROP TRIGGER promotions_fts_ad",
+    "DROP TRIGGER promotions_fts_ai",
+    "DROP TABLE promotions_fts",
+)
+
+
+def _run(postgres, sqlite):
+    dialect = op.get_bind().dialect.name
+    for statement in {"postgresql": postgres, "sqlite": sqlite}.get(dialect, ()):
+        op.execute(statement)
+
+
+def upgrade():
+    _run(POSTGRES_UPGRADE, SQLITE_UPGRADE)
+
+
+def downgrade():
+    _run(POSTGRES_DOWNGRADE, SQLITE_DOWNGRADE)
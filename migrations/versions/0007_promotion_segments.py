@@ -0,0 +1,65 @@
+"""normalized promotion target segments
+
+Adds segments and the promotion_segments link table, then backfills it
+from the free-form promotions.target_segments strings. The string column
+is kept as the user-facing value.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _parse(raw):
+    names = (" ".join(part.split()).lower() for part in re.split(r"[,;|\n]+", raw or ""))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def upgrade():
+    segments = op.create_table(
+        "segments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+    )
+    links = op.create_table(
+        "promotion_segments",
+        sa.Column("promotion_id", sa.Integer(), sa.ForeignKey("promotions.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("segment_id", sa.Integer(), sa.ForeignKey("segments.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_promotion_segments_segment_id", "promotion_segments", ["segment_id", "promotion_id"])
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, target_segments FROM promotions WHERE target_segments IS NOT NULL AND target_segments <> ''"
+    )).all()
+    parsed = [(promotion_id, _parse(raw)) for promotion_id, raw in rows]
+    names = sorted({name for _, promotion_names in parsed for name in promotion_names})
+    for start in range(0, len(names), BATCH_SIZE):
+        bind.execute(segments.insert(), [{"name": name} for name in names[start:start + BATCH_SIZE]])
+
+    segment_ids = dict((name, segment_id) for segment_id, name in bind.execute(sa.text("SELECT id, name FROM segments")))
+    link_rows = [
+        {"promotion_id": promotion_id, "segment_id": segment_ids[name]}
+        for promotion_id, promotion_names in parsed
+        for name in promotion_names
+    ]
+    for start in range(0, len(link_rows), BATCH_SIZE):
+        bind.execute(links.insert(), link_rows[start:start + BATCH_SIZE])
+
+
+def downgrade():
+    op.drop_index("ix_promotion_segments_segment_id", table_name="promotion_segments")
+    op.drop_table("promotion_segments")
+    op.drop_table("segments")
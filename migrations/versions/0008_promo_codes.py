@@ -0,0 +1,58 @@
+"""promo codes and redemptions
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "promo_codes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("code", sa.String(), nullable=False, unique=True),
+        sa.Column("promotion_id", sa.Integer(), sa.ForeignKey("promotions.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("max_redemptions", sa.Integer(), nullable=True),
+        sa.Column("per_user_limit", sa.Integer(), nullable=True),
+        sa.Column("redemption_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime()),
+        sa.CheckConstraint(
+            "max_redemptions IS NULL OR redemption_count <= max_redemptions",
+            name="ck_promo_codes_within_cap",
+        ),
+    )
+    op.create_index("ix_promo_codes_promotion_id", "promo_codes", ["promotion_id"])
+
+    op.create_table(
+        "promo_code_user_counts",
+        sa.Column("promo_code_id", sa.Integer(), sa.ForeignKey("promo_codes.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("redemptions", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    op.create_table(
+        "promo_redemptions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("promo_code_id", sa.Integer(), sa.ForeignKey("promo_codes.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("idempotency_key", sa.String(), nullable=True),
+        sa.Column("redeemed_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("user_id", "idempotency_key", name="uq_promo_redemptions_user_idempotency_key"),
+    )
+    op.create_index("ix_promo_redemptions_promo_code_id", "promo_redemptions", ["promo_code_id"])
+
+
+def downgrade():
+    op.drop_index("ix_promo_redemptions_promo_code_id", table_name="promo_redemptions")
+    op.drop_table("promo_redemptions")
+    op.drop_table("promo_code_user_counts")
+    op.drop_index("ix_promo_codes_promotion_id", table_name="promo_codes")
+    op.drop_table("promo_codes")
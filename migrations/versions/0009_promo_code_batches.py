@@ -0,0 +1,50 @@
+"""promo code batches
+
+Bulk-generated codes belong to a batch, which tracks progress and is the
+unit of CSV export.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "promo_code_batches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("promotion_id", sa.Integer(), sa.ForeignKey("promotions.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("prefix", sa.String(), nullable=True),
+        sa.Column("requested", sa.Integer(), nullable=False),
+        sa.Column("generated", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_promo_code_batches_promotion_id", "promo_code_batches", ["promotion_id"])
+
+    with op.batch_alter_table("promo_codes") as batch_op:
+        batch_op.add_column(sa.Column("batch_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_promo_codes_batch_id", "promo_code_batches", ["batch_id"], ["id"], ondelete="CASCADE"
+        )
+    op.create_index("ix_promo_codes_batch_id", "promo_codes", ["batch_id", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_promo_codes_batch_id", table_name="promo_codes")
+    with op.batch_alter_table("promo_codes") as batch_op:
+        batch_op.drop_constraint("fk_promo_codes_batch_id", type_="foreignkey")
+        batch_op.drop_column("batch_id")
+    op.drop_index("ix_promo_code_batches_promotion_id", table_name="promo_code_batches")
+    op.drop_table("promo_code_batches")
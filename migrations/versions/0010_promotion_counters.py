@@ -0,0 +1,32 @@
+"""promotion counters
+
+Views, saves and redemptions per promotion, written in batches by the
+write-behind counter aggregator.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "promotion_counters",
+        sa.Column("promotion_id", sa.Integer(), sa.ForeignKey("promotions.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("views", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("saves", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("redemptions", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table("promotion_counters")
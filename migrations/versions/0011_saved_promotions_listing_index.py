@@ -0,0 +1,23 @@
+"""saved promotions listing index
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_saved_promotions_user_id_saved_at_id", "saved_promotions", ["user_id", "saved_at", "id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_saved_promotions_user_id_saved_at_id", table_name="saved_promotions")
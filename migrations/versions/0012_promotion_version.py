@@ -0,0 +1,26 @@
+"""promotion version column
+
+Optimistic concurrency for promotion state transitions and edits.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("promotions", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade():
+    # Not batch mode: rebuilding promotions on SQLite would drop the FTS5
+    # triggers from 0006. Native DROP COLUMN needs SQLite 3.35+.
+    op.execute("ALTER TABLE promotions DROP COLUMN version")
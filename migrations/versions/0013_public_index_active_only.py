@@ -0,0 +1,38 @@
+"""public index covers active promotions only
+
+Approved promotions are activated by the lifecycle sweep once they
+start, so public reads now filter on status = 'active' alone and the
+partial index follows.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def _create_public_index(predicate: str):
+    op.create_index(
+        "ix_promotions_public",
+        "promotions",
+        ["created_at", "id"],
+        postgresql_where=sa.text(predicate),
+        sqlite_where=sa.text(predicate),
+    )
+
+
+def upgrade():
+    op.drop_index("ix_promotions_public", table_name="promotions")
+    _create_public_index("status = 'active'")
+
+
+def downgrade():
+    op.drop_index("ix_promotions_public", table_name="promotions")
+    _create_public_index("status IN ('approved', 'active')")
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import tempfile
+
+# Must run before anything imports app.db.
+DATABASE_PATH = os.path.join(tempfile.gettempdir(), f"ana_tests_{os.getpid()}.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db import Base, SessionLocal, async_engine, engine
+from app.main import app
+from app.models import Module, Permission, Role, User
+from app.services.permission_matrix import permission_matrix
+from app.utils.security import create_access_token
+
+PROMOTION_PERMISSIONS = [
+    "create_promotion", "get_promotion", "update_promotion", "delete_promotion",
+    "toggle_promotion", "submit_promotion", "approve_promotion", "reject_promotion",
+]
+
+
+def _enforce_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores foreign keys unless asked, Postgres never does.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+event.listen(engine, "connect", _enforce_foreign_keys)
+event.listen(async_engine.sync_engine, "connect", _enforce_foreign_keys)
+
+
+def _remove_database():
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+    if os.path.exists(DATABASE_PATH):
+        os.remove(DATABASE_PATH)
+
+
+@pytest.fixture(autouse=True)
+def database():
+    # A fresh file per test; drop_all would leave the FTS table behind.
+    _remove_database()
+    Base.metadata.create_all(engine)
+    permission_matrix.invalidate()
+    yield
+    _remove_database()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def roles(db):
+    module = Module(name="promotions")
+    db.add(module)
+    db.flush()
+    permissions = [Permission(name=name, module_id=module.id) for name in PROMOTION_PERMISSIONS]
+    roles = {
+        "admin": Role(name="admin", permissions=permissions),
+        "customer": Role(name="customer", permissions=[]),
+    }
+    db.add_all(permissions + list(roles.values()))
+    db.commit()
+    return roles
+
+
+@pytest.fixture
+def create_user(db):
+    def create(email: str, role: Role) -> User:
+        user = User(email=email, password="not-a-real-hash", role_id=role.id)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+    return create
+
+
+def auth_headers(user: User, **claims) -> dict:
+    return {"Authorization": "Bearer " + create_access_token({"sub": user.email, **claims})}
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
@@ -0,0 +1,25 @@
+import pytest
+
+from tests.conftest import auth_headers
+
+INTERNAL_ROUTES = [
+    "/internal/db-pool",
+    "/internal/token-cache",
+    "/internal/public-feed",
+    "/internal/promotion-lifecycle",
+    "/internal/promotion-counters",
+]
+
+
+@pytest.mark.parametrize("path", INTERNAL_ROUTES)
+def test_internal_routes_require_a_token(client, path):
+    assert client.get(path).status_code == 401
+
+
+@pytest.mark.parametrize("path", INTERNAL_ROUTES)
+def test_internal_routes_require_the_admin_permission(client, roles, create_user, path):
+    customer = create_user("customer@example.com", roles["customer"])
+    admin = create_user("admin@example.com", roles["admin"])
+
+    assert client.get(path, headers=auth_headers(customer)).status_code == 403
+    assert client.get(path, headers=auth_headers(admin)).status_code == 200
@@ -0,0 +1,27 @@
+import logging
+
+from tests.conftest import auth_headers
+
+
+def test_public_requests_log_the_token_subject_without_loading_the_user(client, roles, create_user,
+                                                                       monkeypatch, caplog):
+    customer = create_user("customer@example.com", roles["customer"])
+    lookups = []
+
+    async def load_principal(db, email):
+        lookups.append(email)
+
+    monkeypatch.setattr("app.dependencies._load_principal", load_principal)
+    with caplog.at_level(logging.INFO, logger="app.middleware.logging"):
+        response = client.get("/promotions/public/promotions", headers=auth_headers(customer))
+
+    assert response.status_code == 200
+    assert lookups == []
+    assert "GET /promotions/public/promotions by customer@example.com" in caplog.text
+
+
+def test_anonymous_requests_are_logged_as_anonymous(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.middleware.logging"):
+        client.get("/promotions/public/promotions")
+
+    assert "GET /promotions/public/promotions by Anonymous" in caplog.text
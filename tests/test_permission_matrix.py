@@ -0,0 +1,21 @@
+from app.db import SessionLocal
+from app.models.permission import AuthzVersion
+from app.services.permission_matrix import bump_authz_version
+
+
+def test_bump_authz_version_creates_the_row_then_increments(db):
+    assert db.query(AuthzVersion).count() == 0
+
+    assert bump_authz_version(db) == 1
+    db.commit()
+
+    other = SessionLocal()
+    try:
+        assert bump_authz_version(other) == 2
+        other.commit()
+    finally:
+        other.close()
+
+    assert bump_authz_version(db) == 3
+    db.commit()
+    assert [(row.id, row.version) for row in db.query(AuthzVersion)] == [(1, 3)]
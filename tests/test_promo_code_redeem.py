@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.db import AsyncSessionLocal, async_engine
+from app.models.promo_code import PromoCode, PromoRedemption
+from app.models.promotion import Promotion
+from app.repo import promo_code_repo
+from app.repo.promo_code_repo import PromoCodeRepository
+
+
+def _seed(db, create_user, roles):
+    now = datetime.utcnow()
+    promotion = Promotion(title="live", status="active", start_date=now - timedelta(days=1),
+                          end_date=now + timedelta(days=1))
+    db.add(promotion)
+    db.flush()
+    db.add(PromoCode(code="ONCE", promotion_id=promotion.id, per_user_limit=1))
+    db.commit()
+    return create_user("customer@example.com", roles["customer"]).id
+
+
+def test_concurrent_retry_with_the_same_key_replays(db, roles, create_user, monkeypatch):
+    user_id = _seed(db, create_user, roles)
+    lookup = PromoCodeRepository._redemption_by_key
+    lookups = 0
+
+    async def scenario():
+        # Both requests pass the up-front replay check before either writes,
+        # as a retry sent while the original is still in flight would.
+        both_checked = asyncio.Barrier(2)
+
+        async def racing_lookup(self, *args):
+            nonlocal lookups
+            previous = await lookup(self, *args)
+            lookups += 1
+            if lookups <= 2:
+                await both_checked.wait()
+            return previous
+
+        monkeypatch.setattr(PromoCodeRepository, "_redemption_by_key", racing_lookup)
+
+        async def redeem():
+            async with AsyncSessionLocal() as session:
+                return await PromoCodeRepository(session).redeem("ONCE", user_id, "retry-key")
+
+        results = await asyncio.gather(redeem(), redeem())
+        async with AsyncSessionLocal() as session:
+            stored = (await session.execute(select(func.count()).select_from(PromoRedemption))).scalar()
+            count = (await session.execute(select(PromoCode.redemption_count))).scalar()
+        await async_engine.dispose()
+        return results, stored, count
+
+    results, stored, count = asyncio.run(scenario())
+    outcomes = sorted(outcome for outcome, _ in results)
+    assert outcomes == sorted([promo_code_repo.REDEEMED, promo_code_repo.REPLAYED])
+    redeemed, replayed = sorted(results, key=lambda result: result[0] != promo_code_repo.REDEEMED)
+    assert replayed[1]["id"] == redeemed[1]["id"]
+    assert stored == 1
+    assert count == 1
+
+
+def test_second_key_hits_the_per_user_limit(db, roles, create_user):
+    user_id = _seed(db, create_user, roles)
+
+    async def scenario():
+        outcomes = []
+        for key in ("first", "second"):
+            async with AsyncSessionLocal() as session:
+                outcomes.append((await PromoCodeRepository(session).redeem("ONCE", user_id, key))[0])
+        await async_engine.dispose()
+        return outcomes
+
+    assert asyncio.run(scenario()) == [promo_code_repo.REDEEMED, promo_code_repo.USER_LIMIT_REACHED]
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from app.db import AsyncSessionLocal, async_engine
+from app.models.promotion import Promotion, PromotionCounter
+from app.services.promotion_counters import CounterAggregator
+from app.services.promotion_service import PromotionService
+
+
+async def _seed(count: int) -> list:
+    now = datetime.utcnow()
+    async with async_engine.begin() as conn:
+        await conn.execute(insert(Promotion), [
+            {"title": f"promotion {i}", "status": "active", "start_date": now,
+             "end_date": now + timedelta(days=7), "created_at": now, "updated_at": now}
+            for i in range(count)
+        ])
+        return list((await conn.execute(select(Promotion.id).order_by(Promotion.id))).scalars())
+
+
+async def _counters() -> dict:
+    async with async_engine.connect() as conn:
+        rows = await conn.execute(select(PromotionCounter.promotion_id, PromotionCounter.views))
+        return dict(rows.all())
+
+
+def test_flush_skips_promotions_deleted_after_their_deltas_were_queued():
+    async def scenario():
+        kept, deleted = await _seed(2)
+        aggregator = CounterAggregator(interval=60, max_pending=1000)
+        aggregator.incr(kept, "views", 3)
+        aggregator.incr(deleted, "views", 5)
+        async with async_engine.begin() as conn:
+            await conn.execute(Promotion.__table__.delete().where(Promotion.id == deleted))
+
+        written = await aggregator.flush()
+        counters = await _counters()
+        await async_engine.dispose()
+        return kept, written, counters, aggregator.stats()
+
+    kept, written, counters, stats = asyncio.run(scenario())
+    assert written == 1
+    assert counters == {kept: 3}
+    assert stats["pending_promotions"] == 0
+
+
+def test_delete_promotion_discards_pending_deltas(monkeypatch):
+    aggregator = CounterAggregator(interval=60, max_pending=1000)
+    monkeypatch.setattr("app.services.promotion_service.promotion_counters", aggregator)
+
+    async def scenario():
+        (promotion_id,) = await _seed(1)
+        async with async_engine.begin() as conn:
+            await conn.execute(Promotion.__table__.update().values(created_by=None))
+        aggregator.incr(promotion_id, "views", 2)
+        async with AsyncSessionLocal() as db:
+            response = await PromotionService(db).delete_promotion(promotion_id, None)
+        pending = aggregator.stats()["pending_promotions"]
+        written = await aggregator.flush()
+        await async_engine.dispose()
+        return response.status_code, pending, written
+
+    status_code, pending, written = asyncio.run(scenario())
+    assert status_code == 200
+    assert pending == 0
+    assert written == 0
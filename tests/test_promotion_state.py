@@ -0,0 +1,22 @@
+import pytest
+
+from app.services.promotion_state import parse_version
+
+
+@pytest.mark.parametrize("if_match, expected", [
+    (None, None),
+    ("", None),
+    ("*", None),
+    (" * ", None),
+    ('"3"', 3),
+    ('W/"3"', 3),
+    ("3", 3),
+])
+def test_parse_version(if_match, expected):
+    assert parse_version(if_match) == expected
+
+
+@pytest.mark.parametrize("if_match", ['"abc"', "W/", '"3", "4"'])
+def test_parse_version_rejects_malformed_tags(if_match):
+    with pytest.raises(ValueError):
+        parse_version(if_match)
@@ -0,0 +1,34 @@
+import asyncio
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.db import PRIMARY_COOKIE, read_after_write
+from app.middleware.read_after_write import ReadAfterWriteMiddleware
+
+
+async def _write(request):
+    request.state.wrote_to_primary = True
+    return Response()
+
+
+def _dispatch(client):
+    request = Request({"type": "http", "method": "POST", "path": "/", "headers": [],
+                       "query_string": b"", "client": client})
+    return asyncio.run(ReadAfterWriteMiddleware(None).dispatch(request, _write))
+
+
+def test_write_pins_the_client_key(monkeypatch):
+    monkeypatch.setattr(read_after_write, "_pinned_until", {})
+    response = _dispatch(("10.0.0.1", 5000))
+
+    assert PRIMARY_COOKIE in response.headers["set-cookie"]
+    assert read_after_write.is_pinned("10.0.0.1")
+
+
+def test_write_without_a_client_key_sets_only_the_cookie(monkeypatch):
+    monkeypatch.setattr(read_after_write, "_pinned_until", {})
+    response = _dispatch(None)
+
+    assert PRIMARY_COOKIE in response.headers["set-cookie"]
+    assert read_after_write._pinned_until == {}
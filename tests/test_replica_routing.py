@@ -0,0 +1,21 @@
+from sqlalchemy import select
+
+from app import db as app_db
+from app.db import RoutingSession
+from app.models.promotion import Promotion
+
+
+class FakeReplica:
+    def __init__(self, name):
+        self.sync_engine = name
+
+
+def test_session_reuses_the_replica_it_picked_first(monkeypatch):
+    monkeypatch.setattr(app_db, "replica_engines", [FakeReplica(f"replica_{i}") for i in range(8)])
+    session = RoutingSession(info={"use_replica": True})
+    query = select(Promotion.id)
+
+    picked = {session.get_bind(clause=query) for _ in range(50)}
+
+    assert len(picked) == 1
+    assert session.get_bind(clause=query.with_for_update()) is app_db.async_engine.sync_engine
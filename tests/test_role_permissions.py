@@ -0,0 +1,25 @@
+from app.models import Permission
+from tests.conftest import auth_headers
+
+
+def test_patch_role_permissions_requires_the_admin_permission(client, db, roles, create_user):
+    customer = create_user("customer@example.com", roles["customer"])
+    get_promotion = db.query(Permission).filter(Permission.name == "get_promotion").one()
+
+    response = client.patch(f"/roles/{roles['customer'].id}/permissions", headers=auth_headers(customer),
+                            json={"add": [get_promotion.id]})
+
+    assert response.status_code == 403
+    assert client.get("/promotions/", headers=auth_headers(customer)).status_code == 403
+
+
+def test_admin_can_patch_role_permissions(client, db, roles, create_user):
+    admin = create_user("admin@example.com", roles["admin"])
+    customer = create_user("customer@example.com", roles["customer"])
+    get_promotion = db.query(Permission).filter(Permission.name == "get_promotion").one()
+
+    response = client.patch(f"/roles/{roles['customer'].id}/permissions", headers=auth_headers(admin),
+                            json={"add": [get_promotion.id]})
+
+    assert response.status_code == 200
+    assert client.get("/promotions/", headers=auth_headers(customer)).status_code == 200
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.promotion import Promotion
+from tests.conftest import auth_headers
+
+
+@pytest.fixture
+def promotions(db):
+    now = datetime.utcnow()
+    rows = {
+        status: Promotion(title=status, status=status, start_date=now, end_date=now + timedelta(days=7))
+        for status in ("active", "approved", "draft", "pending", "rejected")
+    }
+    db.add_all(rows.values())
+    db.commit()
+    return {status: promotion.id for status, promotion in rows.items()}
+
+
+@pytest.fixture
+def customer(roles, create_user):
+    return auth_headers(create_user("customer@example.com", roles["customer"]))
+
+
+def test_save_public_promotion(client, promotions, customer):
+    path = f"/promotions/public/promotions/{promotions['active']}/save"
+
+    assert client.post(path, headers=customer).status_code == 200
+    assert client.post(path, headers=customer).status_code == 400
+
+
+@pytest.mark.parametrize("status", ["approved", "draft", "pending", "rejected"])
+def test_save_non_public_promotion_is_not_found(client, promotions, customer, status):
+    response = client.post(f"/promotions/public/promotions/{promotions[status]}/save", headers=customer)
+
+    assert response.status_code == 404
+
+
+def test_save_missing_promotion_is_not_found(client, promotions, customer):
+    assert client.post("/promotions/public/promotions/999/save", headers=customer).status_code == 404
+
+
+def test_bulk_save_skips_non_public_promotions(client, promotions, customer):
+    ids = [promotions["active"], promotions["draft"], promotions["approved"]]
+    response = client.post("/promotions/public/promotions/saved", headers=customer, json={"promotion_ids": ids})
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {
+        "saved": [promotions["active"]],
+        "skipped": [promotions["draft"], promotions["approved"]],
+    }
+
+
+def test_public_feed_lists_only_active_promotions(client, promotions):
+    response = client.get("/promotions/public/promotions")
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["data"]] == [promotions["active"]]
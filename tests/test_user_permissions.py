@@ -0,0 +1,90 @@
+import asyncio
+
+from app.db import AsyncSessionLocal, async_engine
+from app.models import Permission
+from app.repo.profile_repo import ProfileRepository
+from app.schemas.user import UserProfileUpdate
+from app.services.permission_matrix import permission_matrix
+from tests.conftest import auth_headers
+
+
+def _stamped_headers(db, user):
+    permission_matrix.ensure_fresh(db)
+    return auth_headers(user, **permission_matrix.token_claims(user.id, user.role_id))
+
+
+def test_set_permissions_grants_and_revokes_direct_permissions(client, db, roles, create_user):
+    admin = create_user("admin@example.com", roles["admin"])
+    customer = create_user("customer@example.com", roles["customer"])
+    get_promotion = db.query(Permission).filter(Permission.name == "get_promotion").one()
+
+    assert client.get("/promotions/", headers=auth_headers(customer)).status_code == 403
+
+    response = client.put(f"/user/{customer.id}/permissions", headers=auth_headers(admin),
+                          json={"permission_ids": [get_promotion.id]})
+    assert response.status_code == 200
+    assert response.json()["data"]["permissions"] == [{"id": get_promotion.id, "name": "get_promotion"}]
+    assert client.get("/promotions/", headers=auth_headers(customer)).status_code == 200
+
+
+def test_set_permissions_invalidates_stamped_claims(client, db, roles, create_user):
+    admin = create_user("admin@example.com", roles["admin"])
+    customer = create_user("customer@example.com", roles["customer"])
+    get_promotion = db.query(Permission).filter(Permission.name == "get_promotion").one()
+    client.put(f"/user/{customer.id}/permissions", headers=auth_headers(admin),
+               json={"permission_ids": [get_promotion.id]})
+
+    stamped = _stamped_headers(db, customer)
+    assert client.get("/promotions/", headers=stamped).status_code == 200
+
+    response = client.put(f"/user/{customer.id}/permissions", headers=auth_headers(admin),
+                          json={"permission_ids": []})
+    assert response.status_code == 200
+
+    # The token still claims get_promotion, but its stamp predates the revoke.
+    assert client.get("/promotions/", headers=stamped).status_code == 403
+
+
+def test_set_permissions_requires_the_admin_permission(client, roles, create_user):
+    customer = create_user("customer@example.com", roles["customer"])
+
+    response = client.put(f"/user/{customer.id}/permissions", headers=auth_headers(customer),
+                          json={"permission_ids": [1]})
+    assert response.status_code == 403
+
+
+def test_set_permissions_for_missing_user(client, roles, create_user):
+    admin = create_user("admin@example.com", roles["admin"])
+
+    response = client.put("/user/999/permissions", headers=auth_headers(admin), json={"permission_ids": []})
+    assert response.status_code == 404
+
+
+def test_deleted_user_token_stops_authorizing(client, db, roles, create_user):
+    user = create_user("admin@example.com", roles["admin"])
+    stamped = _stamped_headers(db, user)
+    assert client.get("/promotions/", headers=stamped).status_code == 200
+
+    assert client.delete("/user/profile", headers=stamped).status_code == 200
+
+    assert client.get("/promotions/", headers=stamped).status_code == 401
+
+
+def test_role_change_invalidates_stamped_claims(db, roles, create_user):
+    user = create_user("admin@example.com", roles["admin"])
+    permission_matrix.ensure_fresh(db)
+    claims = permission_matrix.token_claims(user.id, user.role_id)
+    get_promotion = permission_matrix.permission_id("promotions", "get_promotion")
+    assert permission_matrix.is_granted_by_claims(claims, get_promotion)
+
+    class RoleChange(UserProfileUpdate):
+        role_id: int
+
+    async def demote():
+        async with AsyncSessionLocal() as session:
+            await ProfileRepository(session).update(user.id, RoleChange(role_id=roles["customer"].id))
+        await async_engine.dispose()
+
+    asyncio.run(demote())
+
+    assert permission_matrix.is_granted_by_claims(claims, get_promotion) is None